@@ -1,10 +1,12 @@
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from config.config import config
 import os
+import threading
+
+from .enrutamiento import SesionEnrutada
 
 # Instancias de extensiones
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': SesionEnrutada})
 
 def create_app(config_name=None):
     """Factory function para crear la aplicación Flask"""
@@ -12,7 +14,10 @@ def create_app(config_name=None):
                 template_folder='../templates',
                 static_folder='../static')
     
-    # Configuración
+    # Configuración: .env se carga aquí y no al importar el paquete
+    from dotenv import load_dotenv
+    load_dotenv()
+    from config.config import config
     config_name = config_name or os.environ.get('FLASK_ENV', 'default')
     app.config.from_object(config[config_name])
     
@@ -26,8 +31,54 @@ def create_app(config_name=None):
     app.register_blueprint(main_bp)
     app.register_blueprint(api_bp, url_prefix='/api')
     
-    # Crear tablas si no existen
-    with app.app_context():
-        db.create_all()
+    # Procesamiento de fotos en segundo plano
+    from .services import procesador_imagenes
+    procesador_imagenes.init_app(app)
+    
+    # Cache de páginas renderizadas
+    from .services import cache_paginas
+    cache_paginas.init_app(app)
+    
+    # Compresión negociada de respuestas dinámicas
+    from .services import compresor_respuestas
+    compresor_respuestas.init_app(app)
+    
+    # Perfilado opcional de peticiones
+    from .services import perfilador
+    perfilador.init_app(app)
+    
+    # Helpers de templates respaldados por el cache de referencia
+    from .services import referencia
+    app.add_template_global(referencia.nombre_comuna, 'nombre_comuna')
+    
+    from .utils import url_foto, url_referencia, url_estatico
+    app.add_template_global(url_foto, 'url_foto')
+    app.add_template_global(url_estatico, 'url_estatico')
+    app.add_template_global(url_referencia, 'url_referencia')
+    
+    # Comandos CLI
+    from .cli import registrar_comandos
+    registrar_comandos(app)
+    
+    # Crear tablas si no existen (desactivado en producción: `flask db init`)
+    if app.config['CREAR_TABLAS_AL_INICIAR']:
+        _crear_tablas_en_primera_peticion(app)
+    
+    return app
+
+def _crear_tablas_en_primera_peticion(app):
+    """
+    ``create_all`` antes de atender la primera petición y no en create_app:
+    los workers y los comandos ``flask`` arrancan sin abrir conexiones, y
+    ``flask db init`` ve el esquema tal como estaba.
+    """
+    pendiente = [True]
+    lock = threading.Lock()
     
-    return app
\ No newline at end of file
+    @app.before_request
+    def crear_tablas():
+        if pendiente:
+            with lock:
+                if pendiente:
+                    db.create_all()
+                    pendiente.clear()
\ No newline at end of file
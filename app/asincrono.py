@@ -0,0 +1,313 @@
+"""
+Modo ASGI opcional para la API de solo lectura.
+
+Los endpoints de lectura más usados (``/api/regiones``, ``/api/comunas/<id>``,
+``/api/aviso/<id>`` y ``/api/avisos``) se atienden con un driver asíncrono
+(aiomysql en MySQL, aiosqlite en SQLite): una consulta lenta ya no ocupa un
+worker completo, el event loop sigue atendiendo otras peticiones. Todo lo
+demás (formularios, estadísticas, búsqueda, exportación...) lo sigue
+atendiendo la app Flask, montada como WSGI en un pool de hilos.
+
+Las consultas, los filtros, la paginación, la serialización y los validadores
+del caché HTTP son los mismos servicios que usa la API WSGI; aquí solo cambia
+cómo se ejecutan las sentencias. Por eso el ETag y el Last-Modified de una URL
+son los mismos en ambos modos y un 304 no ejecuta la consulta de la respuesta.
+
+Requiere las dependencias de ``requirements-async.txt``. Ver ``asgi.py``.
+"""
+
+import contextlib
+from a2wsgi import WSGIMiddleware
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+from werkzeug.http import http_date, parse_accept_header, parse_date, parse_etags, quote_etag
+from .models import AvisoAdopcion, Region, Comuna
+from .services import (
+    referencia, leer_filtros, filtrar_avisos, leer_campos, leer_incluir, columnas_aviso,
+    filas_a_dicts, consulta_relacion, agrupar_relacion, consulta_cursor, pagina_cursor, codificar_json,
+    comprimir, elegir_codificacion, codificaciones_disponibles, CacheTTL, a_utc, etag_version, no_modificado,
+    version_referencia, consulta_fecha_aviso, consulta_estado_fotos, estado_fotos, version_aviso,
+    consulta_ultimo_aviso, version_avisos, cachea_listado
+)
+
+# Driver asíncrono equivalente a cada driver síncrono
+DRIVERS_ASYNC = {
+    'mysql': 'mysql+aiomysql',
+    'mysql+pymysql': 'mysql+aiomysql',
+    'sqlite': 'sqlite+aiosqlite',
+    'sqlite+pysqlite': 'sqlite+aiosqlite',
+}
+
+def url_async(uri):
+    """URL de SQLAlchemy con el driver asíncrono equivalente"""
+    url = make_url(uri)
+    return url.set(drivername=DRIVERS_ASYNC.get(url.drivername, url.drivername))
+
+class ApiAsincrona:
+    """Endpoints de lectura sobre una sesión asíncrona de SQLAlchemy"""
+
+    def __init__(self, flask_app):
+        self.config = flask_app.config
+        self.engine = None
+        self.sesiones = None
+        self._totales = CacheTTL(max_items=128)
+
+    # --- Ciclo de vida ---
+
+    @contextlib.asynccontextmanager
+    async def ciclo_de_vida(self, app):
+        """Crear el engine asíncrono y precargar regiones y comunas"""
+        # Solo lectura: la réplica si existe; DB_ASYNC_URL tiene prioridad
+        uri = make_url(self.config['DB_ASYNC_URL'] or url_async(
+            self.config['DB_REPLICA_URL'] or self.config['SQLALCHEMY_DATABASE_URI']
+        ))
+        opciones = dict(self.config['SQLALCHEMY_ENGINE_OPTIONS'])
+        if uri.get_backend_name() == 'sqlite':
+            opciones.pop('connect_args', None)  # connect_timeout es solo de MySQL
+        self.engine = create_async_engine(uri, **opciones)
+        self.sesiones = async_sessionmaker(self.engine, expire_on_commit=False)
+        await self._cargar_referencia()
+        try:
+            yield
+        finally:
+            await self.engine.dispose()
+
+    async def _cargar_referencia(self):
+        """Cargar el cache de referencia sin la consulta síncrona de Flask-SQLAlchemy"""
+        async with self.sesiones() as sesion:
+            regiones = [r.to_dict() for r in await sesion.scalars(select(Region).order_by(Region.id))]
+            comunas = [c.to_dict() for c in await sesion.scalars(select(Comuna).order_by(Comuna.id))]
+        referencia.establecer(regiones, comunas)
+
+    async def _referencia(self):
+        """Cache de referencia cargado (se recarga si algo lo invalidó)"""
+        if not referencia.cargado:
+            await self._cargar_referencia()
+        return referencia
+
+    # --- Respuestas ---
+
+    async def _validar(self, request, validador, max_age_config, sesion=None):
+        """
+        Equivalente de ``cacheable``: la versión del recurso sale de los mismos
+        validadores que usa la API WSGI y se calcula antes de la consulta de la
+        respuesta, así que un 304 no la ejecuta. Devuelve ``(encabezados,
+        no_modificado)``; sin encabezados si el validador no aplica o falla.
+        """
+        try:
+            validacion = await validador()
+        except Exception:
+            # Ante un fallo del validador el endpoint responde (y reporta) normalmente
+            if sesion is not None:
+                await sesion.rollback()
+            validacion = None
+        if validacion is None:
+            return {}, False
+
+        version, ultima_modificacion = validacion
+        ultima_modificacion = a_utc(ultima_modificacion)
+        etag = etag_version(f'{request.url.path}?{request.url.query}', version)
+        encabezados = {
+            'ETag': quote_etag(etag),
+            'Cache-Control': f'public, max-age={self.config[max_age_config]}'
+        }
+        if ultima_modificacion is not None:
+            encabezados['Last-Modified'] = http_date(ultima_modificacion)
+        return encabezados, no_modificado(
+            etag, ultima_modificacion,
+            parse_etags(request.headers.get('if-none-match')),
+            parse_date(request.headers.get('if-modified-since'))
+        )
+
+    def _json(self, request, datos, status=200, cache=None):
+        """
+        JSON con el codificador compartido, los encabezados de ``_validar``
+        (solo con status 200) y compresión negociada como en la app WSGI
+        """
+        cuerpo = codificar_json(datos)
+        encabezados = {'Vary': 'Accept-Encoding'}
+        if status == 200 and cache:
+            encabezados.update(cache)
+        if self.config['COMPRESION'] and len(cuerpo) >= self.config['COMPRESION_MIN_BYTES']:
+            codificacion = elegir_codificacion(
+                parse_accept_header(request.headers.get('accept-encoding')), codificaciones_disponibles()
+            )
+            if codificacion:
+                nivel = self.config['COMPRESION_NIVEL_BR' if codificacion == 'br' else 'COMPRESION_NIVEL_GZIP']
+                cuerpo = comprimir(cuerpo, codificacion, nivel)
+                encabezados['Content-Encoding'] = codificacion
+                # El cuerpo ya no es idéntico byte a byte: el ETag pasa a ser débil
+                if 'ETag' in encabezados:
+                    encabezados['ETag'] = f"W/{encabezados['ETag']}"
+        return Response(cuerpo, status_code=status, media_type='application/json', headers=encabezados)
+
+    def _error(self, request, mensaje, status):
+        return self._json(request, {'error': mensaje}, status)
+
+    async def _serializar(self, sesion, filas, campos, incluir):
+        """Equivalente asíncrono de ``serializar_avisos``: una consulta por relación"""
+        avisos = filas_a_dicts(filas, campos)
+        ids = [aviso['id'] for aviso in avisos]
+        for relacion in incluir:
+            filas_relacion = (await sesion.execute(consulta_relacion(relacion, ids))).all() if ids else []
+            agrupadas = agrupar_relacion(relacion, ids, filas_relacion)
+            for aviso in avisos:
+                aviso[relacion] = agrupadas[aviso['id']]
+        return avisos
+
+    async def _total(self, sesion, query, modo, clave):
+        """Como ``contar_total``: 'exacto', 'aprox' (cacheado TOTAL_CACHE_TTL) o None"""
+        if modo not in ('exacto', 'aprox'):
+            return None
+        if modo == 'aprox':
+            total = self._totales.get(clave)
+            if total is not None:
+                return total
+        total = await sesion.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+        if modo == 'aprox':
+            self._totales.set(clave, total, ttl=self.config['TOTAL_CACHE_TTL'])
+        return total
+
+    # --- Validadores del caché HTTP (los mismos de routes/api.py) ---
+
+    async def _version_referencia(self):
+        await self._referencia()
+        return version_referencia()
+
+    async def _version_aviso(self, sesion, aviso_id):
+        fecha_ingreso = await sesion.scalar(consulta_fecha_aviso(aviso_id))
+        if fecha_ingreso is None:
+            return None
+        fotos = estado_fotos((await sesion.execute(consulta_estado_fotos([aviso_id]))).one())
+        return version_aviso(aviso_id, fecha_ingreso, fotos)
+
+    async def _version_listado(self, sesion, incluir):
+        if not cachea_listado(incluir):
+            return None
+        return version_avisos((await sesion.execute(consulta_ultimo_aviso())).one())
+
+    # --- Endpoints (mismos parámetros y respuestas que routes/api.py) ---
+
+    async def regiones(self, request):
+        try:
+            cache, vigente = await self._validar(
+                request, self._version_referencia, 'API_CACHE_MAX_AGE_REFERENCIA'
+            )
+            if vigente:
+                return Response(status_code=304, headers=cache)
+            datos = list((await self._referencia()).regiones())
+            return self._json(request, datos, cache=cache)
+        except Exception as e:
+            return self._error(request, str(e), 500)
+
+    async def comunas(self, request):
+        try:
+            cache, vigente = await self._validar(
+                request, self._version_referencia, 'API_CACHE_MAX_AGE_REFERENCIA'
+            )
+            if vigente:
+                return Response(status_code=304, headers=cache)
+            datos = list((await self._referencia()).comunas_de_region(request.path_params['region_id']))
+            return self._json(request, datos, cache=cache)
+        except Exception as e:
+            return self._error(request, str(e), 500)
+
+    async def aviso(self, request):
+        try:
+            try:
+                campos = leer_campos(request.query_params.get('fields'))
+                incluir = leer_incluir(request.query_params.get('incluir'))
+            except ValueError as e:
+                return self._error(request, str(e), 400)
+            aviso_id = request.path_params['aviso_id']
+            async with self.sesiones() as sesion:
+                cache, vigente = await self._validar(
+                    request, lambda: self._version_aviso(sesion, aviso_id), 'API_CACHE_MAX_AGE_AVISO', sesion
+                )
+                if vigente:
+                    return Response(status_code=304, headers=cache)
+                fila = (await sesion.execute(
+                    select(*columnas_aviso(campos)).where(AvisoAdopcion.id == aviso_id)
+                )).first()
+                if fila is None:
+                    return self._error(request, 'Aviso no encontrado', 404)
+                datos = (await self._serializar(sesion, [fila], campos, incluir))[0]
+            return self._json(request, datos, cache=cache)
+        except Exception as e:
+            return self._error(request, str(e), 500)
+
+    async def avisos(self, request):
+        try:
+            args = request.query_params
+            try:
+                page = max(int(args.get('page') or 1), 1)
+                per_page = min(max(int(args.get('per_page') or 10), 1), self.config['API_MAX_PER_PAGE'])
+            except ValueError:
+                page, per_page = 1, 10
+            try:
+                await self._referencia()  # los filtros por región usan el cache
+                filtros = leer_filtros(args)
+                campos = leer_campos(args.get('fields'))
+                incluir = leer_incluir(args.get('incluir'))
+            except ValueError as e:
+                return self._error(request, str(e), 400)
+            clave_total = ('avisos',) + tuple(sorted(filtros.items()))
+            query = filtrar_avisos(select(*columnas_aviso(campos, extra=('fecha_ingreso',))), filtros)
+
+            async with self.sesiones() as sesion:
+                cache, vigente = await self._validar(
+                    request, lambda: self._version_listado(sesion, args.get('incluir')),
+                    'API_CACHE_MAX_AGE_LISTADOS', sesion
+                )
+                if vigente:
+                    return Response(status_code=304, headers=cache)
+                if 'cursor' in args:
+                    cursor = args.get('cursor')
+                    try:
+                        pagina, direccion = consulta_cursor(query, cursor)
+                    except ValueError as e:
+                        return self._error(request, str(e), 400)
+                    filas = (await sesion.execute(pagina.limit(per_page + 1))).all()
+                    avisos = pagina_cursor(filas, per_page, cursor, direccion)
+                    datos = {
+                        'avisos': await self._serializar(sesion, avisos.items, campos, incluir),
+                        'next': avisos.next_cursor,
+                        'prev': avisos.prev_cursor,
+                        'per_page': per_page
+                    }
+                    total = await self._total(sesion, query, args.get('total', 'no'), clave_total)
+                    if total is not None:
+                        datos['total'] = total
+                else:
+                    ordenada = query.order_by(AvisoAdopcion.fecha_ingreso.desc(), AvisoAdopcion.id.desc())
+                    filas = (await sesion.execute(ordenada.limit(per_page).offset((page - 1) * per_page))).all()
+                    datos = {
+                        'avisos': await self._serializar(sesion, filas, campos, incluir),
+                        'current_page': page
+                    }
+                    total = await self._total(sesion, query, args.get('total', 'exacto'), clave_total)
+                    if total is not None:
+                        datos['total'] = total
+                        datos['pages'] = -(-total // per_page)
+            return self._json(request, datos, cache=cache)
+        except Exception as e:
+            return self._error(request, str(e), 500)
+
+def crear_app_asgi(flask_app):
+    """
+    App ASGI: los endpoints de lectura asíncronos y, para el resto de las
+    rutas, la app Flask montada como WSGI
+    """
+    api = ApiAsincrona(flask_app)
+    rutas = [
+        Route('/api/regiones', api.regiones, methods=['GET']),
+        Route('/api/comunas/{region_id:int}', api.comunas, methods=['GET']),
+        Route('/api/aviso/{aviso_id:int}', api.aviso, methods=['GET']),
+        Route('/api/avisos', api.avisos, methods=['GET']),
+        Mount('/', app=WSGIMiddleware(flask_app)),
+    ]
+    return Starlette(routes=rutas, lifespan=api.ciclo_de_vida)
@@ -0,0 +1,201 @@
+"""
+Comandos de línea de comandos (flask <grupo> <comando>)
+"""
+
+import click
+from flask.cli import AppGroup
+
+estadisticas_cli = AppGroup('estadisticas', help='Resumen precalculado de estadísticas.')
+
+@estadisticas_cli.command('reconstruir')
+def reconstruir_estadisticas_cmd():
+    """Recalcular el resumen de estadísticas desde aviso_adopcion"""
+    from .services import reconstruir_estadisticas
+    filas = reconstruir_estadisticas()
+    click.echo(f'Resumen reconstruido: {filas} filas en estadistica_comuna.')
+
+avisos_cli = AppGroup('avisos', help='Exportación e importación masiva de avisos.')
+
+@avisos_cli.command('exportar')
+@click.option('--formato', type=click.Choice(['ndjson', 'csv']), default='ndjson', show_default=True)
+@click.option('--incluir', default='', help='Relaciones a anidar, separadas por coma: fotos,contactos')
+@click.option('--lote', type=int, default=None, help='Filas por lote (por defecto EXPORT_BATCH_SIZE)')
+@click.option('--salida', type=click.File('w', encoding='utf-8'), default='-', help='Archivo de salida (por defecto stdout)')
+def exportar_avisos_cmd(formato, incluir, lote, salida):
+    """Exportar todos los avisos en streaming como NDJSON o CSV"""
+    from flask import current_app
+    from .services import exportar_avisos
+    relaciones = [r for r in incluir.split(',') if r]
+    for fragmento in exportar_avisos(formato, relaciones, lote or current_app.config['EXPORT_BATCH_SIZE']):
+        salida.write(fragmento)
+
+@avisos_cli.command('importar')
+@click.argument('archivo', type=click.File('r', encoding='utf-8'))
+@click.option('--formato', type=click.Choice(['ndjson', 'csv']), default=None,
+              help='Formato del archivo (por defecto según la extensión)')
+@click.option('--lote', type=int, default=None, help='Filas por lote (por defecto IMPORT_BATCH_SIZE)')
+@click.option('--max-errores', type=int, default=20, show_default=True, help='Errores a mostrar')
+def importar_avisos_cmd(archivo, formato, lote, max_errores):
+    """Importar avisos desde NDJSON o CSV con inserciones por lotes"""
+    from flask import current_app
+    from .services import importar_avisos, leer_registros, mensajes_error
+    formato = formato or ('csv' if archivo.name.lower().endswith('.csv') else 'ndjson')
+    resultado = importar_avisos(
+        leer_registros(archivo, formato), lote or current_app.config['IMPORT_BATCH_SIZE']
+    )
+    for error in resultado['errores'][:max_errores]:
+        click.echo(f"Línea {error['fila']}: {'; '.join(mensajes_error(error['errores']))}", err=True)
+    click.echo(f"Importados: {resultado['importados']}. Filas con error: {len(resultado['errores'])}.")
+
+@avisos_cli.command('explicar')
+@click.option('--combinaciones', type=int, default=2, show_default=True,
+              help='Cantidad máxima de filtros combinados')
+@click.option('--verbose', is_flag=True, help='Mostrar el plan de cada consulta')
+def explicar_filtros_cmd(combinaciones, verbose):
+    """Verificar con EXPLAIN que los filtros de /api/avisos usan índices"""
+    from .services import explicar_filtros
+    resultados = explicar_filtros(combinaciones)
+    fallidos = [r for r in resultados if r['escaneo_completo']]
+    for resultado in resultados:
+        if verbose or resultado['escaneo_completo']:
+            estado = 'ESCANEO COMPLETO' if resultado['escaneo_completo'] else 'ok'
+            click.echo(f"[{estado}] {', '.join(resultado['filtros']) or '(sin filtros)'}")
+            for fila in resultado['plan']:
+                click.echo(f'    {fila}')
+    click.echo(f'Consultas revisadas: {len(resultados)}. Con escaneo completo: {len(fallidos)}.')
+    if fallidos:
+        raise SystemExit(1)
+
+imagenes_cli = AppGroup('imagenes', help='Variantes de las fotos subidas.')
+
+@imagenes_cli.command('procesar')
+@click.option('--todas', is_flag=True, help='Regenerar también las fotos ya procesadas')
+def procesar_imagenes_cmd(todas):
+    """Generar miniaturas y WebP de las fotos pendientes"""
+    from .models import Foto
+    from .services import procesador_imagenes
+    consulta = Foto.query.with_entities(Foto.id)
+    if not todas:
+        consulta = consulta.filter(Foto.ruta_miniatura.is_(None))
+    ids = [foto_id for foto_id, in consulta]
+    for foto_id in ids:
+        procesador_imagenes.procesar(foto_id)
+    click.echo(f'Fotos procesadas: {len(ids)}.')
+
+@imagenes_cli.command('barrer')
+@click.option('--edad', type=int, default=3600, show_default=True,
+              help='Segundos mínimos sin modificar para considerar un archivo huérfano')
+@click.option('--simular', is_flag=True, help='Solo listar lo que se eliminaría')
+def barrer_imagenes_cmd(edad, simular):
+    """Eliminar subidas temporales y archivos que ninguna foto referencia (y recuperar fotos sin mover)"""
+    from flask import current_app
+    from .models import Foto
+    from .services import barrer_huerfanos
+    rutas_en_uso = set()
+    for fila in Foto.query.with_entities(Foto.ruta_archivo, Foto.ruta_miniatura, Foto.ruta_webp):
+        rutas_en_uso.update(ruta for ruta in fila if ruta)
+    eliminados, recuperados = barrer_huerfanos(current_app.static_folder, rutas_en_uso, edad, simular)
+    for ruta in eliminados:
+        click.echo(ruta)
+    for ruta in recuperados:
+        click.echo(f'{ruta} (recuperada desde uploads/.tmp)')
+    if simular:
+        click.echo(f'Se eliminarían: {len(eliminados)} archivos. Se recuperarían: {len(recuperados)} fotos.')
+    else:
+        click.echo(f'Eliminados: {len(eliminados)} archivos. Recuperadas: {len(recuperados)} fotos.')
+
+busqueda_cli = AppGroup('busqueda', help='Índice de búsqueda de avisos.')
+
+@busqueda_cli.command('reindexar')
+@click.option('--lote', type=int, default=1000, show_default=True, help='Avisos por lote')
+def reindexar_busqueda_cmd(lote):
+    """Reconstruir el índice de búsqueda desde aviso_adopcion"""
+    from .services import reindexar_avisos
+    total = reindexar_avisos(lote)
+    click.echo(f'Avisos indexados: {total}.')
+
+datos_cli = AppGroup('datos', help='Datos sintéticos para pruebas de carga.')
+
+@datos_cli.command('generar')
+@click.option('-n', '--cantidad', type=int, default=1000, show_default=True, help='Avisos a generar')
+@click.option('--semilla', type=int, default=0, show_default=True, help='Semilla del generador aleatorio')
+@click.option('--lote', type=int, default=5000, show_default=True, help='Avisos por transacción')
+@click.option('--fotos-max', type=int, default=5, show_default=True, help='Fotos máximas por aviso')
+@click.option('--contactos-max', type=int, default=5, show_default=True, help='Contactos máximos por aviso')
+def generar_datos_cmd(cantidad, semilla, lote, fotos_max, contactos_max):
+    """Insertar avisos sintéticos con fotos y contactos"""
+    from .services import generar_avisos
+    try:
+        totales = generar_avisos(cantidad, semilla, lote, fotos_max, contactos_max)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Avisos: {totales['avisos']}. Fotos: {totales['fotos']}. Contactos: {totales['contactos']}.")
+
+referencia_cli = AppGroup('referencia', help='Artefacto JSON de regiones y comunas.')
+
+@referencia_cli.command('compilar')
+@click.option('--destino', type=click.Path(file_okay=False), default=None,
+              help='Carpeta de salida (por defecto static/dist)')
+def compilar_referencia_cmd(destino):
+    """Generar region-comuna.<hash>.json y sus variantes .gz/.br desde la base de datos"""
+    import os
+    from flask import current_app
+    from .services import artefacto_referencia
+    destino = destino or os.path.join(current_app.static_folder, 'dist')
+    for ruta in artefacto_referencia.escribir(destino):
+        click.echo(f'{ruta} ({os.path.getsize(ruta)} bytes)')
+
+estaticos_cli = AppGroup('estaticos', help='Assets estáticos con hash y precomprimidos.')
+
+@estaticos_cli.command('compilar')
+def compilar_estaticos_cmd():
+    """Copiar static/css y static/js a static/dist con hash en el nombre y variantes .gz/.br"""
+    from flask import current_app
+    from .services import compilar_estaticos
+    manifiesto = compilar_estaticos(current_app.static_folder)
+    for original, compilada in sorted(manifiesto.items()):
+        click.echo(f'{original} -> {compilada}')
+    click.echo(f'Assets compilados: {len(manifiesto)}.')
+
+db_cli = AppGroup('db', help='Esquema y datos iniciales de la base de datos.')
+
+def _sembrar(forzar):
+    from .services import sembrar_region_comuna
+    resumen = sembrar_region_comuna(forzar=forzar)
+    if resumen['omitido']:
+        click.echo(f"Regiones y comunas al día (checksum {resumen['checksum'][:12]}).")
+        return
+    for tabla in ('region', 'comuna'):
+        insertadas, actualizadas = resumen[tabla]
+        click.echo(f'{tabla}: {insertadas} insertadas, {actualizadas} actualizadas.')
+
+@db_cli.command('init')
+@click.option('--forzar', is_flag=True, help='Recargar los datos aunque el checksum coincida')
+def init_db_cmd(forzar):
+    """Crear las tablas que falten, aplicar las migraciones pendientes y cargar regiones y comunas"""
+    from .services import crear_esquema, migrar_esquema
+    creadas = crear_esquema()
+    click.echo(f"Tablas creadas: {', '.join(creadas) or 'ninguna (el esquema ya existía)'}.")
+    try:
+        aplicadas = migrar_esquema()
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Migraciones aplicadas: {', '.join(aplicadas)}." if aplicadas else 'Sin migraciones pendientes.')
+    _sembrar(forzar)
+
+@db_cli.command('seed')
+@click.option('--forzar', is_flag=True, help='Recargar los datos aunque el checksum coincida')
+def seed_db_cmd(forzar):
+    """Cargar regiones y comunas desde data/region-comuna.sql"""
+    _sembrar(forzar)
+
+def registrar_comandos(app):
+    """Registrar los grupos de comandos en la aplicación"""
+    app.cli.add_command(estadisticas_cli)
+    app.cli.add_command(avisos_cli)
+    app.cli.add_command(imagenes_cli)
+    app.cli.add_command(busqueda_cli)
+    app.cli.add_command(datos_cli)
+    app.cli.add_command(db_cli)
+    app.cli.add_command(referencia_cli)
+    app.cli.add_command(estaticos_cli)
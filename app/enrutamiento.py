@@ -0,0 +1,61 @@
+"""
+Enrutamiento de lecturas a una réplica de la base de datos.
+
+Si la configuración define el bind ``replica`` (DB_REPLICA_URL), las
+consultas hechas durante una petición marcada como de solo lectura se envían
+a ese engine; todo lo demás (escrituras, flush, CLI, tareas en segundo plano)
+usa el primario. La réplica puede ir atrasada: la primera petición de una
+sesión después de una escritura suya (``marcar_escritura``) lee del primario,
+y el cache de páginas renderiza desde el primario lo que va a guardar.
+"""
+
+from functools import wraps
+from flask import g, has_request_context, session
+from flask_sqlalchemy.session import Session
+
+BIND_REPLICA = 'replica'
+
+# Marca en la sesión de quien acaba de escribir
+CLAVE_ESCRITURA = '_escritura_reciente'
+
+def en_solo_lectura():
+    """Indica si la petición actual fue marcada como de solo lectura"""
+    return has_request_context() and g.get('solo_lectura', False)
+
+def marcar_solo_lectura():
+    """Marcar la petición actual para que sus consultas vayan a la réplica"""
+    g.solo_lectura = True
+
+def usar_primario():
+    """Enviar al primario las consultas que queden en la petición actual"""
+    g.solo_lectura = False
+
+def marcar_escritura():
+    """
+    Llamar tras confirmar una escritura en una petición con sesión: la
+    siguiente vista de solo lectura de esa sesión lee del primario y ve la
+    escritura aunque la réplica aún no la tenga
+    """
+    session[CLAVE_ESCRITURA] = True
+
+def solo_lectura(vista):
+    """Decorador para vistas que solo leen datos"""
+    @wraps(vista)
+    def envoltura(*args, **kwargs):
+        if CLAVE_ESCRITURA in session:
+            session.pop(CLAVE_ESCRITURA)
+            usar_primario()
+        else:
+            marcar_solo_lectura()
+        return vista(*args, **kwargs)
+    return envoltura
+
+class SesionEnrutada(Session):
+    """Sesión que elige la réplica para las lecturas de peticiones de solo lectura"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and en_solo_lectura():
+            replica = self._db.engines.get(BIND_REPLICA)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
@@ -1,5 +1,9 @@
 # Importar todos los modelos para facilitar el uso
 from .region_comuna import Region, Comuna
 from .aviso import AvisoAdopcion, Foto, ContactarPor
+from .estadistica import EstadisticaComuna
+from .busqueda import AvisoTermino
+from .carga import CargaDatos
 
-__all__ = ['Region', 'Comuna', 'AvisoAdopcion', 'Foto', 'ContactarPor']
\ No newline at end of file
+__all__ = ['Region', 'Comuna', 'AvisoAdopcion', 'Foto', 'ContactarPor', 'EstadisticaComuna',
+           'AvisoTermino', 'CargaDatos']
\ No newline at end of file
@@ -1,13 +1,41 @@
 from datetime import datetime
 from .. import db
 
+def _edad_en_meses(context):
+    """Valor por defecto de edad_meses calculado desde edad y unidad_medida"""
+    parametros = context.get_current_parameters()
+    edad = parametros.get('edad')
+    if edad is None:
+        return None
+    return edad * 12 if parametros.get('unidad_medida') == 'a' else edad
+
+def _region_de_comuna(context):
+    """Valor por defecto de region_id: la región de la comuna (cache de referencia)"""
+    from ..services.referencia import referencia
+    region = referencia.region_de_comuna(context.get_current_parameters().get('comuna_id'))
+    return region['id'] if region else None
+
 class AvisoAdopcion(db.Model):
     """Modelo para los avisos de adopción"""
     __tablename__ = 'aviso_adopcion'
+    __table_args__ = (
+        # Soporta el orden de los listados y la paginación por cursor (keyset)
+        db.Index('aviso_fecha_ingreso_id_idx', 'fecha_ingreso', 'id'),
+        # Filtros de listado combinados con el mismo orden (fecha_ingreso, id)
+        db.Index('aviso_tipo_fecha_ingreso_idx', 'tipo', 'fecha_ingreso', 'id'),
+        db.Index('aviso_comuna_fecha_ingreso_idx', 'comuna_id', 'fecha_ingreso', 'id'),
+        db.Index('aviso_region_fecha_ingreso_idx', 'region_id', 'fecha_ingreso', 'id'),
+        db.Index('aviso_tiene_fotos_fecha_ingreso_idx', 'tiene_fotos', 'fecha_ingreso', 'id'),
+        # Filtros por rango: se resuelven con un SEARCH sobre estos índices (ver filtrar_avisos)
+        db.Index('aviso_fecha_entrega_idx', 'fecha_entrega'),
+        db.Index('aviso_edad_meses_idx', 'edad_meses'),
+        db.Index('aviso_cantidad_idx', 'cantidad'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     fecha_ingreso = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     comuna_id = db.Column(db.Integer, db.ForeignKey('comuna.id'), nullable=False)
+    region_id = db.Column(db.Integer, default=_region_de_comuna)  # región de la comuna, para filtrar con el orden del listado
     sector = db.Column(db.String(100))
     nombre = db.Column(db.String(200), nullable=False)
     email = db.Column(db.String(100), nullable=False)
@@ -16,6 +44,8 @@ class AvisoAdopcion(db.Model):
     cantidad = db.Column(db.Integer, nullable=False)
     edad = db.Column(db.Integer, nullable=False)
     unidad_medida = db.Column(db.Enum('a', 'm', name='unidad_medida'), nullable=False)  # 'a' años, 'm' meses
+    edad_meses = db.Column(db.Integer, default=_edad_en_meses)  # edad normalizada a meses, para filtrar por rango
+    tiene_fotos = db.Column(db.Boolean, nullable=False, default=False, server_default='0')  # para el filtro con_fotos
     fecha_entrega = db.Column(db.DateTime, nullable=False)
     descripcion = db.Column(db.Text)
     
@@ -46,26 +76,39 @@ class AvisoAdopcion(db.Model):
 class Foto(db.Model):
     """Modelo para las fotos de los avisos"""
     __tablename__ = 'foto'
+    # Mismo índice que data/tarea2.sql: sin él, con_fotos (EXISTS) recorre foto por cada aviso
+    __table_args__ = (db.Index('fk_foto_aviso1_idx', 'actividad_id'),)
     
     id = db.Column(db.Integer, primary_key=True)
     ruta_archivo = db.Column(db.String(300), nullable=False)
     nombre_archivo = db.Column(db.String(300), nullable=False)
     actividad_id = db.Column(db.Integer, db.ForeignKey('aviso_adopcion.id'), nullable=False)
+    # Variantes generadas en segundo plano (None mientras se procesan)
+    ruta_miniatura = db.Column(db.String(300))
+    ruta_webp = db.Column(db.String(300))
     
     def __repr__(self):
         return f'<Foto {self.nombre_archivo}>'
     
+    @property
+    def ruta_listado(self):
+        """Ruta a mostrar en listados: la miniatura si ya existe, si no el original"""
+        return self.ruta_miniatura or self.ruta_archivo
+    
     def to_dict(self):
         return {
             'id': self.id,
             'ruta_archivo': self.ruta_archivo,
             'nombre_archivo': self.nombre_archivo,
-            'actividad_id': self.actividad_id
+            'actividad_id': self.actividad_id,
+            'ruta_miniatura': self.ruta_miniatura,
+            'ruta_webp': self.ruta_webp
         }
 
 class ContactarPor(db.Model):
     """Modelo para las formas de contacto"""
     __tablename__ = 'contactar_por'
+    __table_args__ = (db.Index('fk_contactar_por_aviso1_idx', 'actividad_id'),)
     
     id = db.Column(db.Integer, primary_key=True)
     nombre = db.Column(db.Enum('whatsapp', 'telegram', 'X', 'instagram', 'tiktok', 'otra', name='nombre_contacto'), nullable=False)
@@ -0,0 +1,20 @@
+from .. import db
+
+class AvisoTermino(db.Model):
+    """
+    Índice invertido para la búsqueda de avisos: un término normalizado
+    (minúsculas, sin tildes) por aviso, con su peso según el campo de origen.
+    """
+    __tablename__ = 'aviso_termino'
+    __table_args__ = (
+        db.Index('fk_aviso_termino_aviso1_idx', 'aviso_id'),
+        # Recorrer un término con un peso dado en orden de aviso_id (orden por puntaje)
+        db.Index('aviso_termino_peso_idx', 'termino', 'peso', 'aviso_id'),
+    )
+    
+    termino = db.Column(db.String(64), primary_key=True)
+    aviso_id = db.Column(db.Integer, db.ForeignKey('aviso_adopcion.id'), primary_key=True)
+    peso = db.Column(db.SmallInteger, nullable=False, default=1)
+    
+    def __repr__(self):
+        return f'<AvisoTermino {self.termino} -> {self.aviso_id}>'
@@ -0,0 +1,16 @@
+from datetime import datetime
+from .. import db
+
+class CargaDatos(db.Model):
+    """
+    Huella (SHA-256) de cada archivo de datos iniciales ya cargado.
+    ``flask db seed`` omite la carga si el archivo no cambió.
+    """
+    __tablename__ = 'carga_datos'
+    
+    archivo = db.Column(db.String(100), primary_key=True)
+    checksum = db.Column(db.String(64), nullable=False)
+    cargado_en = db.Column(db.DateTime, nullable=False, default=datetime.now)
+    
+    def __repr__(self):
+        return f'<CargaDatos {self.archivo} {self.checksum[:12]}>'
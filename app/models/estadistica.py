@@ -0,0 +1,23 @@
+from .. import db
+
+class EstadisticaComuna(db.Model):
+    """
+    Resumen precalculado de avisos por comuna y tipo de mascota.
+    Se actualiza al publicar cada aviso y se reconstruye con
+    ``flask estadisticas reconstruir``.
+    """
+    __tablename__ = 'estadistica_comuna'
+    
+    comuna_id = db.Column(db.Integer, db.ForeignKey('comuna.id'), primary_key=True)
+    tipo = db.Column(db.Enum('gato', 'perro', name='tipo_mascota'), primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<EstadisticaComuna {self.comuna_id} {self.tipo}: {self.total}>'
+    
+    def to_dict(self):
+        return {
+            'comuna_id': self.comuna_id,
+            'tipo': self.tipo,
+            'total': self.total
+        }
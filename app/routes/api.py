@@ -1,61 +1,374 @@
-from flask import Blueprint, jsonify, request
-from ..models import Region, Comuna, AvisoAdopcion
+import hmac
+from flask import Blueprint, current_app, g, jsonify, redirect, request, stream_with_context, url_for
+from .. import db
+from ..enrutamiento import marcar_solo_lectura
+from ..models import AvisoAdopcion
+from ..services import (
+    paginar_por_cursor, contar_total, referencia, resumen_estadisticas_cacheado, serie_temporal,
+    exportar_avisos, importar_avisos, leer_registros, buscar_ids, leer_filtros, filtrar_avisos, fecha_limite,
+    leer_campos, leer_incluir, columnas_aviso, serializar_avisos, respuesta_json, artefacto_referencia,
+    elegir_codificacion, version_referencia, consulta_estado_fotos, estado_fotos, consulta_fecha_aviso,
+    version_aviso, consulta_ultimo_aviso, version_avisos, cachea_listado
+)
+from ..utils import url_foto
+from .cache_http import cacheable
 
 api_bp = Blueprint('api', __name__)
 
+@api_bp.before_request
+def _enrutar_lecturas():
+    """Las peticiones GET de la API solo leen: se atienden desde la réplica si existe"""
+    if request.method in ('GET', 'HEAD'):
+        marcar_solo_lectura()
+
+def _version_referencia(**kwargs):
+    """Validador para regiones y comunas: versión del cache de referencia"""
+    return version_referencia()
+
+def _estado_fotos(aviso_ids):
+    """Estado de las fotos de los avisos: ``(version, pendientes)``"""
+    return estado_fotos(db.session.execute(consulta_estado_fotos(aviso_ids)).one())
+
+def _version_aviso(aviso_id):
+    """Validador para un aviso: fecha de ingreso y estado de sus fotos"""
+    fecha_ingreso = db.session.scalar(consulta_fecha_aviso(aviso_id))
+    if fecha_ingreso is None:
+        return None
+    return version_aviso(aviso_id, fecha_ingreso, _estado_fotos([aviso_id]))
+
+def _version_avisos(**kwargs):
+    """Validador para listados: último id y última fecha de ingreso (ambos indexados)"""
+    return version_avisos(db.session.execute(consulta_ultimo_aviso()).one())
+
+def _version_listado(**kwargs):
+    """Validador de /avisos: el de listados, salvo con ``incluir=fotos`` (no se cachea)"""
+    if not cachea_listado(request.args.get('incluir')):
+        return None
+    return _version_avisos()
+
+def _version_avisos_batch(**kwargs):
+    """Validador de /avisos/batch: el de listados más el estado de las fotos pedidas"""
+    ids = _leer_ids(request.args.get('ids'), current_app.config['API_MAX_PER_PAGE'])
+    version, ultima_fecha = _version_avisos()
+    fotos, pendientes = _estado_fotos(ids)
+    return f'{version}:{fotos}', None if pendientes else ultima_fecha
+
 @api_bp.route('/comunas/<int:region_id>')
+@cacheable(_version_referencia, 'API_CACHE_MAX_AGE_REFERENCIA')
 def get_comunas(region_id):
     """API endpoint para obtener comunas por región"""
     try:
-        comunas = Comuna.query.filter_by(region_id=region_id).all()
-        return jsonify([comuna.to_dict() for comuna in comunas])
+        return jsonify(list(referencia.comunas_de_region(region_id)))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/aviso/<int:aviso_id>')
+@cacheable(_version_aviso, 'API_CACHE_MAX_AGE_AVISO')
 def get_aviso(aviso_id):
-    """API endpoint para obtener detalles de un aviso"""
+    """
+    API endpoint para obtener detalles de un aviso.
+    Parámetros opcionales: ``fields`` (campos separados por coma) e
+    ``incluir`` (fotos,contactos).
+    """
     try:
-        aviso = AvisoAdopcion.query.get_or_404(aviso_id)
-        return jsonify(aviso.to_dict())
+        try:
+            campos = leer_campos(request.args.get('fields'))
+            incluir = leer_incluir(request.args.get('incluir'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        fila = db.session.execute(
+            db.select(*columnas_aviso(campos)).where(AvisoAdopcion.id == aviso_id)
+        ).first()
+        if fila is None:
+            return jsonify({'error': 'Aviso no encontrado'}), 404
+        return respuesta_json(serializar_avisos([fila], campos, incluir)[0])
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/regiones')
+@cacheable(_version_referencia, 'API_CACHE_MAX_AGE_REFERENCIA')
 def get_regiones():
     """API endpoint para obtener todas las regiones"""
     try:
-        regiones = Region.query.all()
-        return jsonify([region.to_dict() for region in regiones])
+        return jsonify(list(referencia.regiones()))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/referencia')
+def get_referencia():
+    """Redirigir al artefacto vigente de regiones y comunas"""
+    try:
+        respuesta = redirect(url_for('api.get_referencia_version', hash_contenido=artefacto_referencia.hash))
+        respuesta.cache_control.no_cache = True
+        return respuesta
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/referencia/region-comuna.<hash_contenido>.json')
+def get_referencia_version(hash_contenido):
+    """
+    Regiones y comunas en un solo JSON direccionado por contenido (inmutable),
+    precomprimido con gzip/brotli según Accept-Encoding
+    """
+    try:
+        artefacto = artefacto_referencia.actual
+        if hash_contenido != artefacto['hash']:
+            # Hash de una versión anterior (p. ej. desde una página cacheada)
+            return get_referencia()
+        codificacion = elegir_codificacion(request.accept_encodings, tuple(artefacto['variantes']))
+        cuerpo = artefacto['variantes'][codificacion] if codificacion else artefacto['cuerpo']
+        respuesta = current_app.response_class(cuerpo, mimetype='application/json')
+        if codificacion:
+            respuesta.content_encoding = codificacion
+        respuesta.vary.add('Accept-Encoding')
+        respuesta.set_etag(f"{artefacto['hash']}-{codificacion or 'identity'}")
+        respuesta.cache_control.public = True
+        respuesta.cache_control.max_age = current_app.config['MEDIA_MAX_AGE']
+        respuesta.cache_control.immutable = True
+        return respuesta.make_conditional(request)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/avisos')
+@cacheable(_version_listado, 'API_CACHE_MAX_AGE_LISTADOS')
 def get_avisos():
-    """API endpoint para obtener avisos con filtros opcionales"""
+    """
+    API endpoint para obtener avisos con filtros opcionales (ver ``leer_filtros``:
+    tipo, región, comuna, rangos de fechas, edad y cantidad, con fotos).
+    Con el parámetro ``cursor`` (vacío para la primera página) pagina por keyset
+    y devuelve cursores ``next``/``prev``; ``total`` puede ser 'exacto', 'aprox'
+    o 'no' para controlar el conteo. ``fields`` e ``incluir`` como en ``/aviso/<id>``.
+    """
     try:
         page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
-        tipo = request.args.get('tipo')
-        region_id = request.args.get('region_id', type=int)
+        per_page = min(max(request.args.get('per_page', 10, type=int), 1),
+                       current_app.config['API_MAX_PER_PAGE'])
+        try:
+            filtros = leer_filtros(request.args)
+            campos = leer_campos(request.args.get('fields'))
+            incluir = leer_incluir(request.args.get('incluir'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        clave_total = ('avisos',) + tuple(sorted(filtros.items()))
         
-        query = AvisoAdopcion.query
-        
-        if tipo:
-            query = query.filter_by(tipo=tipo)
+        query = filtrar_avisos(AvisoAdopcion.query, filtros).order_by(
+            AvisoAdopcion.fecha_ingreso.desc(),
+            AvisoAdopcion.id.desc()
+        )
+        # Solo las columnas pedidas (y las de la clave del cursor), como filas sin ORM
+        filas = query.with_entities(*columnas_aviso(campos, extra=('fecha_ingreso',)))
         
-        if region_id:
-            query = query.join(Comuna).filter(Comuna.region_id == region_id)
+        if 'cursor' in request.args:
+            try:
+                avisos = paginar_por_cursor(filas, request.args.get('cursor'), per_page)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            
+            respuesta = {
+                'avisos': serializar_avisos(avisos.items, campos, incluir),
+                'next': avisos.next_cursor,
+                'prev': avisos.prev_cursor,
+                'per_page': per_page
+            }
+            total = contar_total(query, request.args.get('total', 'no'), clave_total)
+            if total is not None:
+                respuesta['total'] = total
+            return respuesta_json(respuesta)
         
-        avisos = query.paginate(
-            page=page, per_page=per_page, error_out=False
+        modo_total = request.args.get('total', 'exacto')
+        avisos = filas.paginate(
+            page=page, per_page=per_page, error_out=False, count=(modo_total == 'exacto')
         )
         
-        return jsonify({
-            'avisos': [aviso.to_dict() for aviso in avisos.items],
-            'total': avisos.total,
-            'pages': avisos.pages,
+        respuesta = {
+            'avisos': serializar_avisos(avisos.items, campos, incluir),
             'current_page': avisos.page
+        }
+        total = avisos.total if modo_total == 'exacto' else \
+            contar_total(query, modo_total, clave_total)
+        if total is not None:
+            respuesta['total'] = total
+            respuesta['pages'] = -(-total // per_page) if per_page > 0 else 0
+        return respuesta_json(respuesta)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@api_bp.route('/estadisticas')
+@cacheable(_version_avisos, 'API_CACHE_MAX_AGE_ESTADISTICAS')
+def get_estadisticas():
+    """API endpoint con los totales por tipo, por región y top de comunas"""
+    try:
+        stats_tipo, stats_region, stats_comuna = resumen_estadisticas_cacheado(g.version_validador)
+        return respuesta_json({
+            'tipo': [{'tipo': tipo, 'total': total} for tipo, total in stats_tipo],
+            'region': [{'region': nombre, 'total': total} for nombre, total in stats_region],
+            'comuna': [{'comuna': nombre, 'total': total} for nombre, total in stats_comuna]
         })
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/estadisticas/serie')
+@cacheable(_version_avisos, 'API_CACHE_MAX_AGE_ESTADISTICAS')
+def get_estadisticas_serie():
+    """
+    API endpoint con la cantidad de avisos por periodo.
+    Parámetros: ``campo`` (fecha_ingreso | fecha_entrega), ``intervalo``
+    (dia | semana | mes, semanas ISO 'AAAA-Www') y rango opcional
+    ``desde``/``hasta`` (AAAA-MM-DD, ambos inclusive, como en ``/avisos``).
+    """
+    try:
+        campo = request.args.get('campo', 'fecha_ingreso')
+        intervalo = request.args.get('intervalo', 'dia')
+        try:
+            desde = fecha_limite(request.args.get('desde'))
+            hasta = fecha_limite(request.args.get('hasta'), fin=True)
+            filas = serie_temporal(campo, intervalo, desde, hasta, g.version_validador)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return respuesta_json({
+            'campo': campo,
+            'intervalo': intervalo,
+            'columnas': ['periodo', 'gato', 'perro', 'total'],
+            'filas': filas
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/avisos/search')
+def search_avisos():
+    """
+    API endpoint de búsqueda de texto sobre descripción, sector, comuna y región.
+    Parámetros: ``q`` (obligatorio), ``limit`` (máx. API_MAX_PER_PAGE), ``offset``,
+    ``fields`` e ``incluir``.
+    """
+    try:
+        consulta = request.args.get('q', '').strip()
+        if not consulta:
+            return jsonify({'error': 'El parámetro q es obligatorio'}), 400
+        try:
+            campos = leer_campos(request.args.get('fields'))
+            incluir = leer_incluir(request.args.get('incluir'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        limite = min(max(request.args.get('limit', 20, type=int), 1),
+                     current_app.config['API_MAX_PER_PAGE'])
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        
+        resultados = buscar_ids(consulta, limite, offset)
+        ids = [aviso_id for aviso_id, _ in resultados]
+        filas = db.session.execute(
+            db.select(*columnas_aviso(campos)).where(AvisoAdopcion.id.in_(ids))
+        ).all() if ids else []
+        avisos = {aviso['id']: aviso for aviso in serializar_avisos(filas, campos, incluir)}
+        
+        return respuesta_json({
+            'q': consulta,
+            'resultados': [
+                dict(avisos[aviso_id], puntaje=puntaje)
+                for aviso_id, puntaje in resultados if aviso_id in avisos
+            ]
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def _leer_ids(valor, maximo):
+    """Ids separados por coma, sin repetir y en el orden pedido; ValueError si son inválidos"""
+    try:
+        ids = list(dict.fromkeys(int(parte) for parte in (valor or '').split(',') if parte.strip()))
+    except ValueError:
+        raise ValueError('El parámetro ids debe ser una lista de enteros separados por coma')
+    if not ids:
+        raise ValueError('El parámetro ids es obligatorio')
+    if len(ids) > maximo:
+        raise ValueError(f'Se pueden pedir como máximo {maximo} avisos')
+    return ids
+
+@api_bp.route('/avisos/batch')
+@cacheable(_version_avisos_batch, 'API_CACHE_MAX_AGE_AVISO')
+def get_avisos_batch():
+    """
+    API endpoint con el detalle completo de varios avisos (``ids=1,2,3``):
+    comuna, región, fotos y contactos en un número fijo de consultas.
+    Los avisos se devuelven en el orden pedido y los inexistentes en ``faltantes``.
+    """
+    try:
+        try:
+            ids = _leer_ids(request.args.get('ids'), current_app.config['API_MAX_PER_PAGE'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        campos = leer_campos(None)
+        filas = db.session.execute(
+            db.select(*columnas_aviso(campos)).where(AvisoAdopcion.id.in_(ids))
+        ).all()
+        avisos = {aviso['id']: aviso for aviso in serializar_avisos(filas, campos, ('fotos', 'contactos'))}
+        
+        # Nombres de comuna y región desde el cache de referencia, sin JOIN
+        for aviso in avisos.values():
+            comuna = referencia.comuna(aviso['comuna_id'])
+            region = referencia.region_de_comuna(aviso['comuna_id'])
+            aviso['comuna'] = comuna['nombre'] if comuna else None
+            aviso['region'] = region['nombre'] if region else None
+            for foto in aviso['fotos']:
+                foto['url'] = url_foto(foto['ruta_webp'] or foto['ruta_archivo'])
+                foto['url_miniatura'] = url_foto(foto['ruta_miniatura'] or foto['ruta_archivo'])
+        
+        return respuesta_json({
+            'avisos': [avisos[aviso_id] for aviso_id in ids if aviso_id in avisos],
+            'faltantes': [aviso_id for aviso_id in ids if aviso_id not in avisos]
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/avisos/export')
+def export_avisos():
+    """
+    API endpoint de exportación masiva en streaming.
+    Parámetros: ``formato`` (ndjson | csv) e ``incluir`` (fotos,contactos).
+    """
+    formato = request.args.get('formato', 'ndjson')
+    incluir = [r for r in request.args.get('incluir', '').split(',') if r]
+    try:
+        contenido = exportar_avisos(formato, incluir, current_app.config['EXPORT_BATCH_SIZE'])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    mimetype = 'text/csv' if formato == 'csv' else 'application/x-ndjson'
+    return current_app.response_class(
+        stream_with_context(contenido),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename=avisos.{formato}'}
+    )
+
+@api_bp.route('/avisos/import', methods=['POST'])
+def import_avisos():
+    """
+    API endpoint de importación masiva (requiere ``Authorization: Bearer <token>``).
+    Acepta un arreglo JSON de avisos o NDJSON (``Content-Type: application/x-ndjson``)
+    y responde la cantidad importada y los errores por fila (posición en el
+    arreglo o número de línea).
+    """
+    token = current_app.config.get('API_IMPORT_TOKEN')
+    if not token:
+        return jsonify({'error': 'Importación deshabilitada'}), 403
+    autorizacion = request.headers.get('Authorization', '')
+    if not hmac.compare_digest(autorizacion.encode('utf-8'), f'Bearer {token}'.encode('utf-8')):
+        return jsonify({'error': 'No autorizado'}), 401
+    
+    # Las filas ilegibles o que no son objetos se reportan como errores de su fila
+    if request.mimetype == 'application/x-ndjson':
+        registros = leer_registros(request.get_data(as_text=True).splitlines(), 'ndjson')
+    else:
+        registros = request.get_json(silent=True)
+        if not isinstance(registros, list):
+            return jsonify({'error': 'Se esperaba una lista de avisos'}), 400
+        registros = enumerate(registros, start=1)
+    
+    try:
+        resultado = importar_avisos(registros, current_app.config['IMPORT_BATCH_SIZE'])
+        return jsonify(resultado)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
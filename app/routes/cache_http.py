@@ -0,0 +1,53 @@
+from functools import wraps
+from flask import current_app, g, make_response, request
+from ..services import a_utc, etag_version, no_modificado
+
+def _aplicar_encabezados(respuesta, etag, ultima_modificacion, max_age):
+    respuesta.set_etag(etag)
+    if ultima_modificacion is not None:
+        respuesta.last_modified = ultima_modificacion
+    respuesta.cache_control.public = True
+    respuesta.cache_control.max_age = max_age
+
+def cacheable(validador, max_age_config):
+    """
+    Decorador de caché HTTP para endpoints de solo lectura.
+
+    ``validador`` recibe los argumentos de la vista y devuelve
+    ``(version, ultima_modificacion)`` a partir de datos baratos de obtener
+    (versión del cache de referencia, máximos indexados, etc.), o None para
+    omitir el caché. Con eso se genera un ETag fuerte y ``Last-Modified``; si
+    el cliente ya tiene esa versión se responde ``304`` sin ejecutar la vista.
+    La vista encuentra la versión en ``g.version_validador`` para usarla en la
+    clave de sus propios caches: así el cuerpo corresponde siempre al ETag.
+    ``max_age_config`` es la clave de configuración con el ``max-age``.
+    """
+    def decorador(vista):
+        @wraps(vista)
+        def envoltura(*args, **kwargs):
+            try:
+                validacion = validador(**kwargs)
+            except Exception:
+                # Ante un fallo del validador la vista responde (y reporta) normalmente
+                validacion = None
+            if validacion is None:
+                g.version_validador = None
+                return vista(*args, **kwargs)
+
+            version, ultima_modificacion = validacion
+            g.version_validador = version
+            ultima_modificacion = a_utc(ultima_modificacion)
+            etag = etag_version(request.full_path, version)
+            max_age = current_app.config[max_age_config]
+
+            if no_modificado(etag, ultima_modificacion, request.if_none_match, request.if_modified_since):
+                respuesta = current_app.response_class(status=304)
+            else:
+                respuesta = make_response(vista(*args, **kwargs))
+                if respuesta.status_code != 200:
+                    return respuesta
+
+            _aplicar_encabezados(respuesta, etag, ultima_modificacion, max_age)
+            return respuesta
+        return envoltura
+    return decorador
@@ -1,235 +1,243 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app
+from flask import (
+    Blueprint, render_template, request, redirect, url_for, flash, current_app, send_from_directory, abort
+)
 from werkzeug.utils import secure_filename
 from .. import db
-from ..models import Region, Comuna, AvisoAdopcion, Foto, ContactarPor
-from datetime import datetime
+from ..enrutamiento import solo_lectura, marcar_escritura
+from ..models import AvisoAdopcion, Foto, ContactarPor
+from ..services import (
+    consulta_listado, paginar_por_cursor, referencia, registrar_avisos, resumen_estadisticas,
+    validar_aviso, mensajes_error, contactos_del_aviso, procesador_imagenes, es_ruta_inmutable,
+    preparar_foto, confirmar_foto, descartar_foto,
+    indexar_avisos, buscar_avisos, leer_filtros, filtrar_avisos, cache_paginas,
+    variante_precomprimida, CARPETA_DIST, MANIFIESTO
+)
+import mimetypes
 import os
-import re
 
 main_bp = Blueprint('main', __name__)
 
 @main_bp.route('/')
+@solo_lectura
+@cache_paginas.cachear
 def index():
     """Página principal - Muestra los últimos 5 avisos de adopción"""
     # Obtener los últimos 5 avisos de adopción ordenados por fecha
-    ultimos_avisos = AvisoAdopcion.query.order_by(
-        AvisoAdopcion.fecha_ingreso.desc()
-    ).limit(5).all()
+    ultimos_avisos = consulta_listado().limit(5).all()
     
     return render_template('index.html', avisos=ultimos_avisos)
 
+def _quitar_fotos_sin_archivo(aviso, fallidas, quedan_fotos):
+    """
+    Eliminar las filas de fotos cuyo archivo no se pudo mover tras el commit,
+    para que ninguna fila apunte a un archivo inexistente, y descartar sus
+    temporales. Si no se puede, el temporal se conserva: `flask imagenes
+    barrer` lo mueve a la ruta de la fila en vez de eliminarlo.
+    """
+    try:
+        Foto.query.filter(Foto.id.in_([foto_id for _, foto_id in fallidas])).delete(synchronize_session=False)
+        aviso.tiene_fotos = quedan_fotos
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        current_app.logger.exception('No se pudieron quitar las fotos sin archivo del aviso %s', aviso.id)
+        return
+    for preparada, _ in fallidas:
+        descartar_foto(preparada)
+
 @main_bp.route('/agregar-aviso', methods=['GET', 'POST'])
 def agregar_aviso():
     """Página para agregar un nuevo aviso de adopción con validación del servidor"""
-    # Cargar regiones para el formulario
-    regiones = Region.query.all()
+    # Cargar regiones para el formulario (desde el cache de referencia)
+    regiones = referencia.regiones()
     
     if request.method == 'POST':
         # Obtener datos del formulario según los nombres reales en el template
-        nombre = request.form.get('nombre', '').strip()
-        email = request.form.get('email', '').strip()
-        celular = request.form.get('celular', '').strip()
-        
-        # Información del lugar
-        region_id = request.form.get('region', '')
-        comuna_id = request.form.get('comuna', '')
-        sector = request.form.get('sector', '').strip()
-        
-        # Información de la mascota
-        tipo = request.form.get('tipo', '')
-        descripcion = request.form.get('descripcion', '').strip()
-        fecha_entrega = request.form.get('fecha-entrega', '')
-        cantidad_str = request.form.get('cantidad', '1')
-        edad_str = request.form.get('edad', '1')
-        
-        # Validaciones del servidor
-        errors = []
-        
-        # Validar campos obligatorios
-        if not nombre:
-            errors.append('El nombre es obligatorio')
-        if not email:
-            errors.append('El email es obligatorio')
-        elif not re.match(r'^[^@]+@[^@]+\.[^@]+$', email):
-            errors.append('El email debe tener formato válido')
-        if not comuna_id:
-            errors.append('Debe seleccionar una comuna')
-        if not tipo:
-            errors.append('Debe seleccionar un tipo de animal')
-        if not descripcion:
-            errors.append('La descripción es obligatoria')
-        if not fecha_entrega:
-            errors.append('Debe especificar una fecha de entrega')
-        
-        # Validar cantidad como número entero
-        try:
-            cantidad = int(float(cantidad_str))
-            if cantidad < 1 or cantidad > 20:
-                errors.append('La cantidad debe ser un número entero entre 1 y 20')
-        except (ValueError, TypeError):
-            errors.append('La cantidad debe ser un número entero válido')
-            cantidad = 1
-        
-        # Validar edad como número entero
-        try:
-            edad = int(float(edad_str))
-            if edad < 1:
-                errors.append('La edad debe ser un número mayor a 0')
-        except (ValueError, TypeError):
-            errors.append('La edad debe ser un número entero válido')
-            edad = 1
-        
-        # Validar que haya al menos un medio de contacto
-        contactos_adicionales_nombres = request.form.getlist('contacto_nombre[]')
-        contactos_adicionales_ids = request.form.getlist('contacto_id[]')
+        datos = {
+            'nombre': request.form.get('nombre', ''),
+            'email': request.form.get('email', ''),
+            'celular': request.form.get('celular', ''),
+            # Información del lugar
+            'comuna_id': request.form.get('comuna', ''),
+            'sector': request.form.get('sector', ''),
+            # Información de la mascota
+            'tipo': request.form.get('tipo', ''),
+            'descripcion': request.form.get('descripcion', ''),
+            'fecha_entrega': request.form.get('fecha-entrega', ''),
+            'cantidad': request.form.get('cantidad', '1'),
+            'edad': request.form.get('edad', '1'),
+            'unidad_medida': request.form.get('unidad-edad', 'm'),
+            'contactos': list(zip(request.form.getlist('contacto_nombre[]'),
+                                  request.form.getlist('contacto_id[]')))
+        }
         
-        has_valid_contact = email or celular
-        
-        # Verificar contactos adicionales válidos
-        for i, (nombre_contacto, id_contacto) in enumerate(zip(contactos_adicionales_nombres, contactos_adicionales_ids)):
-            if nombre_contacto and id_contacto.strip():
-                has_valid_contact = True
-                break
-        
-        if not has_valid_contact:
-            errors.append('Debe proporcionar al menos un medio de contacto válido')
+        # Validaciones del servidor (compartidas con la importación masiva)
+        registro, errors = validar_aviso(datos)
         
         # Si hay errores, mostrarlos
         if errors:
-            for error in errors:
+            for error in mensajes_error(errors):
                 flash(error, 'error')
             return render_template('agregar_aviso.html', regiones=regiones)
         
-        # Si no hay errores, procesar el formulario
+        # Copiar las fotos a uploads/.tmp antes de abrir la transacción:
+        # la escritura a disco no retiene bloqueos en la base de datos
+        fotos_preparadas = []
+        try:
+            for foto in request.files.getlist('fotos'):
+                if foto and foto.filename:
+                    # El nombre original se conserva solo para mostrarlo
+                    filename = secure_filename(foto.filename)
+                    if filename:
+                        fotos_preparadas.append(preparar_foto(foto, filename, current_app.static_folder))
+        except Exception as e:
+            for preparada in fotos_preparadas:
+                descartar_foto(preparada)
+            flash(f'Error al recibir las fotos: {str(e)}', 'error')
+            return render_template('agregar_aviso.html', regiones=regiones)
+        
+        # Unidad de trabajo: aviso, contactos y fotos en un solo flush y un commit
         try:
-            # Convertir fecha de entrega
-            fecha_entrega_dt = datetime.strptime(fecha_entrega, '%Y-%m-%dT%H:%M') if 'T' in fecha_entrega else datetime.strptime(fecha_entrega, '%Y-%m-%d')
-            
-            # Crear nuevo aviso
             nuevo_aviso = AvisoAdopcion(
-                comuna_id=int(comuna_id),
-                sector=sector or None,
-                nombre=nombre,
-                email=email,
-                celular=celular or None,
-                tipo=tipo,
-                cantidad=cantidad,
-                edad=edad,
-                unidad_medida=request.form.get('unidad-edad', 'm'),
-                fecha_entrega=fecha_entrega_dt,
-                descripcion=descripcion,
-                fecha_ingreso=datetime.now()
+                comuna_id=registro['comuna_id'],
+                sector=registro['sector'],
+                nombre=registro['nombre'],
+                email=registro['email'],
+                celular=registro['celular'],
+                tipo=registro['tipo'],
+                cantidad=registro['cantidad'],
+                edad=registro['edad'],
+                unidad_medida=registro['unidad_medida'],
+                edad_meses=registro['edad_meses'],
+                region_id=registro['region_id'],
+                tiene_fotos=bool(fotos_preparadas),
+                fecha_entrega=registro['fecha_entrega'],
+                descripcion=registro['descripcion'],
+                fecha_ingreso=registro['fecha_ingreso'],
+                # Contactos: email, celular y adicionales
+                contactos=[
+                    ContactarPor(nombre=nombre_contacto, identificador=id_contacto)
+                    for nombre_contacto, id_contacto in contactos_del_aviso(registro)
+                ],
+                # Ruta final direccionada por contenido: sin colisiones y sin duplicados
+                fotos=[
+                    Foto(nombre_archivo=preparada.nombre_archivo, ruta_archivo=preparada.ruta)
+                    for preparada in fotos_preparadas
+                ]
             )
-            
             db.session.add(nuevo_aviso)
             db.session.flush()  # Para obtener el ID
+            fotos_ids = [foto.id for foto in nuevo_aviso.fotos]
             
-            # Agregar contacto por email (siempre presente por validación)
-            if email:
-                contacto_email = ContactarPor(
-                    actividad_id=nuevo_aviso.id,
-                    nombre='otra',  # Usar 'otra' para email
-                    identificador=f"Email: {email}"
-                )
-                db.session.add(contacto_email)
-            
-            # Agregar contacto por celular si está presente
-            if celular:
-                contacto_celular = ContactarPor(
-                    actividad_id=nuevo_aviso.id,
-                    nombre='otra',  # Usar 'otra' para celular
-                    identificador=f"Celular: {celular}"
-                )
-                db.session.add(contacto_celular)
-            
-            # Agregar contactos adicionales
-            for i, (nombre_contacto, id_contacto) in enumerate(zip(contactos_adicionales_nombres, contactos_adicionales_ids)):
-                if nombre_contacto and id_contacto.strip():
-                    contacto_adicional = ContactarPor(
-                        actividad_id=nuevo_aviso.id,
-                        nombre=nombre_contacto,
-                        identificador=id_contacto.strip()
-                    )
-                    db.session.add(contacto_adicional)
-            
-            # Manejar archivos de foto
-            fotos = request.files.getlist('fotos')
-            for foto in fotos:
-                if foto and foto.filename:
-                    # Generar nombre único para el archivo
-                    filename = secure_filename(foto.filename)
-                    if filename:
-                        # Crear directorio de uploads si no existe
-                        upload_dir = os.path.join(current_app.static_folder, 'uploads')
-                        os.makedirs(upload_dir, exist_ok=True)
-                        
-                        # Guardar archivo
-                        ruta_archivo = os.path.join(upload_dir, filename)
-                        foto.save(ruta_archivo)
-                        
-                        # Guardar info en BD (ruta relativa para web)
-                        nueva_foto = Foto(
-                            actividad_id=nuevo_aviso.id,
-                            nombre_archivo=filename,
-                            ruta_archivo=f'uploads/{filename}'
-                        )
-                        db.session.add(nueva_foto)
+            # Actualizar el resumen de estadísticas y el índice de búsqueda en la misma transacción
+            registrar_avisos([(nuevo_aviso.comuna_id, nuevo_aviso.tipo)])
+            indexar_avisos([(nuevo_aviso.id, registro)])
             
             # Confirmar transacción
             db.session.commit()
-            
-            flash('Aviso agregado correctamente', 'success')
-            return redirect(url_for('main.index'))
-            
         except Exception as e:
             db.session.rollback()
+            for preparada in fotos_preparadas:
+                descartar_foto(preparada)
             flash(f'Error al guardar el aviso: {str(e)}', 'error')
             return render_template('agregar_aviso.html', regiones=regiones)
+        
+        # Ya confirmado: mover las fotos a su ruta final (rename atómico, con reintentos)
+        fotos_confirmadas, fotos_fallidas = [], []
+        for preparada, foto_id in zip(fotos_preparadas, fotos_ids):
+            try:
+                confirmar_foto(preparada, current_app.static_folder)
+                fotos_confirmadas.append(foto_id)
+            except OSError:
+                current_app.logger.exception('No se pudo mover la foto %s', preparada.ruta)
+                fotos_fallidas.append((preparada, foto_id))
+        if fotos_fallidas:
+            _quitar_fotos_sin_archivo(nuevo_aviso, fotos_fallidas, bool(fotos_confirmadas))
+            flash('Algunas fotos no se pudieron guardar; puede volver a subirlas', 'error')
+        cache_paginas.incrementar_version()
+        marcar_escritura()  # la portada siguiente lee del primario, no de la réplica
+        
+        # Miniaturas y WebP se generan fuera de la petición
+        procesador_imagenes.encolar(fotos_confirmadas)
+        
+        flash('Aviso agregado correctamente', 'success')
+        return redirect(url_for('main.index'))
     
     return render_template('agregar_aviso.html', regiones=regiones)
 
+@main_bp.route('/media/<path:ruta>')
+def media(ruta):
+    """Servir fotos subidas; las direccionadas por contenido se cachean para siempre"""
+    carpeta_uploads = os.path.join(current_app.static_folder, 'uploads')
+    if es_ruta_inmutable(f'uploads/{ruta}'):
+        respuesta = send_from_directory(carpeta_uploads, ruta, max_age=current_app.config['MEDIA_MAX_AGE'])
+        respuesta.cache_control.public = True
+        respuesta.cache_control.immutable = True
+        return respuesta
+    return send_from_directory(carpeta_uploads, ruta)
+
+@main_bp.route('/static/dist/<path:ruta>')
+def estatico_compilado(ruta):
+    """Assets compilados (hash en el nombre): variante precomprimida y caché para siempre"""
+    if ruta == MANIFIESTO:
+        abort(404)
+    carpeta_dist = os.path.join(current_app.static_folder, CARPETA_DIST)
+    archivo, codificacion = variante_precomprimida(carpeta_dist, ruta, request.accept_encodings)
+    respuesta = send_from_directory(
+        carpeta_dist, archivo, max_age=current_app.config['MEDIA_MAX_AGE'],
+        mimetype=mimetypes.guess_type(ruta)[0] or 'application/octet-stream'
+    )
+    if codificacion:
+        respuesta.content_encoding = codificacion
+    respuesta.vary.add('Accept-Encoding')
+    respuesta.cache_control.public = True
+    respuesta.cache_control.immutable = True
+    return respuesta
+
 @main_bp.route('/listado-avisos')
+@solo_lectura
+@cache_paginas.cachear
 def listado_avisos():
     """Listado de todos los avisos de adopción - 5 por página"""
     page = request.args.get('page', 1, type=int)
     per_page = 5  # Mostrar 5 avisos por página según requerimiento
     
+    # Búsqueda de texto: resultados ordenados por relevancia
+    consulta = request.args.get('q', '').strip()
+    if consulta:
+        avisos = buscar_avisos(consulta, consulta_listado(), page, per_page)
+        return render_template('listado_avisos.html', avisos=avisos, busqueda=consulta)
+    
+    # Filtros enviados por la paginación del template (tipo y región)
+    tipo_filtro = request.args.get('tipo') or None
+    region_filtro = request.args.get('region') or None
+    try:
+        filtros = leer_filtros({'tipo': tipo_filtro, 'region_id': region_filtro})
+    except ValueError:
+        filtros, tipo_filtro, region_filtro = {}, None, None
+    query = filtrar_avisos(consulta_listado(), filtros)
+    contexto = {'tipo_filtro': tipo_filtro, 'region_filtro': region_filtro}
+    
+    # Modo cursor: navegación anterior/siguiente sin COUNT(*) ni OFFSET
+    if 'cursor' in request.args:
+        try:
+            avisos = paginar_por_cursor(query, request.args.get('cursor'), per_page)
+        except ValueError:
+            avisos = paginar_por_cursor(query, None, per_page)
+        return render_template('listado_avisos.html', avisos=avisos, modo_cursor=True, **contexto)
+    
     # Ordenar por fecha de ingreso descendente (más recientes primero)
-    avisos = AvisoAdopcion.query.order_by(
-        AvisoAdopcion.fecha_ingreso.desc()
-    ).paginate(page=page, per_page=per_page, error_out=False)
+    avisos = query.paginate(page=page, per_page=per_page, error_out=False)
     
-    return render_template('listado_avisos.html', avisos=avisos)
+    return render_template('listado_avisos.html', avisos=avisos, modo_cursor=False, **contexto)
 
 @main_bp.route('/estadisticas')
+@solo_lectura
 def estadisticas():
     """Página de estadísticas"""
     try:
-        # Estadísticas por tipo
-        stats_tipo = db.session.query(
-            AvisoAdopcion.tipo,
-            db.func.count(AvisoAdopcion.id).label('total')
-        ).group_by(AvisoAdopcion.tipo).all()
-        
-        # Estadísticas por región
-        stats_region = db.session.query(
-            Region.nombre,
-            db.func.count(AvisoAdopcion.id).label('total')
-        ).select_from(Region).join(
-            Comuna, Region.id == Comuna.region_id
-        ).join(
-            AvisoAdopcion, Comuna.id == AvisoAdopcion.comuna_id
-        ).group_by(Region.nombre).all()
-        
-        # Estadísticas por comuna (top 10)
-        stats_comuna = db.session.query(
-            Comuna.nombre,
-            db.func.count(AvisoAdopcion.id).label('total')
-        ).join(
-            AvisoAdopcion, Comuna.id == AvisoAdopcion.comuna_id
-        ).group_by(Comuna.nombre).order_by(
-            db.func.count(AvisoAdopcion.id).desc()
-        ).limit(10).all()
+        # Leer el resumen precalculado (no recorre aviso_adopcion)
+        stats_tipo, stats_region, stats_comuna = resumen_estadisticas()
         
         return render_template('estadisticas.html', 
                              stats_tipo=stats_tipo,
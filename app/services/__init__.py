@@ -0,0 +1,70 @@
+# Servicios de consulta y lógica de negocio compartida por las rutas
+from .avisos import (
+    consulta_listado, paginar_por_cursor, contar_total, PaginaCursor, leer_filtros, filtrar_avisos,
+    consulta_cursor, pagina_cursor, fecha_limite
+)
+from .cache import CacheTTL
+from .referencia import CacheReferencia, referencia
+from .estadisticas import (
+    registrar_avisos, reconstruir_estadisticas, resumen_estadisticas,
+    resumen_estadisticas_cacheado, serie_temporal
+)
+from .exportacion import exportar_avisos, iterar_avisos, FORMATOS_EXPORTACION
+from .validacion import (
+    validar_aviso, validar_lote, contactos_del_aviso, mensajes_error, es_email_valido, es_celular_valido,
+    Campo, ESQUEMA_AVISO, ESQUEMA_CONTACTO, ruta_foto_segura
+)
+from .importacion import importar_avisos, leer_registros, FilaInvalida, FORMATOS_IMPORTACION
+from .imagenes import ProcesadorImagenes, procesador_imagenes, generar_variantes
+from .almacenamiento import (
+    guardar_foto, es_ruta_inmutable, FotoPreparada, preparar_foto, confirmar_foto, descartar_foto,
+    barrer_huerfanos
+)
+from .busqueda import indexar_avisos, reindexar_avisos, buscar_ids, buscar_avisos, normalizar
+from .diagnostico import explicar_filtros, plan_consulta, es_escaneo_completo
+from .perfilado import Perfilador, perfilador
+from .datos_sinteticos import generar_avisos
+from .cache_paginas import CachePaginas, cache_paginas
+from .esquema import crear_esquema, migrar_esquema, leer_region_comuna, sembrar_region_comuna
+from .compresion import (
+    comprimir, variantes, elegir_codificacion, codificaciones_disponibles, comprimir_flujo,
+    CompresorRespuestas, compresor_respuestas
+)
+from .estaticos import (
+    compilar_estaticos, variante_precomprimida, ManifiestoEstaticos, manifiesto_estaticos, CARPETA_DIST,
+    MANIFIESTO
+)
+from .artefacto_referencia import ArtefactoReferencia, artefacto_referencia
+from .serializacion import (
+    leer_campos, leer_incluir, columnas_aviso, serializar_avisos, codificar_json, respuesta_json,
+    consulta_relacion, agrupar_relacion, filas_a_dicts
+)
+from .versiones import (
+    a_utc, etag_version, no_modificado, version_referencia, consulta_fecha_aviso, consulta_estado_fotos,
+    estado_fotos, version_aviso, consulta_ultimo_aviso, version_avisos, cachea_listado
+)
+
+__all__ = ['consulta_listado', 'paginar_por_cursor', 'contar_total', 'PaginaCursor',
+           'leer_filtros', 'filtrar_avisos', 'fecha_limite', 'CacheTTL',
+           'CacheReferencia', 'referencia', 'registrar_avisos',
+           'reconstruir_estadisticas', 'resumen_estadisticas',
+           'resumen_estadisticas_cacheado', 'serie_temporal', 'exportar_avisos',
+           'iterar_avisos', 'FORMATOS_EXPORTACION', 'validar_aviso', 'validar_lote', 'contactos_del_aviso',
+           'mensajes_error', 'es_email_valido', 'es_celular_valido', 'Campo', 'ESQUEMA_AVISO',
+           'ESQUEMA_CONTACTO', 'ruta_foto_segura',
+           'importar_avisos', 'leer_registros', 'FilaInvalida', 'FORMATOS_IMPORTACION',
+           'ProcesadorImagenes', 'procesador_imagenes', 'generar_variantes',
+           'guardar_foto', 'es_ruta_inmutable', 'FotoPreparada', 'preparar_foto',
+           'confirmar_foto', 'descartar_foto', 'barrer_huerfanos', 'indexar_avisos', 'reindexar_avisos',
+           'buscar_ids', 'buscar_avisos', 'normalizar', 'explicar_filtros', 'plan_consulta', 'es_escaneo_completo',
+           'Perfilador', 'perfilador', 'generar_avisos',
+           'CachePaginas', 'cache_paginas', 'leer_campos', 'leer_incluir', 'columnas_aviso',
+           'serializar_avisos', 'codificar_json', 'respuesta_json', 'crear_esquema', 'migrar_esquema',
+           'leer_region_comuna', 'sembrar_region_comuna', 'comprimir', 'variantes',
+           'elegir_codificacion', 'codificaciones_disponibles', 'ArtefactoReferencia',
+           'artefacto_referencia', 'comprimir_flujo', 'CompresorRespuestas', 'compresor_respuestas',
+           'compilar_estaticos', 'variante_precomprimida', 'ManifiestoEstaticos', 'manifiesto_estaticos',
+           'CARPETA_DIST', 'MANIFIESTO', 'consulta_cursor', 'pagina_cursor', 'consulta_relacion',
+           'agrupar_relacion', 'filas_a_dicts', 'a_utc', 'etag_version', 'no_modificado',
+           'version_referencia', 'consulta_fecha_aviso', 'consulta_estado_fotos', 'estado_fotos',
+           'version_aviso', 'consulta_ultimo_aviso', 'version_avisos', 'cachea_listado']
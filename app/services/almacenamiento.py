@@ -0,0 +1,155 @@
+import hashlib
+import os
+import re
+import tempfile
+import time
+
+# Tamaño de los bloques leídos desde la subida
+TAMANO_BLOQUE = 64 * 1024
+
+# uploads/ab/cd/<sha256>.<ext> y sus variantes (<sha256>.<ext>.thumb.webp, <sha256>.<ext>.webp)
+_RUTA_DIRECCIONADA_RE = re.compile(r'^uploads/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}(\.[a-z0-9]+)+$')
+_EXTENSION_RE = re.compile(r'^[a-z0-9]{1,5}$')
+
+def es_ruta_inmutable(ruta):
+    """Indica si la ruta es direccionada por contenido (su contenido nunca cambia)"""
+    return bool(_RUTA_DIRECCIONADA_RE.match(ruta or ''))
+
+def _extension(nombre_archivo):
+    extension = nombre_archivo.rsplit('.', 1)[-1].lower() if '.' in nombre_archivo else ''
+    return extension if _EXTENSION_RE.match(extension) else 'bin'
+
+class FotoPreparada:
+    """Foto subida copiada a uploads/.tmp, pendiente de moverse a su ruta final"""
+
+    def __init__(self, temporal, ruta, nombre_archivo):
+        self.temporal = temporal
+        self.ruta = ruta
+        self.nombre_archivo = nombre_archivo
+
+def _carpeta_temporal(carpeta_static):
+    return os.path.join(carpeta_static, 'uploads', '.tmp')
+
+def preparar_foto(archivo, nombre_archivo, carpeta_static):
+    """
+    Copiar una foto subida a uploads/.tmp por bloques calculando su SHA-256.
+    
+    No toca la ruta final: se llama antes de abrir la transacción, y después
+    del commit ``confirmar_foto`` mueve el archivo (o ``descartar_foto`` lo
+    elimina si la transacción falla).
+    """
+    carpeta_temporal = _carpeta_temporal(carpeta_static)
+    os.makedirs(carpeta_temporal, exist_ok=True)
+    
+    huella = hashlib.sha256()
+    descriptor, temporal = tempfile.mkstemp(dir=carpeta_temporal)
+    try:
+        with os.fdopen(descriptor, 'wb') as destino:
+            while True:
+                bloque = archivo.stream.read(TAMANO_BLOQUE)
+                if not bloque:
+                    break
+                huella.update(bloque)
+                destino.write(bloque)
+    except Exception:
+        os.remove(temporal)
+        raise
+    
+    digest = huella.hexdigest()
+    ruta = f'uploads/{digest[:2]}/{digest[2:4]}/{digest}.{_extension(nombre_archivo)}'
+    return FotoPreparada(temporal, ruta, nombre_archivo)
+
+def confirmar_foto(preparada, carpeta_static, intentos=3, espera=0.1):
+    """
+    Mover atómicamente la foto a ``uploads/<h[0:2]>/<h[2:4]>/<hash>.<ext>``.
+    Si ya existía un archivo idéntico se reemplaza igual: el contenido es el
+    mismo y su fecha de modificación queda al día, de modo que el barrido de
+    huérfanos no lo elimina mientras se registra el nuevo uso.
+    Un fallo transitorio (OSError) se reintenta hasta ``intentos`` veces; si
+    persiste se propaga y el temporal queda en su lugar.
+    """
+    final = os.path.join(carpeta_static, preparada.ruta)
+    for intento in range(1, intentos + 1):
+        try:
+            os.makedirs(os.path.dirname(final), exist_ok=True)
+            os.replace(preparada.temporal, final)
+            return preparada.ruta
+        except OSError:
+            if intento == intentos:
+                raise
+            time.sleep(espera * intento)
+
+def descartar_foto(preparada):
+    """Eliminar el temporal de una foto que no llegó a confirmarse"""
+    try:
+        os.remove(preparada.temporal)
+    except FileNotFoundError:
+        pass
+
+def guardar_foto(archivo, nombre_archivo, carpeta_static):
+    """
+    Guardar una foto subida bajo su hash SHA-256 y devolver su ruta relativa
+    (``preparar_foto`` seguido de ``confirmar_foto``). Se usa fuera de una
+    transacción; dentro de una, preparar antes y confirmar tras el commit.
+    """
+    return confirmar_foto(preparar_foto(archivo, nombre_archivo, carpeta_static), carpeta_static)
+
+def _sha256_archivo(ruta):
+    huella = hashlib.sha256()
+    with open(ruta, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(TAMANO_BLOQUE), b''):
+            huella.update(bloque)
+    return huella.hexdigest()
+
+def _rutas_faltantes(carpeta_static, rutas_en_uso):
+    """Hash -> ruta de los originales referenciados cuyo archivo no existe"""
+    faltantes = {}
+    for ruta in rutas_en_uso:
+        nombre = os.path.basename(ruta)
+        # Solo originales (<hash>.<ext>): las variantes se regeneran
+        if es_ruta_inmutable(ruta) and nombre.count('.') == 1 \
+                and not os.path.exists(os.path.join(carpeta_static, ruta)):
+            faltantes[nombre.split('.', 1)[0]] = ruta
+    return faltantes
+
+def barrer_huerfanos(carpeta_static, rutas_en_uso, edad_minima=3600, simular=False):
+    """
+    Eliminar archivos que ninguna fila referencia:
+    - temporales de uploads/.tmp (subidas interrumpidas o transacciones fallidas);
+    - archivos direccionados por contenido (originales y variantes) que no
+      están en ``rutas_en_uso``.
+    Un temporal cuyo contenido es el de una foto referenciada sin archivo
+    (``confirmar_foto`` falló después del commit) no se elimina: se mueve a
+    su ruta final. Solo se consideran archivos sin modificar hace al menos
+    ``edad_minima`` segundos, para no competir con una subida en curso.
+    Devuelve ``(eliminados, recuperados)``: rutas relativas a static de lo
+    que se eliminó y de lo que se recuperó (o se haría, si ``simular``).
+    """
+    limite = time.time() - edad_minima
+    carpeta_uploads = os.path.join(carpeta_static, 'uploads')
+    faltantes = _rutas_faltantes(carpeta_static, rutas_en_uso)
+    eliminados, recuperados = [], []
+    for directorio, _, archivos in os.walk(carpeta_uploads):
+        for nombre in archivos:
+            completo = os.path.join(directorio, nombre)
+            ruta = os.path.relpath(completo, carpeta_static).replace(os.sep, '/')
+            es_temporal = os.path.dirname(completo) == _carpeta_temporal(carpeta_static)
+            if not es_temporal and (not es_ruta_inmutable(ruta) or ruta in rutas_en_uso):
+                continue
+            try:
+                if os.path.getmtime(completo) > limite:
+                    continue
+                destino = faltantes.pop(_sha256_archivo(completo), None) if es_temporal and faltantes else None
+                if destino is not None:
+                    if not simular:
+                        final = os.path.join(carpeta_static, destino)
+                        os.makedirs(os.path.dirname(final), exist_ok=True)
+                        os.replace(completo, final)
+                    recuperados.append(destino)
+                    continue
+                if not simular:
+                    os.remove(completo)
+            except FileNotFoundError:
+                continue
+            eliminados.append(ruta)
+    return eliminados, recuperados
@@ -0,0 +1,94 @@
+"""
+Artefacto JSON de regiones y comunas para el formulario.
+
+Se genera desde el cache de referencia (es decir, desde la base de datos),
+con mapas indexados por id, y se direcciona por contenido: la URL incluye el
+hash, así que se sirve como inmutable y cambia sola cuando cambian los datos.
+Las variantes gzip/brotli se comprimen una vez por versión.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from .compresion import variantes
+from .referencia import referencia
+
+PREFIJO = 'region-comuna'
+
+def construir_contenido(datos):
+    """
+    Contenido del artefacto a partir de los datos del cache de referencia:
+    ``{'regiones': {id: {'nombre', 'comunas': [ids]}}, 'comunas': {id: {'nombre', 'region_id'}}}``
+    """
+    regiones = {
+        str(region['id']): {
+            'nombre': region['nombre'],
+            'comunas': [comuna['id'] for comuna in datos['comunas_por_region'].get(region['id'], ())],
+        }
+        for region in datos['regiones']
+    }
+    comunas = {
+        str(comuna_id): {'nombre': comuna['nombre'], 'region_id': comuna['region_id']}
+        for comuna_id, comuna in sorted(datos['comunas_por_id'].items())
+    }
+    return {'regiones': regiones, 'comunas': comunas}
+
+class ArtefactoReferencia:
+    """Artefacto vigente, regenerado cuando cambia la versión del cache de referencia"""
+
+    def __init__(self):
+        self._actual = None
+        self._lock = threading.Lock()
+
+    def _construir(self, datos):
+        cuerpo = json.dumps(construir_contenido(datos), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        hash_contenido = hashlib.sha256(cuerpo).hexdigest()[:16]
+        return {
+            'version_referencia': datos['version'],
+            'hash': hash_contenido,
+            'nombre': f'{PREFIJO}.{hash_contenido}.json',
+            'cuerpo': cuerpo,
+            'variantes': variantes(cuerpo),
+        }
+
+    @property
+    def actual(self):
+        datos = referencia.datos
+        artefacto = self._actual
+        if artefacto is None or artefacto['version_referencia'] != datos['version']:
+            with self._lock:
+                if self._actual is None or self._actual['version_referencia'] != datos['version']:
+                    self._actual = self._construir(datos)
+                artefacto = self._actual
+        return artefacto
+
+    @property
+    def hash(self):
+        return self.actual['hash']
+
+    def escribir(self, destino):
+        """
+        Escribir el artefacto y sus variantes (``.gz``, ``.br``) en ``destino``
+        para servirlos desde un CDN o un servidor estático; devuelve las rutas.
+        Las versiones anteriores se conservan (páginas cacheadas aún las usan).
+        """
+        artefacto = self.actual
+        os.makedirs(destino, exist_ok=True)
+        extensiones = {'gzip': '.gz', 'br': '.br'}
+        archivos = [(artefacto['nombre'], artefacto['cuerpo'])] + [
+            (artefacto['nombre'] + extensiones[codificacion], contenido)
+            for codificacion, contenido in artefacto['variantes'].items()
+        ]
+        rutas = []
+        for nombre, contenido in archivos:
+            ruta = os.path.join(destino, nombre)
+            temporal = f'{ruta}.tmp'
+            with open(temporal, 'wb') as archivo:
+                archivo.write(contenido)
+            os.replace(temporal, ruta)
+            rutas.append(ruta)
+        return rutas
+
+# Instancia única por worker
+artefacto_referencia = ArtefactoReferencia()
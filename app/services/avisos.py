@@ -0,0 +1,225 @@
+import base64
+import json
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import selectinload
+from .. import db
+from ..models import AvisoAdopcion
+from .cache import CacheTTL
+from .referencia import referencia
+
+# Totales aproximados compartidos por las peticiones del mismo worker
+_cache_totales = CacheTTL(max_items=128)
+
+def consulta_listado():
+    """
+    Consulta base para las vistas de listado.
+    Carga las fotos de toda la página en una sola consulta adicional
+    (selectinload), evitando el N+1. El nombre de la comuna se resuelve con
+    el cache de referencia (``nombre_comuna``), sin JOIN.
+    """
+    return AvisoAdopcion.query.options(
+        selectinload(AvisoAdopcion.fotos)
+    ).order_by(
+        AvisoAdopcion.fecha_ingreso.desc(),
+        AvisoAdopcion.id.desc()
+    )
+
+def codificar_cursor(direccion, aviso):
+    """Generar un cursor opaco a partir de la clave (fecha_ingreso, id) de un aviso"""
+    crudo = json.dumps([direccion, aviso.fecha_ingreso.isoformat(), aviso.id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(crudo.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decodificar_cursor(cursor):
+    """Obtener (direccion, fecha_ingreso, id) desde un cursor; ValueError si es inválido"""
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        direccion, fecha, aviso_id = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        if direccion not in ('n', 'p'):
+            raise ValueError(direccion)
+        return direccion, datetime.fromisoformat(fecha), int(aviso_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError('Cursor inválido') from e
+
+class PaginaCursor:
+    """Página obtenida por keyset, con cursores hacia la página siguiente y anterior"""
+
+    def __init__(self, items, per_page, next_cursor=None, prev_cursor=None, total=None):
+        self.items = items
+        self.per_page = per_page
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.total = total
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+def consulta_cursor(query, cursor=None):
+    """
+    Aplicar a ``query`` (Query o Select) el filtro y el orden del cursor;
+    devuelve ``(query, direccion)``. ValueError si el cursor es inválido.
+    """
+    fecha_col, id_col = AvisoAdopcion.fecha_ingreso, AvisoAdopcion.id
+    query = query.order_by(None)
+    direccion = 'n'
+
+    if cursor:
+        direccion, fecha, aviso_id = decodificar_cursor(cursor)
+        if direccion == 'n':
+            query = query.filter(or_(fecha_col < fecha, and_(fecha_col == fecha, id_col < aviso_id)))
+        else:
+            query = query.filter(or_(fecha_col > fecha, and_(fecha_col == fecha, id_col > aviso_id)))
+
+    if direccion == 'n':
+        query = query.order_by(fecha_col.desc(), id_col.desc())
+    else:
+        query = query.order_by(fecha_col.asc(), id_col.asc())
+    return query, direccion
+
+def pagina_cursor(items, per_page, cursor, direccion):
+    """Armar la página con las filas de ``consulta_cursor`` limitadas a ``per_page + 1``"""
+    items = list(items)
+    hay_mas = len(items) > per_page
+    items = items[:per_page]
+
+    if direccion == 'p':
+        items.reverse()
+        hay_siguiente, hay_anterior = True, hay_mas
+    else:
+        hay_siguiente, hay_anterior = hay_mas, bool(cursor)
+
+    return PaginaCursor(
+        items,
+        per_page,
+        next_cursor=codificar_cursor('n', items[-1]) if items and hay_siguiente else None,
+        prev_cursor=codificar_cursor('p', items[0]) if items and hay_anterior else None
+    )
+
+def paginar_por_cursor(query, cursor=None, per_page=10):
+    """
+    Paginar por keyset sobre (fecha_ingreso, id) en orden descendente.
+    Usa el índice compuesto aviso_fecha_ingreso_id_idx, por lo que el costo no
+    depende de la profundidad de la página y no se ejecuta COUNT(*).
+    """
+    query, direccion = consulta_cursor(query, cursor)
+    # Se pide un elemento extra para saber si existe otra página en esa dirección
+    return pagina_cursor(query.limit(per_page + 1).all(), per_page, cursor, direccion)
+
+def contar_total(query, modo, clave):
+    """
+    Calcular el total de resultados según el modo solicitado:
+    'exacto' ejecuta COUNT(*), 'aprox' reutiliza un conteo cacheado por
+    TOTAL_CACHE_TTL segundos y cualquier otro valor omite el total.
+    """
+    if modo == 'exacto':
+        return query.order_by(None).count()
+    if modo == 'aprox':
+        return _cache_totales.obtener_o_calcular(
+            clave,
+            lambda: query.order_by(None).count(),
+            ttl=current_app.config['TOTAL_CACHE_TTL']
+        )
+    return None
+
+def _entero(valor):
+    return int(valor) if valor not in (None, '') else None
+
+def fecha_limite(valor, fin=False):
+    """Fecha ISO; si es solo día y marca el fin del rango, el límite es el día siguiente"""
+    if valor in (None, ''):
+        return None
+    fecha = datetime.fromisoformat(valor)
+    if fin and len(valor) == 10:
+        fecha += timedelta(days=1)
+    return fecha
+
+def _meses(edad, unidad):
+    return edad * 12 if unidad == 'a' else edad
+
+def leer_filtros(args):
+    """
+    Interpretar los filtros de listado desde los parámetros de la petición:
+    ``tipo``, ``region_id``, ``comuna_id``, ``entrega_desde``/``entrega_hasta``,
+    ``ingreso_desde``/``ingreso_hasta`` (AAAA-MM-DD, ambos inclusive),
+    ``edad_min``/``edad_max`` en la unidad ``edad_unidad`` ('a' o 'm', por
+    defecto meses), ``cantidad_min``/``cantidad_max`` y ``con_fotos`` (1 o 0).
+    Devuelve un dict solo con los filtros presentes; ValueError si alguno es inválido.
+    """
+    filtros = {}
+    tipo = args.get('tipo')
+    if tipo:
+        if tipo not in ('gato', 'perro'):
+            raise ValueError(f'Tipo no soportado: {tipo}')
+        filtros['tipo'] = tipo
+    
+    for nombre in ('region_id', 'comuna_id', 'cantidad_min', 'cantidad_max'):
+        valor = _entero(args.get(nombre))
+        if valor is not None:
+            filtros[nombre] = valor
+    
+    for nombre, columna in (('entrega', 'fecha_entrega'), ('ingreso', 'fecha_ingreso')):
+        desde = fecha_limite(args.get(f'{nombre}_desde'))
+        hasta = fecha_limite(args.get(f'{nombre}_hasta'), fin=True)
+        if desde is not None:
+            filtros[f'{columna}_desde'] = desde
+        if hasta is not None:
+            filtros[f'{columna}_hasta'] = hasta
+    
+    unidad = args.get('edad_unidad') or 'm'
+    if unidad not in ('a', 'm'):
+        raise ValueError(f'Unidad de edad no soportada: {unidad}')
+    for nombre in ('edad_min', 'edad_max'):
+        valor = _entero(args.get(nombre))
+        if valor is not None:
+            filtros[f'{nombre}_meses'] = _meses(valor, unidad)
+    
+    con_fotos = args.get('con_fotos')
+    if con_fotos not in (None, ''):
+        if con_fotos not in ('0', '1'):
+            raise ValueError('con_fotos debe ser 0 o 1')
+        filtros['con_fotos'] = con_fotos == '1'
+    return filtros
+
+def filtrar_avisos(query, filtros):
+    """
+    Aplicar filtros (ver ``leer_filtros``) a una consulta de avisos.
+    Región y fotos se comparan sobre las columnas derivadas ``region_id`` y
+    ``tiene_fotos`` (índices con el orden del listado) y la edad sobre
+    ``edad_meses``. Los rangos que no son de ``fecha_ingreso`` se resuelven en
+    una subconsulta de ids sobre su propio índice: combinados con el
+    ``ORDER BY fecha_ingreso`` el planificador prefería recorrer el índice de
+    fechas completo (SCAN) en lugar de buscar por el rango.
+    """
+    if 'tipo' in filtros:
+        query = query.filter(AvisoAdopcion.tipo == filtros['tipo'])
+    if 'comuna_id' in filtros:
+        query = query.filter(AvisoAdopcion.comuna_id == filtros['comuna_id'])
+    if 'region_id' in filtros:
+        query = query.filter(AvisoAdopcion.region_id == filtros['region_id'])
+    if 'con_fotos' in filtros:
+        query = query.filter(AvisoAdopcion.tiene_fotos == filtros['con_fotos'])
+    
+    for clave, operador in (('fecha_ingreso_desde', '>='), ('fecha_ingreso_hasta', '<')):
+        if clave in filtros:
+            query = query.filter(AvisoAdopcion.fecha_ingreso.op(operador)(filtros[clave]))
+    
+    rangos = (
+        ('fecha_entrega_desde', AvisoAdopcion.fecha_entrega, '>='),
+        ('fecha_entrega_hasta', AvisoAdopcion.fecha_entrega, '<'),
+        ('edad_min_meses', AvisoAdopcion.edad_meses, '>='),
+        ('edad_max_meses', AvisoAdopcion.edad_meses, '<='),
+        ('cantidad_min', AvisoAdopcion.cantidad, '>='),
+        ('cantidad_max', AvisoAdopcion.cantidad, '<=')
+    )
+    condiciones = [columna.op(operador)(filtros[clave]) for clave, columna, operador in rangos if clave in filtros]
+    if condiciones:
+        # correlate(None): la subconsulta es sobre la misma tabla y no debe correlacionarse
+        ids = db.select(AvisoAdopcion.id).where(*condiciones).correlate(None)
+        query = query.filter(AvisoAdopcion.id.in_(ids))
+    return query
@@ -0,0 +1,304 @@
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from itertools import combinations, product
+from .. import db
+from ..models import AvisoAdopcion, AvisoTermino
+from .referencia import referencia
+
+_PALABRA_RE = re.compile(r'[a-z0-9]+')
+
+# Palabras vacías frecuentes del español que no aportan a la búsqueda
+STOPWORDS = frozenset('''
+    a al algo como con de del desde el ella ellos en entre es esta este esto ha hay la las le lo los
+    mas me mi muy no nos o para pero por que se ser si sin sobre su sus tan te tiene un una uno unos
+    unas y ya
+'''.split())
+
+# Peso de cada campo en el puntaje: coincidir en la comuna vale más que en la descripción
+PESOS = {'descripcion': 1, 'sector': 2, 'region': 2, 'comuna': 3}
+
+# 'gato' y 'perro' no se indexan: en la consulta filtran por aviso_adopcion.tipo
+# (índice aviso_tipo_fecha_ingreso_idx) y suman PESO_TIPO al puntaje. Como
+# términos aparecían en todos los avisos y la búsqueda recorría ~500.000 filas.
+TIPOS = frozenset(('gato', 'perro'))
+PESO_TIPO = 3
+
+# Tope al contar las filas de cada término y peso: basta para elegir el más escaso
+TOPE_FRECUENCIA = 10000
+
+# Combinaciones (términos presentes x peso de cada uno) por nivel que se
+# consultan por separado; con más, el nivel se ordena completo en SQL
+MAX_RAMAS = 64
+
+LARGO_MAXIMO_TERMINO = 64
+
+def normalizar(texto):
+    """
+    Separar un texto en términos de búsqueda: minúsculas, sin tildes ni eñes
+    (NFKD), sin palabras vacías y con un singular simple ('perros' -> 'perro',
+    'labradores' -> 'labrador').
+    """
+    if not texto:
+        return []
+    plano = unicodedata.normalize('NFKD', texto.lower())
+    plano = ''.join(c for c in plano if not unicodedata.combining(c))
+    terminos = []
+    for palabra in _PALABRA_RE.findall(plano):
+        if len(palabra) < 2 or palabra in STOPWORDS:
+            continue
+        if len(palabra) > 4 and palabra.endswith('es') and palabra[-3] not in 'aeiou':
+            palabra = palabra[:-2]
+        elif len(palabra) > 3 and palabra.endswith('s'):
+            palabra = palabra[:-1]
+        terminos.append(palabra[:LARGO_MAXIMO_TERMINO])
+    return terminos
+
+def terminos_aviso(registro):
+    """Términos ponderados de un aviso (dict con columnas del modelo)"""
+    pesos = Counter()
+    region = referencia.region_de_comuna(registro.get('comuna_id'))
+    campos = {
+        'descripcion': registro.get('descripcion'),
+        'sector': registro.get('sector'),
+        'comuna': referencia.nombre_comuna(registro.get('comuna_id')),
+        'region': region['nombre'] if region else None
+    }
+    for campo, texto in campos.items():
+        for termino in normalizar(texto):
+            if termino not in TIPOS:
+                pesos[termino] += PESOS[campo]
+    return pesos
+
+def indexar_avisos(avisos):
+    """
+    Agregar avisos al índice dentro de la transacción en curso (sin commit).
+    ``avisos`` es un iterable de (aviso_id, registro).
+    """
+    filas = [
+        {'termino': termino, 'aviso_id': aviso_id, 'peso': min(peso, 32767)}
+        for aviso_id, registro in avisos
+        for termino, peso in terminos_aviso(registro).items()
+    ]
+    if filas:
+        db.session.execute(AvisoTermino.__table__.insert(), filas)
+
+def reindexar_avisos(tamano_lote=1000):
+    """Reconstruir el índice completo recorriendo los avisos por lotes"""
+    tabla = AvisoAdopcion.__table__
+    columnas = (tabla.c.id, tabla.c.comuna_id, tabla.c.sector, tabla.c.descripcion)
+    total = 0
+    try:
+        db.session.execute(AvisoTermino.__table__.delete())
+        ultimo_id = 0
+        while True:
+            filas = db.session.execute(
+                db.select(*columnas).where(tabla.c.id > ultimo_id).order_by(tabla.c.id).limit(tamano_lote)
+            ).mappings().all()
+            if not filas:
+                break
+            indexar_avisos((fila['id'], fila) for fila in filas)
+            total += len(filas)
+            ultimo_id = filas[-1]['id']
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return total
+
+def _pesos(termino):
+    """
+    Pesos distintos del término, del mayor al menor, con la cantidad de filas
+    de cada uno (hasta TOPE_FRECUENCIA). Un máximo por consulta sobre
+    aviso_termino_peso_idx: pocas búsquedas en el índice en vez de recorrer
+    todas las filas del término.
+    """
+    pesos = []
+    techo = None
+    while True:
+        consulta = db.select(db.func.max(AvisoTermino.peso)).where(AvisoTermino.termino == termino)
+        if techo is not None:
+            consulta = consulta.where(AvisoTermino.peso < techo)
+        peso = db.session.scalar(consulta)
+        if peso is None:
+            return pesos
+        muestra = db.select(AvisoTermino.aviso_id).where(
+            AvisoTermino.termino == termino, AvisoTermino.peso == peso
+        ).limit(TOPE_FRECUENCIA).subquery()
+        pesos.append((peso, db.session.scalar(db.select(db.func.count()).select_from(muestra))))
+        techo = peso
+
+def _con_tipo(consulta, aviso_id, tipo):
+    """
+    Filtrar por tipo con un EXISTS por aviso: con un JOIN y estadísticas
+    (ANALYZE) el planificador recorría el índice de tipo (la mitad de los
+    avisos) y ordenaba, en vez de recorrer el término en orden de aviso_id.
+    """
+    if tipo is None:
+        return consulta
+    return consulta.where(db.exists().where(AvisoAdopcion.id == aviso_id, AvisoAdopcion.tipo == tipo))
+
+def _ramas_nivel(pesos, coincidencias):
+    """
+    Ramas de un nivel: cada combinación de ``coincidencias`` términos con un
+    peso por término, como ``(puntaje, ((termino, peso, frecuencia), ...), ausentes)``.
+    Se detiene (None) si pasan de MAX_RAMAS.
+    """
+    ramas = []
+    for presentes in combinations(pesos, coincidencias):
+        ausentes = [termino for termino in pesos if termino not in presentes]
+        for combinacion in product(*(pesos[termino] for termino in presentes)):
+            ramas.append((
+                sum(peso for peso, _ in combinacion),
+                tuple((termino, peso, frecuencia) for termino, (peso, frecuencia) in zip(presentes, combinacion)),
+                ausentes
+            ))
+            if len(ramas) > MAX_RAMAS:
+                return None
+    return ramas
+
+def _rama(puntaje, presentes, ausentes, tipo, limite):
+    """
+    Avisos con cada término presente con exactamente su peso y sin los
+    ausentes, de los más nuevos a los más antiguos. Recorre el par
+    (término, peso) más escaso en orden de aviso_id sobre
+    aviso_termino_peso_idx y busca los demás por clave primaria: se detiene
+    al juntar ``limite`` filas.
+    """
+    guia_termino, guia_peso, _ = min(presentes, key=lambda presente: presente[2])
+    guia = db.aliased(AvisoTermino)
+    consulta = db.select(guia.aviso_id.label('aviso_id'), db.literal(puntaje).label('puntaje')).where(
+        guia.termino == guia_termino, guia.peso == guia_peso
+    )
+    for termino, peso, _ in presentes:
+        if termino != guia_termino:
+            otro = db.aliased(AvisoTermino)
+            consulta = consulta.join(otro, db.and_(
+                otro.termino == termino, otro.aviso_id == guia.aviso_id, otro.peso == peso
+            ))
+    if ausentes:
+        otro = db.aliased(AvisoTermino)
+        consulta = consulta.where(~db.exists().where(otro.termino.in_(ausentes), otro.aviso_id == guia.aviso_id))
+    return _con_tipo(consulta, guia.aviso_id, tipo).order_by(guia.aviso_id.desc()).limit(limite)
+
+def _nivel_por_puntaje(ramas, tipo, limite):
+    """
+    Filas de un nivel en orden de puntaje y, con el mismo puntaje, de aviso_id.
+    Una consulta por puntaje (de mayor a menor) que une sus ramas; se deja de
+    consultar al juntar ``limite`` filas.
+    """
+    por_puntaje = defaultdict(list)
+    for puntaje, presentes, ausentes in ramas:
+        por_puntaje[puntaje].append((presentes, ausentes))
+    filas = []
+    for puntaje in sorted(por_puntaje, reverse=True):
+        restantes = limite - len(filas)
+        selects = [
+            db.select(rama.c.aviso_id, rama.c.puntaje).select_from(rama)
+            for rama in (
+                _rama(puntaje, presentes, ausentes, tipo, restantes).subquery()
+                for presentes, ausentes in por_puntaje[puntaje]
+            )
+        ]
+        consulta = selects[0] if len(selects) == 1 else db.union_all(*selects)
+        filas += db.session.execute(consulta.order_by(db.desc('aviso_id')).limit(restantes)).all()
+        if len(filas) >= limite:
+            break
+    return filas
+
+def _nivel_completo(terminos, coincidencias, tipo, limite):
+    """
+    Un nivel con demasiadas combinaciones de pesos (muchos términos o pesos
+    distintos): se calcula el puntaje de todos sus avisos y se ordena. Cada
+    aviso sale de la rama de su primer término presente.
+    """
+    ramas = []
+    for i in range(len(terminos) - coincidencias + 1):
+        fila, otro = db.aliased(AvisoTermino), db.aliased(AvisoTermino)
+        anteriores, siguientes = terminos[:i], terminos[i + 1:]
+        de_siguientes = db.and_(otro.termino.in_(siguientes), otro.aviso_id == fila.aviso_id)
+        condiciones = [fila.termino == terminos[i]]
+        if anteriores:
+            condiciones.append(~db.exists().where(otro.termino.in_(anteriores), otro.aviso_id == fila.aviso_id))
+        puntaje = fila.peso
+        if coincidencias > 1:
+            condiciones.append(db.select(db.func.count()).where(de_siguientes).scalar_subquery() == coincidencias - 1)
+            puntaje = puntaje + db.select(db.func.sum(otro.peso)).where(de_siguientes).scalar_subquery()
+        elif siguientes:
+            condiciones.append(~db.exists().where(de_siguientes))
+        rama = db.select(fila.aviso_id.label('aviso_id'), puntaje.label('puntaje')).where(*condiciones)
+        ramas.append(_con_tipo(rama, fila.aviso_id, tipo))
+    consulta = ramas[0] if len(ramas) == 1 else db.union_all(*ramas)
+    return db.session.execute(
+        consulta.order_by(db.desc('puntaje'), db.desc('aviso_id')).limit(limite)
+    ).all()
+
+def _por_tipo(tipo, limite, offset):
+    """Consulta con solo tipos de animal: los avisos más recientes del tipo"""
+    consulta = db.select(AvisoAdopcion.id)
+    if tipo is not None:
+        consulta = consulta.where(AvisoAdopcion.tipo == tipo)
+    consulta = consulta.order_by(AvisoAdopcion.fecha_ingreso.desc(), AvisoAdopcion.id.desc())
+    return [(aviso_id, PESO_TIPO) for aviso_id in db.session.scalars(consulta.limit(limite).offset(offset))]
+
+def buscar_ids(consulta, limite=20, offset=0):
+    """
+    Ids de avisos que coinciden con la consulta, ordenados por relevancia:
+    primero los que contienen más términos distintos; entre ellos, los de
+    mayor puntaje (peso total de los términos coincidentes) y luego los más
+    recientes. 'gato' o 'perro' en la consulta filtran por tipo en vez de
+    buscarse como términos. Devuelve pares (aviso_id, puntaje).
+    """
+    terminos = set(normalizar(consulta))
+    tipos = terminos & TIPOS
+    tipo = next(iter(tipos)) if len(tipos) == 1 else None
+    if not terminos - TIPOS:
+        return _por_tipo(tipo, limite, offset) if tipos else []
+    pesos = {termino: _pesos(termino) for termino in sorted(terminos - TIPOS)}
+    pesos = {termino: lista for termino, lista in pesos.items() if lista}
+    extra = PESO_TIPO if tipos else 0
+    necesarios = offset + limite
+    filas = []
+    # Un nivel por cantidad de términos coincidentes; los siguientes solo si
+    # los anteriores no llenan la página
+    for coincidencias in range(len(pesos), 0, -1):
+        ramas = _ramas_nivel(pesos, coincidencias)
+        if ramas is None:
+            filas += _nivel_completo(list(pesos), coincidencias, tipo, necesarios - len(filas))
+        else:
+            filas += _nivel_por_puntaje(ramas, tipo, necesarios - len(filas))
+        if len(filas) >= necesarios:
+            break
+    return [(aviso_id, int(puntaje) + extra) for aviso_id, puntaje in filas[offset:]]
+
+class PaginaBusqueda:
+    """Página de resultados de búsqueda (navegación anterior/siguiente)"""
+
+    def __init__(self, items, page, has_next):
+        self.items = items
+        self.page = page
+        self.has_next = has_next
+
+    @property
+    def has_prev(self):
+        return self.page > 1
+
+    @property
+    def prev_num(self):
+        return self.page - 1
+
+    @property
+    def next_num(self):
+        return self.page + 1
+
+def buscar_avisos(consulta, query_base, page=1, per_page=5):
+    """Avisos de una página de resultados, en orden de relevancia"""
+    page = max(page, 1)
+    resultados = buscar_ids(consulta, per_page + 1, (page - 1) * per_page)
+    ids = [aviso_id for aviso_id, _ in resultados[:per_page]]
+    avisos = {aviso.id: aviso for aviso in query_base.filter(AvisoAdopcion.id.in_(ids))} if ids else {}
+    return PaginaBusqueda(
+        [avisos[aviso_id] for aviso_id in ids if aviso_id in avisos],
+        page,
+        has_next=len(resultados) > per_page
+    )
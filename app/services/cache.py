@@ -0,0 +1,48 @@
+import threading
+import time
+from collections import OrderedDict
+
+class CacheTTL:
+    """Cache en memoria del proceso con expiración por tiempo y tamaño acotado (LRU)"""
+
+    def __init__(self, max_items=256, ttl=60):
+        self.max_items = max_items
+        self.ttl = ttl
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, clave, default=None):
+        """Obtener un valor vigente o ``default`` si no existe o expiró"""
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                return default
+            expira, valor = entrada
+            if expira < time.monotonic():
+                del self._datos[clave]
+                return default
+            self._datos.move_to_end(clave)
+            return valor
+
+    def set(self, clave, valor, ttl=None):
+        """Guardar un valor, descartando el menos usado si se supera el tamaño"""
+        expira = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._datos[clave] = (expira, valor)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.max_items:
+                self._datos.popitem(last=False)
+
+    def obtener_o_calcular(self, clave, funcion, ttl=None):
+        """Devolver el valor cacheado o calcularlo con ``funcion`` y guardarlo"""
+        faltante = object()
+        valor = self.get(clave, faltante)
+        if valor is faltante:
+            valor = funcion()
+            self.set(clave, valor, ttl)
+        return valor
+
+    def clear(self):
+        """Vaciar el cache"""
+        with self._lock:
+            self._datos.clear()
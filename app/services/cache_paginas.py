@@ -0,0 +1,164 @@
+"""
+Cache de páginas renderizadas (portada y listado).
+
+Las páginas solo cambian cuando se insertan avisos, así que la clave incluye
+un contador de versión de datos que se incrementa tras cada inserción
+confirmada: las entradas anteriores quedan inalcanzables y expiran solas.
+
+Las páginas que se guardan se renderizan siempre desde el primario: con una
+réplica atrasada, una página recién invalidada se guardaría sin el aviso
+nuevo bajo la versión nueva durante todo el TTL.
+
+Backends:
+- ``memoria``: LRU con TTL en el proceso (el contador también es local, cada
+  worker ve sus propias inserciones y las ajenas al vencer el TTL). Solo
+  para desarrollo: con PAGINAS_CACHE_SOLO_COMPARTIDO (producción) no se admite.
+- ``redis``: servidor Redis o compatible, compartido entre workers (requiere
+  el paquete ``redis``).
+- ``ninguno``: sin cache.
+"""
+
+import threading
+from functools import wraps
+from flask import request, session
+from ..enrutamiento import usar_primario
+from .cache import CacheTTL
+
+class BackendMemoria:
+    """Páginas y contador de versión en memoria del proceso"""
+
+    def __init__(self, max_items, ttl):
+        self._paginas = CacheTTL(max_items=max_items, ttl=ttl)
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def get(self, clave):
+        return self._paginas.get(clave)
+
+    def set(self, clave, valor):
+        self._paginas.set(clave, valor)
+
+    def version(self):
+        return self._version
+
+    def incrementar_version(self):
+        with self._lock:
+            self._version += 1
+
+    def clear(self):
+        self._paginas.clear()
+
+class BackendRedis:
+    """Páginas y contador de versión en un servidor Redis compartido"""
+
+    CLAVE_VERSION = 'paginas:version'
+
+    def __init__(self, url, ttl):
+        import redis
+        self._cliente = redis.Redis.from_url(url)
+        self._ttl = ttl
+
+    def get(self, clave):
+        valor = self._cliente.get(f'paginas:{clave}')
+        return valor.decode('utf-8') if valor is not None else None
+
+    def set(self, clave, valor):
+        self._cliente.set(f'paginas:{clave}', valor.encode('utf-8'), ex=self._ttl)
+
+    def version(self):
+        return int(self._cliente.get(self.CLAVE_VERSION) or 0)
+
+    def incrementar_version(self):
+        self._cliente.incr(self.CLAVE_VERSION)
+
+    def clear(self):
+        for clave in self._cliente.scan_iter('paginas:*'):
+            if clave != self.CLAVE_VERSION.encode('utf-8'):
+                self._cliente.delete(clave)
+
+class CachePaginas:
+    """Cache de HTML por ruta y parámetros, invalidado por versión de datos"""
+
+    def __init__(self, app=None):
+        self.app = None
+        self.backend = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        tipo = app.config['PAGINAS_CACHE_BACKEND']
+        ttl = app.config['PAGINAS_CACHE_TTL']
+        solo_compartido = app.config['PAGINAS_CACHE_SOLO_COMPARTIDO']
+        self.backend = None
+        if tipo == 'redis':
+            try:
+                self.backend = BackendRedis(app.config['PAGINAS_CACHE_URL'], ttl)
+            except ImportError:
+                if solo_compartido:
+                    raise RuntimeError(
+                        'PAGINAS_CACHE_BACKEND=redis requiere el paquete redis '
+                        '(o PAGINAS_CACHE_BACKEND=ninguno)'
+                    )
+                app.logger.warning('El paquete redis no está instalado; se usa el cache en memoria')
+                tipo = 'memoria'
+        if tipo == 'memoria':
+            if solo_compartido:
+                # El contador por worker deja páginas viejas hasta el TTL en los demás workers
+                raise RuntimeError(
+                    'El cache de páginas en memoria no es compartido entre workers: '
+                    'use PAGINAS_CACHE_BACKEND=redis (o ninguno)'
+                )
+            self.backend = BackendMemoria(app.config['PAGINAS_CACHE_MAX'], ttl)
+
+    def incrementar_version(self):
+        """Invalidar todas las páginas cacheadas (llamar tras confirmar avisos nuevos)"""
+        if self.backend is None:
+            return
+        try:
+            self.backend.incrementar_version()
+        except Exception:
+            # Sin invalidación las páginas se corrigen al vencer el TTL
+            self.app.logger.exception('No se pudo incrementar la versión del cache de páginas')
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+    def _clave(self, version):
+        parametros = '&'.join(f'{k}={v}' for k, v in sorted(request.args.items(multi=True)))
+        return f'{version}:{request.path}?{parametros}'
+
+    def cachear(self, vista):
+        """
+        Decorador para vistas GET que devuelven HTML dependiente solo de los
+        avisos y de los parámetros de la URL. Si hay mensajes flash pendientes
+        la página se renderiza normalmente (y no se guarda).
+        """
+        @wraps(vista)
+        def envoltura(*args, **kwargs):
+            if self.backend is None or request.method != 'GET' or '_flashes' in session:
+                return vista(*args, **kwargs)
+            try:
+                clave = self._clave(self.backend.version())
+                html = self.backend.get(clave)
+            except Exception:
+                self.app.logger.exception('Cache de páginas no disponible')
+                return vista(*args, **kwargs)
+            if html is not None:
+                return self.app.response_class(html, mimetype='text/html', headers={'X-Cache': 'HIT'})
+
+            # Lo que se guarda bajo esta versión no puede venir de una réplica atrasada
+            usar_primario()
+            respuesta = self.app.make_response(vista(*args, **kwargs))
+            if respuesta.status_code == 200 and not respuesta.is_streamed:
+                try:
+                    self.backend.set(clave, respuesta.get_data(as_text=True))
+                except Exception:
+                    self.app.logger.exception('No se pudo guardar la página en cache')
+                respuesta.headers['X-Cache'] = 'MISS'
+            return respuesta
+        return envoltura
+
+# Instancia única, inicializada en create_app
+cache_paginas = CachePaginas()
@@ -0,0 +1,144 @@
+"""
+Compresión de respuestas y artefactos: gzip (biblioteca estándar) y brotli
+si el paquete ``brotli`` está instalado.
+
+``CompresorRespuestas`` negocia la codificación de las respuestas dinámicas
+(HTML, JSON, CSV...) en un ``after_request``: las respuestas en memoria se
+comprimen si superan un umbral y las respuestas en streaming se comprimen
+fragmento a fragmento, sin acumular el cuerpo.
+"""
+
+import gzip
+import zlib
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+def codificaciones_disponibles():
+    """Codificaciones soportadas, en orden de preferencia"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+def comprimir(cuerpo, codificacion, nivel=None):
+    """
+    Comprimir ``cuerpo`` (bytes). Sin ``nivel`` se usa el máximo, pensado
+    para artefactos que se comprimen una sola vez; la salida es determinista
+    (gzip sin fecha), así el mismo contenido produce los mismos bytes.
+    """
+    if codificacion == 'gzip':
+        return gzip.compress(cuerpo, compresslevel=9 if nivel is None else nivel, mtime=0)
+    if codificacion == 'br' and brotli is not None:
+        return brotli.compress(cuerpo, quality=11 if nivel is None else nivel)
+    raise ValueError(f'Codificación no soportada: {codificacion}')
+
+def variantes(cuerpo):
+    """Versiones precomprimidas de ``cuerpo`` por codificación"""
+    return {codificacion: comprimir(cuerpo, codificacion) for codificacion in codificaciones_disponibles()}
+
+def elegir_codificacion(accept_encoding, disponibles):
+    """
+    Codificación a usar según ``Accept-Encoding`` (``request.accept_encodings``),
+    en el orden de ``disponibles``; None si el cliente no acepta ninguna.
+    """
+    for codificacion in disponibles:
+        if accept_encoding[codificacion]:
+            return codificacion
+    return None
+
+class _CompresorGzip:
+    def __init__(self, nivel):
+        self._zlib = zlib.compressobj(nivel, zlib.DEFLATED, 31)  # wbits 31: formato gzip
+
+    def comprimir(self, datos):
+        return self._zlib.compress(datos)
+
+    def terminar(self):
+        return self._zlib.flush()
+
+class _CompresorBrotli:
+    def __init__(self, nivel):
+        self._brotli = brotli.Compressor(quality=nivel)
+
+    def comprimir(self, datos):
+        return self._brotli.process(datos)
+
+    def terminar(self):
+        return self._brotli.finish()
+
+def comprimir_flujo(fragmentos, codificacion, nivel):
+    """
+    Comprimir un iterable de fragmentos (bytes o str) a medida que se
+    consume; cierra el iterable original al terminar o si el cliente corta.
+    El compresor entrega bloques cuando llena su búfer interno (sin vaciarlo
+    en cada fragmento, que con una fila por fragmento cuesta tiempo y tasa).
+    """
+    compresor = _CompresorBrotli(nivel) if codificacion == 'br' else _CompresorGzip(nivel)
+    try:
+        for fragmento in fragmentos:
+            if isinstance(fragmento, str):
+                fragmento = fragmento.encode('utf-8')
+            if fragmento:
+                salida = compresor.comprimir(fragmento)
+                if salida:
+                    yield salida
+        yield compresor.terminar()
+    finally:
+        if hasattr(fragmentos, 'close'):
+            fragmentos.close()
+
+# Tipos que vale la pena comprimir (las imágenes ya vienen comprimidas)
+TIPOS_COMPRIMIBLES = frozenset({
+    'text/html', 'text/css', 'text/plain', 'text/csv', 'text/javascript', 'application/javascript',
+    'application/json', 'application/x-ndjson', 'application/xml', 'image/svg+xml',
+})
+
+class CompresorRespuestas:
+    """Compresión gzip/brotli negociada de las respuestas dinámicas"""
+
+    def __init__(self, app=None):
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config['COMPRESION']:
+            return
+        self.app = app
+        app.after_request(self._comprimir)
+
+    def _comprimir(self, respuesta):
+        # Archivos (send_file), respuestas ya codificadas y sin cuerpo quedan igual
+        if (respuesta.direct_passthrough or 'Content-Encoding' in respuesta.headers
+                or respuesta.status_code < 200 or respuesta.status_code in (204, 206, 304)
+                or respuesta.mimetype not in TIPOS_COMPRIMIBLES):
+            return respuesta
+        respuesta.vary.add('Accept-Encoding')
+        codificacion = elegir_codificacion(request.accept_encodings, codificaciones_disponibles())
+        if codificacion is None:
+            return respuesta
+        nivel = self.app.config['COMPRESION_NIVEL_BR' if codificacion == 'br' else 'COMPRESION_NIVEL_GZIP']
+        minimo = self.app.config['COMPRESION_MIN_BYTES']
+
+        # Un iterable con Content-Length conocido bajo el umbral no vale la pena
+        if respuesta.content_length is not None and respuesta.content_length < minimo:
+            return respuesta
+        if respuesta.is_streamed:
+            respuesta.response = comprimir_flujo(respuesta.response, codificacion, nivel)
+            respuesta.headers.pop('Content-Length', None)
+        else:
+            datos = respuesta.get_data()
+            if len(datos) < minimo:
+                return respuesta
+            respuesta.set_data(comprimir(datos, codificacion, nivel))
+        respuesta.content_encoding = codificacion
+
+        # El cuerpo ya no es idéntico byte a byte: el ETag pasa a ser débil
+        etag, debil = respuesta.get_etag()
+        if etag and not debil:
+            respuesta.set_etag(etag, weak=True)
+        return respuesta
+
+# Instancia única, inicializada en create_app
+compresor_respuestas = CompresorRespuestas()
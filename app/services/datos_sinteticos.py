@@ -0,0 +1,117 @@
+"""
+Generador de avisos sintéticos para pruebas de carga y benchmarks.
+
+Inserta avisos, fotos y contactos realistas con sentencias masivas por lote,
+de modo que escala a millones de filas tanto en SQLite como en MySQL. Con la
+misma semilla y la misma base inicial produce exactamente los mismos datos.
+"""
+
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from .. import db
+from ..models import AvisoAdopcion, Foto, ContactarPor, Comuna
+from .busqueda import indexar_avisos
+from .cache_paginas import cache_paginas
+from .estadisticas import registrar_avisos
+
+NOMBRES = ('Camila', 'Matías', 'Valentina', 'Benjamín', 'Isidora', 'Vicente', 'Florencia',
+           'Martín', 'Antonia', 'Joaquín', 'Sofía', 'Tomás', 'Catalina', 'Agustín', 'Josefa')
+APELLIDOS = ('González', 'Muñoz', 'Rojas', 'Díaz', 'Pérez', 'Soto', 'Contreras', 'Silva',
+             'Martínez', 'Sepúlveda', 'Morales', 'Rodríguez', 'López', 'Fuentes', 'Araya')
+SECTORES = ('Centro', 'Población Los Aromos', 'Villa Esperanza', 'Barrio Norte', 'Cerro Alegre',
+            'Parque Industrial', 'Villa Los Héroes', '', '')
+RAZAS = {
+    'perro': ('labrador', 'quiltro', 'pastor alemán', 'beagle', 'poodle', 'golden retriever'),
+    'gato': ('siamés', 'persa', 'atigrado', 'angora', 'naranjo', 'carey'),
+}
+RASGOS = ('juguetón', 'tranquilo', 'cariñoso', 'desparasitado', 'vacunado', 'esterilizado',
+          'sociable con niños', 'acostumbrado a departamento', 'muy activo', 'tímido al principio')
+REDES = ('whatsapp', 'telegram', 'X', 'instagram', 'tiktok')
+
+# Fecha fija para que dos corridas con la misma semilla sean idénticas
+FECHA_REFERENCIA = datetime(2025, 1, 1)
+
+def _descripcion(azar, tipo):
+    rasgos = ', '.join(azar.sample(RASGOS, 3))
+    return f'{azar.choice(RAZAS[tipo]).capitalize()} {rasgos}. Busca un hogar responsable.'
+
+def _aviso(azar, aviso_id, regiones_por_comuna, comunas, dias_historia):
+    nombre = f'{azar.choice(NOMBRES)} {azar.choice(APELLIDOS)}'
+    tipo = azar.choice(('gato', 'perro'))
+    unidad = azar.choice(('a', 'm'))
+    edad = azar.randint(1, 15) if unidad == 'a' else azar.randint(1, 11)
+    fecha_ingreso = FECHA_REFERENCIA - timedelta(seconds=azar.randint(0, dias_historia * 86400))
+    comuna_id = azar.choice(comunas)
+    return {
+        'id': aviso_id,
+        'fecha_ingreso': fecha_ingreso,
+        'comuna_id': comuna_id,
+        'region_id': regiones_por_comuna[comuna_id],
+        'sector': azar.choice(SECTORES),
+        'nombre': nombre,
+        'email': f'usuario{aviso_id}@ejemplo.cl',
+        'celular': f'+569.{azar.randint(10000000, 99999999)}' if azar.random() < 0.7 else None,
+        'tipo': tipo,
+        'cantidad': azar.choice((1, 1, 1, 2, 3, 4)),
+        'edad': edad,
+        'unidad_medida': unidad,
+        'edad_meses': edad * 12 if unidad == 'a' else edad,
+        'fecha_entrega': fecha_ingreso + timedelta(days=azar.randint(3, 60)),
+        'descripcion': _descripcion(azar, tipo),
+    }
+
+def generar_avisos(cantidad, semilla=0, tamano_lote=5000, fotos_max=5, contactos_max=5, dias_historia=365):
+    """
+    Insertar ``cantidad`` avisos sintéticos con sus fotos y contactos.
+
+    Los ids se asignan a partir del máximo actual, así los hijos se insertan
+    con executemany sin esperar ids de vuelta; no usar con escrituras
+    concurrentes. El resumen de estadísticas y el índice de búsqueda se
+    actualizan en la misma transacción de cada lote. Devuelve un dict con
+    las filas insertadas por tabla.
+    """
+    regiones_por_comuna = dict(db.session.execute(select(Comuna.id, Comuna.region_id).order_by(Comuna.id)).all())
+    comunas = list(regiones_por_comuna)
+    if not comunas:
+        raise ValueError('No hay comunas: cargue data/region-comuna.sql antes de generar datos')
+
+    azar = random.Random(semilla)
+    siguiente_id = (db.session.scalar(select(func.max(AvisoAdopcion.id))) or 0) + 1
+    totales = {'avisos': 0, 'fotos': 0, 'contactos': 0}
+
+    while totales['avisos'] < cantidad:
+        tamano = min(tamano_lote, cantidad - totales['avisos'])
+        avisos, fotos, contactos = [], [], []
+        for aviso_id in range(siguiente_id, siguiente_id + tamano):
+            aviso = _aviso(azar, aviso_id, regiones_por_comuna, comunas, dias_historia)
+            avisos.append(aviso)
+            cantidad_fotos = azar.randint(0, fotos_max)
+            aviso['tiene_fotos'] = cantidad_fotos > 0
+            for numero in range(cantidad_fotos):
+                nombre_archivo = f'aviso{aviso_id}_{numero}.jpg'
+                fotos.append({'actividad_id': aviso_id, 'nombre_archivo': nombre_archivo,
+                              'ruta_archivo': f'uploads/sinteticos/{nombre_archivo}'})
+            for red in azar.sample(REDES, azar.randint(0, min(contactos_max, len(REDES)))):
+                contactos.append({'actividad_id': aviso_id, 'nombre': red,
+                                  'identificador': f'@{red.lower()}_{aviso_id}'})
+
+        try:
+            db.session.execute(AvisoAdopcion.__table__.insert(), avisos)
+            if fotos:
+                db.session.execute(Foto.__table__.insert(), fotos)
+            if contactos:
+                db.session.execute(ContactarPor.__table__.insert(), contactos)
+            registrar_avisos((aviso['comuna_id'], aviso['tipo']) for aviso in avisos)
+            indexar_avisos((aviso['id'], aviso) for aviso in avisos)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        cache_paginas.incrementar_version()
+
+        siguiente_id += tamano
+        totales['avisos'] += tamano
+        totales['fotos'] += len(fotos)
+        totales['contactos'] += len(contactos)
+    return totales
@@ -0,0 +1,79 @@
+from datetime import datetime
+from itertools import combinations
+from .. import db
+from ..models import AvisoAdopcion
+from .avisos import filtrar_avisos
+from .referencia import referencia
+
+def _filtros_muestra():
+    """Un valor representativo para cada filtro soportado por ``leer_filtros``"""
+    region = next((r for r in referencia.regiones() if referencia.comunas_de_region(r['id'])), None)
+    comuna = referencia.comunas_de_region(region['id'])[0] if region else None
+    muestra = {
+        'tipo': 'gato',
+        'fecha_entrega_desde': datetime(2025, 1, 1),
+        'fecha_entrega_hasta': datetime(2025, 2, 1),
+        'fecha_ingreso_desde': datetime(2025, 1, 1),
+        'fecha_ingreso_hasta': datetime(2025, 2, 1),
+        'edad_min_meses': 3,
+        'edad_max_meses': 24,
+        'cantidad_min': 2,
+        'cantidad_max': 5,
+        'con_fotos': True
+    }
+    if region:
+        muestra['region_id'] = region['id']
+        muestra['comuna_id'] = comuna['id']
+    return muestra
+
+def plan_consulta(query):
+    """Filas del plan de ejecución (EXPLAIN) de una consulta, según el motor"""
+    conexion = db.session.connection()
+    dialecto = conexion.dialect
+    sql = str(query.statement.compile(dialect=dialecto, compile_kwargs={'literal_binds': True}))
+    if dialecto.name == 'sqlite':
+        return [fila[-1] for fila in conexion.exec_driver_sql(f'EXPLAIN QUERY PLAN {sql}')]
+    resultado = conexion.exec_driver_sql(f'EXPLAIN {sql}')
+    columnas = list(resultado.keys())
+    return [dict(zip(columnas, fila)) for fila in resultado]
+
+def es_escaneo_completo(fila, con_filtros=True):
+    """
+    Detecta un recorrido de aviso_adopcion en una fila del plan. Sin filtros
+    el listado recorre el índice de fechas (se corta en el LIMIT) y solo un
+    recorrido de la tabla sin índice es un problema; con filtros también lo
+    es recorrer un índice completo en vez de buscar (SEARCH) por el filtro.
+    """
+    if isinstance(fila, str):
+        # SQLite: 'SCAN aviso_adopcion' o 'SCAN aviso_adopcion USING [COVERING] INDEX ...'
+        fila = fila.strip()
+        if con_filtros:
+            return fila.startswith('SCAN aviso_adopcion')
+        return fila == 'SCAN aviso_adopcion'
+    # MySQL/MariaDB: type = ALL (tabla completa) o index (índice completo) sobre los avisos
+    if fila.get('table') != 'aviso_adopcion':
+        return False
+    return fila.get('type') == 'ALL' or (con_filtros and fila.get('type') == 'index')
+
+def explicar_filtros(tamano_combinacion=2, per_page=10):
+    """
+    Ejecutar EXPLAIN sobre la consulta de /api/avisos para cada filtro y cada
+    combinación de hasta ``tamano_combinacion`` filtros. Devuelve una lista de
+    dicts con los filtros, el plan y si hubo un escaneo de la tabla o de un
+    índice completo (ver ``es_escaneo_completo``).
+    """
+    muestra = _filtros_muestra()
+    resultados = []
+    for tamano in range(0, tamano_combinacion + 1):
+        for nombres in combinations(sorted(muestra), tamano):
+            filtros = {nombre: muestra[nombre] for nombre in nombres}
+            query = filtrar_avisos(AvisoAdopcion.query, filtros).order_by(
+                AvisoAdopcion.fecha_ingreso.desc(), AvisoAdopcion.id.desc()
+            ).limit(per_page)
+            plan = plan_consulta(query)
+            resultados.append({
+                'filtros': list(nombres),
+                'plan': plan,
+                'escaneo_completo': any(es_escaneo_completo(fila, bool(filtros)) for fila in plan)
+            })
+    return resultados
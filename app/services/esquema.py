@@ -0,0 +1,210 @@
+"""
+Creación del esquema y carga de los datos iniciales (``flask db init/seed``).
+
+El esquema se crea desde los modelos (incluye tablas e índices agregados por
+las migraciones) en una sola transacción; en MySQL cada CREATE TABLE confirma
+por sí mismo, pero ``CREATE TABLE IF NOT EXISTS`` hace que repetir el comando
+sea seguro. ``create_all`` no altera tablas existentes: las columnas e índices
+de ``data/migraciones`` que le falten a una base anterior se agregan con
+``migrar_esquema`` (con el relleno de cada migración), y cualquier otra
+diferencia con los modelos detiene el comando con la lista. Las regiones y
+comunas se leen de ``data/region-comuna.sql`` como parámetros y se insertan
+con executemany; la huella del archivo queda en ``carga_datos`` y una segunda
+carga sin cambios no toca las tablas.
+"""
+
+import ast
+import hashlib
+import os
+import re
+from datetime import datetime
+from sqlalchemy import bindparam, case, exists, inspect, select
+from sqlalchemy.schema import CreateColumn
+from .. import db
+from ..models import Region, Comuna, CargaDatos, AvisoAdopcion, Foto, AvisoTermino
+from .cache_paginas import cache_paginas
+from .referencia import referencia
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ARCHIVO_REGION_COMUNA = os.path.join(RAIZ, 'data', 'region-comuna.sql')
+
+_INSERT_RE = re.compile(r'INSERT INTO (region|comuna) \(([^)]*)\) VALUES (\(.*\));')
+
+def leer_region_comuna(ruta=ARCHIVO_REGION_COMUNA):
+    """
+    Interpretar los INSERT del archivo como parámetros por tabla:
+    ``{'region': [{'id': ..., 'nombre': ...}], 'comuna': [...]}``.
+    Admite las comillas dobles del archivo original.
+    """
+    filas = {'region': [], 'comuna': []}
+    with open(ruta, encoding='utf-8') as archivo:
+        for linea in archivo:
+            coincidencia = _INSERT_RE.match(linea.strip())
+            if coincidencia:
+                tabla, columnas, valores = coincidencia.groups()
+                columnas = [columna.strip() for columna in columnas.split(',')]
+                filas[tabla].append(dict(zip(columnas, ast.literal_eval(valores))))
+    return filas
+
+def _checksum(ruta):
+    with open(ruta, 'rb') as archivo:
+        return hashlib.sha256(archivo.read()).hexdigest()
+
+def crear_esquema():
+    """Crear las tablas que falten en una transacción; devuelve sus nombres"""
+    with db.engine.begin() as conexion:
+        existentes = set(inspect(conexion).get_table_names())
+        db.metadata.create_all(conexion)
+    return [tabla for tabla in db.metadata.tables if tabla not in existentes]
+
+def _rellenar_edad_meses(conexion):
+    conexion.execute(db.update(AvisoAdopcion).where(AvisoAdopcion.edad_meses.is_(None)).values(
+        edad_meses=case((AvisoAdopcion.unidad_medida == 'a', AvisoAdopcion.edad * 12), else_=AvisoAdopcion.edad)
+    ))
+
+def _rellenar_region_y_fotos(conexion):
+    conexion.execute(db.update(AvisoAdopcion).where(AvisoAdopcion.region_id.is_(None)).values(
+        region_id=select(Comuna.region_id).where(Comuna.id == AvisoAdopcion.comuna_id).scalar_subquery()
+    ))
+    conexion.execute(db.update(AvisoAdopcion).where(
+        exists().where(Foto.actividad_id == AvisoAdopcion.id)
+    ).values(tiene_fotos=True))
+
+def _terminos_de_tipo(conexion, tablas):
+    if 'aviso_termino' not in tablas:
+        return False
+    return conexion.scalar(select(exists().where(AvisoTermino.termino.in_(('gato', 'perro')))))
+
+def _quitar_terminos_de_tipo(conexion):
+    conexion.execute(db.delete(AvisoTermino).where(AvisoTermino.termino.in_(('gato', 'perro'))))
+
+# Migraciones de data/migraciones sobre tablas que ya existían: columnas e
+# índices que agregan (``tabla.nombre``), relleno de datos y, si solo cambian
+# datos, la condición que las deja pendientes. Las que solo crean tablas
+# (002, 004, 006) las cubre crear_esquema.
+MIGRACIONES = (
+    ('001_aviso_fecha_ingreso_id_idx.sql', (), ('aviso_adopcion.aviso_fecha_ingreso_id_idx',), None, None),
+    ('003_foto_variantes.sql', ('foto.ruta_miniatura', 'foto.ruta_webp'), (), None, None),
+    ('005_filtros_avisos.sql', ('aviso_adopcion.edad_meses',), (
+        'aviso_adopcion.aviso_tipo_fecha_ingreso_idx', 'aviso_adopcion.aviso_comuna_fecha_ingreso_idx',
+        'aviso_adopcion.aviso_fecha_entrega_idx', 'aviso_adopcion.aviso_edad_meses_idx',
+        'aviso_adopcion.aviso_cantidad_idx',
+    ), _rellenar_edad_meses, None),
+    ('007_region_fotos_avisos.sql', ('aviso_adopcion.region_id', 'aviso_adopcion.tiene_fotos'), (
+        'aviso_adopcion.aviso_region_fecha_ingreso_idx', 'aviso_adopcion.aviso_tiene_fotos_fecha_ingreso_idx',
+    ), _rellenar_region_y_fotos, None),
+    ('008_busqueda_sin_tipo.sql', (), (), _quitar_terminos_de_tipo, _terminos_de_tipo),
+    ('009_aviso_termino_peso_idx.sql', (), ('aviso_termino.aviso_termino_peso_idx',), None, None),
+)
+
+def _faltantes(inspector, tablas):
+    """Columnas e índices de los modelos (``tabla.nombre``) ausentes en las tablas dadas"""
+    columnas, indices = set(), set()
+    for nombre in tablas:
+        tabla = db.metadata.tables[nombre]
+        existentes = {columna['name'] for columna in inspector.get_columns(nombre)}
+        columnas.update(f'{nombre}.{c.name}' for c in tabla.columns if c.name not in existentes)
+        existentes = {indice['name'] for indice in inspector.get_indexes(nombre)}
+        indices.update(f'{nombre}.{i.name}' for i in tabla.indexes if i.name not in existentes)
+    return columnas, indices
+
+def _agregar_columna(conexion, nombre):
+    tabla, columna = nombre.split('.')
+    preparador = conexion.dialect.identifier_preparer
+    definicion = CreateColumn(db.metadata.tables[tabla].c[columna]).compile(dialect=conexion.dialect)
+    conexion.exec_driver_sql(f'ALTER TABLE {preparador.quote(tabla)} ADD COLUMN {definicion}')
+
+def _crear_indice(conexion, nombre):
+    tabla, indice = nombre.split('.')
+    next(i for i in db.metadata.tables[tabla].indexes if i.name == indice).create(conexion)
+
+def migrar_esquema():
+    """
+    Aplicar en una transacción las migraciones pendientes sobre las tablas
+    existentes; devuelve sus archivos. Si a una tabla le falta una columna o
+    índice que ninguna migración conocida agrega, no toca nada y lanza
+    RuntimeError con la lista. En MySQL cada ALTER TABLE confirma por sí
+    mismo: si el relleno falla, completarlo con el archivo de la migración.
+    """
+    with db.engine.begin() as conexion:
+        inspector = inspect(conexion)
+        tablas = [tabla for tabla in db.metadata.tables if inspector.has_table(tabla)]
+        columnas, indices = _faltantes(inspector, tablas)
+        conocidos = {nombre for migracion in MIGRACIONES for nombre in migracion[1] + migracion[2]}
+        desconocidos = sorted((columnas | indices) - conocidos)
+        if desconocidos:
+            raise RuntimeError(
+                'El esquema de la base difiere de los modelos y ninguna migración de '
+                f"data/migraciones lo cubre: {', '.join(desconocidos)}"
+            )
+        aplicadas = []
+        for archivo, nuevas_columnas, nuevos_indices, rellenar, pendiente in MIGRACIONES:
+            faltan_columnas = [c for c in nuevas_columnas if c in columnas]
+            faltan_indices = [i for i in nuevos_indices if i in indices]
+            if pendiente is not None:
+                if not pendiente(conexion, tablas):
+                    continue
+            elif not faltan_columnas and not faltan_indices:
+                continue
+            for columna in faltan_columnas:
+                _agregar_columna(conexion, columna)
+            if rellenar is not None and (faltan_columnas or pendiente is not None):
+                rellenar(conexion)
+            for indice in faltan_indices:
+                _crear_indice(conexion, indice)
+            aplicadas.append(archivo)
+    return aplicadas
+
+def _sincronizar(modelo, filas):
+    """Insertar las filas nuevas y actualizar las que cambiaron (por id)"""
+    columnas = [columna for columna in filas[0] if columna != 'id'] if filas else []
+    actuales = {
+        fila.id: tuple(fila[1:])
+        for fila in db.session.execute(select(modelo.id, *[getattr(modelo, c) for c in columnas]))
+    }
+    nuevas = [fila for fila in filas if fila['id'] not in actuales]
+    cambiadas = [
+        fila for fila in filas
+        if fila['id'] in actuales and actuales[fila['id']] != tuple(fila[c] for c in columnas)
+    ]
+    tabla = modelo.__table__
+    if nuevas:
+        db.session.execute(tabla.insert(), nuevas)
+    if cambiadas:
+        db.session.execute(
+            tabla.update().where(tabla.c.id == bindparam('_id')).values(
+                {columna: bindparam(columna) for columna in columnas}
+            ),
+            [{**fila, '_id': fila['id']} for fila in cambiadas]
+        )
+    return len(nuevas), len(cambiadas)
+
+def sembrar_region_comuna(ruta=ARCHIVO_REGION_COMUNA, forzar=False):
+    """
+    Cargar regiones y comunas en una transacción, omitiendo la carga si la
+    huella del archivo coincide con la guardada (salvo ``forzar``). Las filas
+    existentes se actualizan por id, nunca se borran (las comunas tienen avisos).
+    Devuelve un resumen con las filas insertadas y actualizadas por tabla.
+    """
+    nombre = os.path.basename(ruta)
+    checksum = _checksum(ruta)
+    guardado = db.session.get(CargaDatos, nombre)
+    if guardado is not None and guardado.checksum == checksum and not forzar:
+        return {'omitido': True, 'checksum': checksum}
+
+    filas = leer_region_comuna(ruta)
+    try:
+        resumen = {
+            'omitido': False,
+            'checksum': checksum,
+            'region': _sincronizar(Region, filas['region']),
+            'comuna': _sincronizar(Comuna, filas['comuna']),
+        }
+        db.session.merge(CargaDatos(archivo=nombre, checksum=checksum, cargado_en=datetime.now()))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    referencia.invalidar()
+    cache_paginas.incrementar_version()
+    return resumen
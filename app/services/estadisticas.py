@@ -0,0 +1,188 @@
+from collections import Counter
+from flask import current_app
+from .. import db
+from ..models import AvisoAdopcion, EstadisticaComuna
+from .cache import CacheTTL
+from .referencia import referencia
+
+# Columnas e intervalos admitidos por las series temporales
+CAMPOS_SERIE = ('fecha_ingreso', 'fecha_entrega')
+INTERVALOS_SERIE = ('dia', 'semana', 'mes')
+
+# Formato de agrupación por motor: día 'AAAA-MM-DD', semana ISO 8601 'AAAA-Www'
+# (de lunes a domingo; el año es el de su jueves) y mes 'AAAA-MM'. SQLite no
+# tiene semana ISO en strftime (%V desde 3.46): se calcula en _expresion_periodo
+_FORMATOS_PERIODO = {
+    'mysql': {'dia': '%Y-%m-%d', 'semana': '%x-W%v', 'mes': '%Y-%m'},
+    'sqlite': {'dia': '%Y-%m-%d', 'mes': '%Y-%m'},
+    'postgresql': {'dia': 'YYYY-MM-DD', 'semana': 'IYYY-"W"IW', 'mes': 'YYYY-MM'}
+}
+
+# Resultados agregados compartidos por ráfagas de peticiones del mismo worker
+_cache_estadisticas = CacheTTL(max_items=64)
+
+def _sentencia_upsert(dialecto):
+    """INSERT que suma al total existente, según el motor de base de datos"""
+    tabla = EstadisticaComuna.__table__
+    if dialecto == 'mysql':
+        from sqlalchemy.dialects.mysql import insert
+        sentencia = insert(tabla)
+        return sentencia.on_duplicate_key_update(total=tabla.c.total + sentencia.inserted.total)
+    if dialecto == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+        sentencia = insert(tabla)
+        return sentencia.on_conflict_do_update(
+            index_elements=[tabla.c.comuna_id, tabla.c.tipo],
+            set_={'total': tabla.c.total + sentencia.excluded.total}
+        )
+    return None
+
+def registrar_avisos(pares):
+    """
+    Sumar avisos nuevos al resumen dentro de la transacción en curso.
+    ``pares`` es un iterable de (comuna_id, tipo); no hace commit, de modo que
+    el resumen queda consistente con los avisos insertados o se revierte con ellos.
+    """
+    conteos = Counter((int(comuna_id), tipo) for comuna_id, tipo in pares)
+    if not conteos:
+        return
+    
+    filas = [
+        {'comuna_id': comuna_id, 'tipo': tipo, 'total': total}
+        for (comuna_id, tipo), total in conteos.items()
+    ]
+    sentencia = _sentencia_upsert(db.session.get_bind().dialect.name)
+    if sentencia is not None:
+        db.session.execute(sentencia, filas)
+        return
+    
+    # Motores sin upsert nativo: actualizar y, si no existía la fila, insertarla
+    tabla = EstadisticaComuna.__table__
+    for fila in filas:
+        resultado = db.session.execute(
+            tabla.update().where(
+                tabla.c.comuna_id == fila['comuna_id'],
+                tabla.c.tipo == fila['tipo']
+            ).values(total=tabla.c.total + fila['total'])
+        )
+        if resultado.rowcount == 0:
+            db.session.execute(tabla.insert().values(**fila))
+
+def reconstruir_estadisticas():
+    """Recalcular el resumen completo desde aviso_adopcion en una sola transacción"""
+    tabla = EstadisticaComuna.__table__
+    try:
+        db.session.execute(tabla.delete())
+        db.session.execute(
+            tabla.insert().from_select(
+                ['comuna_id', 'tipo', 'total'],
+                db.select(
+                    AvisoAdopcion.comuna_id,
+                    AvisoAdopcion.tipo,
+                    db.func.count(AvisoAdopcion.id)
+                ).group_by(AvisoAdopcion.comuna_id, AvisoAdopcion.tipo)
+            )
+        )
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return db.session.query(db.func.count()).select_from(tabla).scalar()
+
+def resumen_estadisticas(top_comunas=10):
+    """
+    Totales por tipo, por región y top de comunas a partir del resumen.
+    El costo es O(regiones + comunas), independiente del número de avisos;
+    los nombres se resuelven con el cache de referencia.
+    """
+    por_tipo = Counter()
+    por_region = Counter()
+    por_comuna = Counter()
+    
+    for comuna_id, tipo, total in db.session.query(
+        EstadisticaComuna.comuna_id, EstadisticaComuna.tipo, EstadisticaComuna.total
+    ).filter(EstadisticaComuna.total > 0):
+        por_tipo[tipo] += total
+        por_comuna[comuna_id] += total
+        region = referencia.region_de_comuna(comuna_id)
+        if region:
+            por_region[region['id']] += total
+    
+    stats_tipo = sorted(por_tipo.items())
+    stats_region = [
+        (referencia.region(region_id)['nombre'], total)
+        for region_id, total in sorted(por_region.items())
+    ]
+    stats_comuna = [
+        (referencia.nombre_comuna(comuna_id), total)
+        for comuna_id, total in por_comuna.most_common(top_comunas)
+    ]
+    return stats_tipo, stats_region, stats_comuna
+
+def _semana_iso_sqlite(columna):
+    """'AAAA-Www' ISO en SQLite: año y número de semana del jueves de la semana"""
+    jueves = db.func.date(columna, '-3 days', 'weekday 4')
+    dia_del_anio = db.cast(db.func.strftime('%j', jueves), db.Integer)
+    return db.func.printf('%s-W%02d', db.func.strftime('%Y', jueves), (dia_del_anio + 6) // 7)
+
+def _expresion_periodo(columna, intervalo, dialecto):
+    """Expresión SQL que agrupa una fecha en el periodo solicitado"""
+    if dialecto not in ('mysql', 'postgresql') and intervalo == 'semana':
+        return _semana_iso_sqlite(columna)
+    formato = _FORMATOS_PERIODO.get(dialecto, _FORMATOS_PERIODO['sqlite'])[intervalo]
+    if dialecto == 'mysql':
+        return db.func.date_format(columna, formato)
+    if dialecto == 'postgresql':
+        return db.func.to_char(columna, formato)
+    return db.func.strftime(formato, columna)
+
+def serie_temporal(campo, intervalo, desde=None, hasta=None, version=None):
+    """
+    Cantidad de avisos por periodo y tipo, agrupada en SQL sobre ``campo``.
+    ``desde`` es inclusivo y ``hasta`` exclusivo (límites como los de
+    ``leer_filtros``, que pasa un ``hasta`` de solo día al día siguiente).
+    Devuelve filas ``[periodo, gatos, perros, total]`` ordenadas por periodo.
+    El resultado se reutiliza durante ESTADISTICAS_CACHE_TTL segundos para la
+    misma ``version`` de los datos (la del validador HTTP).
+    """
+    if campo not in CAMPOS_SERIE:
+        raise ValueError(f'Campo no soportado: {campo}')
+    if intervalo not in INTERVALOS_SERIE:
+        raise ValueError(f'Intervalo no soportado: {intervalo}')
+    
+    def calcular():
+        columna = getattr(AvisoAdopcion, campo)
+        periodo = _expresion_periodo(
+            columna, intervalo, db.session.get_bind().dialect.name
+        ).label('periodo')
+        
+        consulta = db.session.query(
+            periodo, AvisoAdopcion.tipo, db.func.count(AvisoAdopcion.id)
+        )
+        if desde is not None:
+            consulta = consulta.filter(columna >= desde)
+        if hasta is not None:
+            consulta = consulta.filter(columna < hasta)
+        
+        filas = {}
+        for etiqueta, tipo, total in consulta.group_by(periodo, AvisoAdopcion.tipo):
+            fila = filas.setdefault(etiqueta, {'gato': 0, 'perro': 0})
+            fila[tipo] = total
+        return [
+            [etiqueta, fila['gato'], fila['perro'], fila['gato'] + fila['perro']]
+            for etiqueta, fila in sorted(filas.items())
+        ]
+    
+    clave = ('serie', version, campo, intervalo, desde, hasta)
+    return _cache_estadisticas.obtener_o_calcular(
+        clave, calcular, ttl=current_app.config['ESTADISTICAS_CACHE_TTL']
+    )
+
+def resumen_estadisticas_cacheado(version=None):
+    """
+    ``resumen_estadisticas`` reutilizado durante ESTADISTICAS_CACHE_TTL
+    segundos para la misma ``version`` de los datos (la del validador HTTP)
+    """
+    return _cache_estadisticas.obtener_o_calcular(
+        ('resumen', version), resumen_estadisticas, ttl=current_app.config['ESTADISTICAS_CACHE_TTL']
+    )
@@ -0,0 +1,101 @@
+"""
+Assets estáticos compilados: copias con hash en el nombre y variantes
+precomprimidas.
+
+``flask estaticos compilar`` copia ``static/css`` y ``static/js`` a
+``static/dist`` como ``<nombre>.<hash>.<ext>`` junto a sus hermanos ``.gz`` y
+``.br`` (brotli si está instalado) y escribe ``dist/manifest.json`` con la
+ruta original → ruta compilada. Los templates usan ``url_estatico``: sin
+manifiesto (desarrollo) se sirve el archivo original.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from .compresion import variantes
+
+CARPETA_DIST = 'dist'
+MANIFIESTO = 'manifest.json'
+CARPETAS_ASSETS = ('css', 'js')
+EXTENSIONES_ASSETS = ('.css', '.js')
+
+# Sufijo de cada variante precomprimida, en orden de preferencia
+SUFIJOS_CODIFICACION = (('br', '.br'), ('gzip', '.gz'))
+
+def _escribir(ruta, contenido):
+    """Escritura atómica: un worker nunca ve un archivo a medio escribir"""
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    temporal = f'{ruta}.tmp'
+    with open(temporal, 'wb') as archivo:
+        archivo.write(contenido)
+    os.replace(temporal, ruta)
+
+def compilar_estaticos(carpeta_static, carpetas=CARPETAS_ASSETS):
+    """
+    Generar los assets con hash y sus variantes comprimidas; devuelve el
+    manifiesto. El manifiesto se escribe al final, así nunca apunta a
+    archivos que aún no existen.
+    """
+    manifiesto = {}
+    for carpeta in carpetas:
+        for raiz, _, archivos in os.walk(os.path.join(carpeta_static, carpeta)):
+            for nombre in sorted(archivos):
+                if not nombre.endswith(EXTENSIONES_ASSETS):
+                    continue
+                ruta = os.path.join(raiz, nombre)
+                relativa = os.path.relpath(ruta, carpeta_static).replace(os.sep, '/')
+                with open(ruta, 'rb') as archivo:
+                    contenido = archivo.read()
+                base, extension = os.path.splitext(relativa)
+                compilada = f'{CARPETA_DIST}/{base}.{hashlib.sha256(contenido).hexdigest()[:12]}{extension}'
+                destino = os.path.join(carpeta_static, compilada)
+                _escribir(destino, contenido)
+                sufijos = dict(SUFIJOS_CODIFICACION)
+                for codificacion, comprimido in variantes(contenido).items():
+                    _escribir(destino + sufijos[codificacion], comprimido)
+                manifiesto[relativa] = compilada
+    _escribir(
+        os.path.join(carpeta_static, CARPETA_DIST, MANIFIESTO),
+        json.dumps(manifiesto, indent=2, sort_keys=True).encode('utf-8')
+    )
+    return manifiesto
+
+def variante_precomprimida(carpeta, ruta, accept_encoding):
+    """
+    ``(archivo, codificacion)`` a enviar para ``ruta`` dentro de ``carpeta``:
+    el hermano ``.br``/``.gz`` que acepte el cliente, o el original con None.
+    """
+    for codificacion, sufijo in SUFIJOS_CODIFICACION:
+        if accept_encoding[codificacion] and os.path.isfile(os.path.join(carpeta, ruta + sufijo)):
+            return ruta + sufijo, codificacion
+    return ruta, None
+
+class ManifiestoEstaticos:
+    """Manifiesto de assets compilados, releído solo cuando cambia el archivo"""
+
+    def __init__(self):
+        self._clave = None
+        self._rutas = {}
+        self._lock = threading.Lock()
+
+    def _cargar(self, carpeta_static):
+        ruta = os.path.join(carpeta_static, CARPETA_DIST, MANIFIESTO)
+        try:
+            clave = (ruta, os.stat(ruta).st_mtime_ns)
+        except FileNotFoundError:
+            return {}
+        if clave != self._clave:
+            with self._lock:
+                if clave != self._clave:
+                    with open(ruta, encoding='utf-8') as archivo:
+                        self._rutas = json.load(archivo)
+                    self._clave = clave
+        return self._rutas
+
+    def resolver(self, carpeta_static, ruta):
+        """Ruta compilada de ``ruta`` (relativa a static), o la misma si no se compiló"""
+        return self._cargar(carpeta_static).get(ruta, ruta)
+
+# Instancia única por worker
+manifiesto_estaticos = ManifiestoEstaticos()
@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from .. import db
+from ..models import AvisoAdopcion, Foto, ContactarPor
+
+FORMATOS_EXPORTACION = ('ndjson', 'csv')
+RELACIONES_EXPORTACION = ('fotos', 'contactos')
+
+# Columnas internas (derivadas para filtrar) que no forman parte del aviso exportado
+_COLUMNAS_INTERNAS = ('edad_meses', 'region_id', 'tiene_fotos')
+_COLUMNAS_AVISO = [
+    columna.name for columna in AvisoAdopcion.__table__.columns if columna.name not in _COLUMNAS_INTERNAS
+]
+_COLUMNAS_FOTO = ('id', 'ruta_archivo', 'nombre_archivo')
+_COLUMNAS_CONTACTO = ('id', 'nombre', 'identificador')
+
+def _valor_json(valor):
+    """Convertir fechas a ISO 8601 para poder serializarlas"""
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    return valor
+
+def _hijos_por_aviso(modelo, columnas, ids):
+    """Filas hijas (fotos o contactos) de un lote de avisos en una sola consulta"""
+    tabla = modelo.__table__
+    resultado = {aviso_id: [] for aviso_id in ids}
+    consulta = db.select(tabla.c.actividad_id, *(tabla.c[c] for c in columnas)).where(
+        tabla.c.actividad_id.in_(ids)
+    ).order_by(tabla.c.actividad_id, tabla.c.id)
+    for fila in db.session.execute(consulta):
+        resultado[fila[0]].append(dict(zip(columnas, fila[1:])))
+    return resultado
+
+def iterar_avisos(tamano_lote=1000, incluir=()):
+    """
+    Recorrer todos los avisos por lotes de ``tamano_lote`` filas.
+    Pagina por keyset sobre la clave primaria y lee columnas sin construir
+    objetos ORM, así la memoria usada depende del lote y no del total.
+    ``incluir`` admite 'fotos' y/o 'contactos', cargados con una consulta por lote.
+    """
+    tabla = AvisoAdopcion.__table__
+    ultimo_id = 0
+    while True:
+        filas = db.session.execute(
+            db.select(*(tabla.c[c] for c in _COLUMNAS_AVISO)).where(tabla.c.id > ultimo_id).order_by(tabla.c.id).limit(tamano_lote)
+        ).mappings().all()
+        if not filas:
+            break
+        
+        ids = [fila['id'] for fila in filas]
+        fotos = _hijos_por_aviso(Foto, _COLUMNAS_FOTO, ids) if 'fotos' in incluir else None
+        contactos = _hijos_por_aviso(ContactarPor, _COLUMNAS_CONTACTO, ids) if 'contactos' in incluir else None
+        
+        for fila in filas:
+            aviso = {columna: _valor_json(fila[columna]) for columna in _COLUMNAS_AVISO}
+            if fotos is not None:
+                aviso['fotos'] = fotos[aviso['id']]
+            if contactos is not None:
+                aviso['contactos'] = contactos[aviso['id']]
+            yield aviso
+        
+        ultimo_id = ids[-1]
+
+def exportar_ndjson(avisos):
+    """Serializar avisos como JSON delimitado por líneas, uno por línea"""
+    for aviso in avisos:
+        yield json.dumps(aviso, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+def exportar_csv(avisos, incluir=()):
+    """Serializar avisos como CSV; las relaciones incluidas van como JSON en su columna"""
+    columnas = _COLUMNAS_AVISO + [r for r in RELACIONES_EXPORTACION if r in incluir]
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    
+    def volcar():
+        texto = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return texto
+    
+    escritor.writerow(columnas)
+    yield volcar()
+    for aviso in avisos:
+        escritor.writerow([
+            json.dumps(aviso[c], ensure_ascii=False, separators=(',', ':'))
+            if c in RELACIONES_EXPORTACION else aviso[c]
+            for c in columnas
+        ])
+        yield volcar()
+
+def exportar_avisos(formato, incluir=(), tamano_lote=1000):
+    """Generador de texto con todos los avisos en el formato pedido"""
+    if formato not in FORMATOS_EXPORTACION:
+        raise ValueError(f'Formato no soportado: {formato}')
+    incluir = tuple(r for r in incluir if r in RELACIONES_EXPORTACION)
+    avisos = iterar_avisos(tamano_lote, incluir)
+    if formato == 'csv':
+        return exportar_csv(avisos, incluir)
+    return exportar_ndjson(avisos)
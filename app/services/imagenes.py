@@ -0,0 +1,133 @@
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .. import db
+from ..models import Foto
+from .almacenamiento import es_ruta_inmutable
+from .cache_paginas import cache_paginas
+from .validacion import ruta_foto_segura
+
+def _ruta_variante(ruta_archivo, sufijo):
+    """
+    'uploads/perro.jpg' -> 'uploads/perro.jpg<sufijo>'. Se conserva la
+    extensión de origen: perro.jpg y perro.png no comparten variantes.
+    """
+    return f'{ruta_archivo}{sufijo}'
+
+def _guardar_webp(imagen, destino, lado_maximo, calidad):
+    """
+    Redimensionar (sin ampliar) y guardar en WebP de forma atómica. El
+    temporal es único: dos fotos idénticas procesadas a la vez no se pisan.
+    """
+    copia = imagen.copy()
+    copia.thumbnail((lado_maximo, lado_maximo))
+    descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(destino), suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as archivo:
+            copia.save(archivo, 'WEBP', quality=calidad)
+        os.replace(temporal, destino)
+    except Exception:
+        os.remove(temporal)
+        raise
+
+def generar_variantes(foto, carpeta_static, config):
+    """
+    Generar la miniatura y la variante WebP de una foto y registrarlas en la fila.
+    No hace commit. Devuelve False si Pillow no está disponible.
+    """
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return False
+    
+    if ruta_foto_segura(foto.ruta_archivo) != foto.ruta_archivo:
+        raise ValueError(f'Ruta de foto fuera de uploads/: {foto.ruta_archivo}')
+    origen = os.path.join(carpeta_static, foto.ruta_archivo)
+    ruta_miniatura = _ruta_variante(foto.ruta_archivo, '.thumb.webp')
+    ruta_webp = _ruta_variante(foto.ruta_archivo, '.webp')
+    
+    # Un archivo direccionado por contenido ya procesado (foto duplicada) no se recodifica
+    ya_generadas = es_ruta_inmutable(foto.ruta_archivo) and all(
+        os.path.exists(os.path.join(carpeta_static, ruta)) for ruta in (ruta_miniatura, ruta_webp)
+    )
+    if ya_generadas:
+        foto.ruta_miniatura = ruta_miniatura
+        foto.ruta_webp = ruta_webp
+        return True
+    
+    with Image.open(origen) as imagen:
+        imagen = ImageOps.exif_transpose(imagen)
+        if imagen.mode not in ('RGB', 'RGBA'):
+            imagen = imagen.convert('RGBA' if 'A' in imagen.getbands() else 'RGB')
+        calidad = config['IMAGEN_WEBP_CALIDAD']
+        _guardar_webp(imagen, os.path.join(carpeta_static, ruta_miniatura),
+                      config['IMAGEN_MINIATURA_MAX'], calidad)
+        _guardar_webp(imagen, os.path.join(carpeta_static, ruta_webp),
+                      config['IMAGEN_WEBP_MAX'], calidad)
+    
+    foto.ruta_miniatura = ruta_miniatura
+    foto.ruta_webp = ruta_webp
+    return True
+
+class ProcesadorImagenes:
+    """
+    Procesa fotos subidas fuera del ciclo de la petición.
+    Las tareas se encolan en un pool de hilos local (creado en el primer uso)
+    con IMAGENES_WORKERS hilos; con 0 se procesan en línea (útil en tests).
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._executor = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions['procesador_imagenes'] = self
+
+    def _pool(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.app.config['IMAGENES_WORKERS'],
+                        thread_name_prefix='imagenes'
+                    )
+        return self._executor
+
+    def encolar(self, foto_ids):
+        """Encolar el procesamiento de fotos ya confirmadas en la base de datos"""
+        for foto_id in foto_ids:
+            if self.app.config['IMAGENES_WORKERS'] > 0:
+                self._pool().submit(self.procesar, foto_id)
+            else:
+                self.procesar(foto_id)
+
+    def procesar(self, foto_id):
+        """Generar las variantes de una foto en su propio contexto de aplicación"""
+        with self.app.app_context():
+            try:
+                foto = db.session.get(Foto, foto_id)
+                if foto is None:
+                    return
+                if not generar_variantes(foto, self.app.static_folder, self.app.config):
+                    self.app.logger.warning('Pillow no está instalado; se omiten variantes de imagen')
+                    return
+                db.session.commit()
+                # La portada y el listado muestran la miniatura recién generada
+                cache_paginas.incrementar_version()
+            except Exception:
+                db.session.rollback()
+                self.app.logger.exception('Error procesando la foto %s', foto_id)
+
+    def shutdown(self, wait=True):
+        """Esperar las tareas pendientes y liberar el pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+# Instancia única, inicializada en create_app
+procesador_imagenes = ProcesadorImagenes()
@@ -0,0 +1,189 @@
+import csv
+import json
+import weakref
+from itertools import islice
+from sqlalchemy import text
+from .. import db
+from ..models import AvisoAdopcion, Foto, ContactarPor
+from .busqueda import indexar_avisos
+from .cache_paginas import cache_paginas
+from .estadisticas import registrar_avisos
+from .validacion import validar_aviso, contexto_validacion, contactos_del_aviso
+
+FORMATOS_IMPORTACION = ('ndjson', 'csv')
+
+_COLUMNAS_INSERT = (
+    'comuna_id', 'sector', 'nombre', 'email', 'celular', 'tipo', 'cantidad',
+    'edad', 'unidad_medida', 'edad_meses', 'fecha_entrega', 'descripcion', 'fecha_ingreso',
+    'region_id', 'tiene_fotos'
+)
+
+class FilaInvalida(ValueError):
+    """Fila que no se pudo interpretar; se reporta como error de esa fila"""
+
+def _json_de_fila(texto, contexto):
+    try:
+        return json.loads(texto)
+    except ValueError as e:
+        raise FilaInvalida(f'{contexto}: JSON inválido ({e})') from e
+
+def leer_registros(lineas, formato):
+    """
+    Leer registros de un archivo NDJSON o CSV (el mismo formato de la exportación)
+    como pares ``(numero_de_linea, datos)``. En CSV las columnas ``fotos`` y
+    ``contactos`` se interpretan como JSON. Una fila mal formada no detiene la
+    lectura: se entrega con una ``FilaInvalida`` en lugar de los datos.
+    """
+    if formato not in FORMATOS_IMPORTACION:
+        raise ValueError(f'Formato no soportado: {formato}')
+    if formato == 'ndjson':
+        for numero, linea in enumerate(lineas, start=1):
+            linea = linea.strip()
+            if linea:
+                try:
+                    yield numero, _json_de_fila(linea, 'Línea')
+                except FilaInvalida as e:
+                    yield numero, e
+        return
+    lector = csv.DictReader(lineas)
+    while True:
+        try:
+            fila = next(lector)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            yield lector.line_num, FilaInvalida(f'CSV inválido: {e}')
+            continue
+        try:
+            for relacion in ('fotos', 'contactos'):
+                if fila.get(relacion):
+                    fila[relacion] = _json_de_fila(fila[relacion], f'Columna {relacion}')
+        except FilaInvalida as e:
+            fila = e
+        yield lector.line_num, fila
+
+# Por engine: incremento entre los ids de un INSERT de varias filas en MySQL (None si no son consecutivos)
+_pasos_autoincremento = weakref.WeakKeyDictionary()
+
+def _paso_autoincremento(engine):
+    """
+    Con innodb_autoinc_lock_mode 0 o 1 un INSERT de varias filas recibe ids
+    consecutivos (separados por auto_increment_increment) a partir de
+    LAST_INSERT_ID(). Con 2 (intercalado) un INSERT concurrente puede tomar
+    ids en medio, así que no se pueden deducir. Se consulta una vez por engine.
+    """
+    if engine not in _pasos_autoincremento:
+        modo, incremento = db.session.execute(
+            text('SELECT @@innodb_autoinc_lock_mode, @@auto_increment_increment')
+        ).one()
+        _pasos_autoincremento[engine] = int(incremento) if int(modo) <= 1 else None
+    return _pasos_autoincremento[engine]
+
+def _primer_id(resultado):
+    """Id de la primera fila de un INSERT de varias filas (LAST_INSERT_ID() en MySQL)"""
+    return resultado.lastrowid
+
+def _insertar_avisos(filas):
+    """
+    Insertar un lote de avisos y devolver sus ids en el mismo orden.
+    Con RETURNING ordenado (SQLite, MariaDB, PostgreSQL) es un único
+    executemany. En MySQL es un único INSERT de varias filas cuyos ids se
+    deducen de LAST_INSERT_ID() (ver ``_paso_autoincremento``); solo con
+    innodb_autoinc_lock_mode=2 se inserta aviso por aviso.
+    """
+    tabla = AvisoAdopcion.__table__
+    engine = db.session.get_bind()
+    if engine.dialect.insert_executemany_returning_sort_by_parameter_order:
+        return db.session.execute(
+            tabla.insert().returning(tabla.c.id, sort_by_parameter_order=True), filas
+        ).scalars().all()
+    paso = _paso_autoincremento(engine)
+    if paso is not None:
+        primero = _primer_id(db.session.execute(tabla.insert().values(filas)))
+        return [primero + indice * paso for indice in range(len(filas))]
+    return [
+        db.session.execute(tabla.insert().values(**fila)).inserted_primary_key[0]
+        for fila in filas
+    ]
+
+def _importar_lote(lote):
+    """Validar e insertar un lote; devuelve (importados, errores) y hace commit una vez"""
+    errores = []
+    registros = []
+    legibles = []
+    for numero, datos in lote:
+        if isinstance(datos, FilaInvalida):
+            errores.append({'fila': numero, 'errores': {'registro': [str(datos)]}})
+        elif not isinstance(datos, dict):
+            errores.append({'fila': numero, 'errores': {'registro': ['Cada aviso debe ser un objeto JSON']}})
+        else:
+            legibles.append((numero, datos))
+    contexto = contexto_validacion()
+    for numero, datos in legibles:
+        try:
+            registro, errores_fila = validar_aviso(datos, contexto)
+        except Exception as e:
+            # Un valor inesperado no debe perder el resto del lote
+            errores_fila = {'registro': [f'Registro no válido: {e}']}
+        if errores_fila:
+            errores.append({'fila': numero, 'errores': errores_fila})
+        else:
+            registros.append((numero, registro))
+    if not registros:
+        return 0, errores
+    
+    try:
+        ids = _insertar_avisos([
+            {columna: registro[columna] for columna in _COLUMNAS_INSERT}
+            for _, registro in registros
+        ])
+        
+        contactos = []
+        fotos = []
+        for aviso_id, (_, registro) in zip(ids, registros):
+            contactos.extend(
+                {'actividad_id': aviso_id, 'nombre': nombre, 'identificador': identificador}
+                for nombre, identificador in contactos_del_aviso(registro)
+            )
+            fotos.extend(
+                {'actividad_id': aviso_id, 'ruta_archivo': ruta, 'nombre_archivo': nombre}
+                for ruta, nombre in registro['fotos']
+            )
+        # Hijos sin necesidad de ids de vuelta: executemany puro
+        if contactos:
+            db.session.execute(ContactarPor.__table__.insert(), contactos)
+        if fotos:
+            db.session.execute(Foto.__table__.insert(), fotos)
+        
+        registrar_avisos((registro['comuna_id'], registro['tipo']) for _, registro in registros)
+        indexar_avisos((aviso_id, registro) for aviso_id, (_, registro) in zip(ids, registros))
+        db.session.commit()
+        cache_paginas.incrementar_version()
+    except Exception as e:
+        db.session.rollback()
+        errores.extend(
+            {'fila': numero, 'errores': {'lote': [f'Error al guardar el lote: {e}']}} for numero, _ in registros
+        )
+        return 0, errores
+    
+    return len(registros), errores
+
+def importar_avisos(registros, tamano_lote=500):
+    """
+    Importar avisos en lotes de ``tamano_lote`` con las mismas validaciones del
+    formulario. ``registros`` son pares ``(numero, datos)`` como los de
+    ``leer_registros``. Cada lote se inserta con sentencias masivas y un solo
+    commit; las filas inválidas o ilegibles se reportan con su número y sus
+    errores por campo, sin detener la carga.
+    """
+    numerados = iter(registros)
+    importados = 0
+    errores = []
+    while True:
+        lote = list(islice(numerados, tamano_lote))
+        if not lote:
+            break
+        cantidad, errores_lote = _importar_lote(lote)
+        importados += cantidad
+        errores.extend(sorted(errores_lote, key=lambda error: error['fila']))
+    return {'importados': importados, 'errores': errores}
@@ -0,0 +1,205 @@
+"""
+Perfilado opcional por petición: tiempo total, consultas SQL, tiempo en base
+de datos y tiempo de render de templates.
+
+Se activa con PERFILADO=true. Cada respuesta lleva un header Server-Timing,
+las peticiones sobre el umbral se registran en el log con sus consultas más
+lentas y /metrics expone histogramas por endpoint en formato Prometheus.
+"""
+
+import heapq
+import threading
+import time
+from bisect import bisect_left
+from flask import current_app, g, has_request_context, request, Response, before_render_template, template_rendered
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Límites superiores de los buckets (segundos y número de consultas)
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_CONSULTAS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+class Histograma:
+    """Histograma acumulativo al estilo Prometheus (no es thread-safe por sí solo)"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.conteos = [0] * (len(buckets) + 1)  # el último es +Inf
+        self.suma = 0.0
+        self.total = 0
+
+    def observar(self, valor):
+        self.conteos[bisect_left(self.buckets, valor)] += 1
+        self.suma += valor
+        self.total += 1
+
+    def lineas(self, nombre, etiquetas):
+        """Líneas _bucket, _sum y _count en formato de texto de Prometheus"""
+        acumulado = 0
+        for limite, conteo in zip(self.buckets + ('+Inf',), self.conteos):
+            acumulado += conteo
+            yield f'{nombre}_bucket{{{etiquetas},le="{limite}"}} {acumulado}'
+        yield f'{nombre}_sum{{{etiquetas}}} {self.suma:.6f}'
+        yield f'{nombre}_count{{{etiquetas}}} {self.total}'
+
+# (nombre, ayuda, buckets, clave de la medición)
+METRICAS = (
+    ('http_request_duration_seconds', 'Tiempo total de la petición', BUCKETS_SEGUNDOS, 'total'),
+    ('db_query_duration_seconds', 'Tiempo en base de datos por petición', BUCKETS_SEGUNDOS, 'db'),
+    ('db_queries_per_request', 'Consultas SQL por petición', BUCKETS_CONSULTAS, 'consultas'),
+    ('template_render_seconds', 'Tiempo de render de templates por petición', BUCKETS_SEGUNDOS, 'templates'),
+)
+
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"')
+
+class Perfilador:
+    """Instrumentación por petición respaldada en eventos de SQLAlchemy y señales de Flask"""
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._histogramas = {}
+        self._escuchando = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config['PERFILADO']:
+            return
+        self._escuchar()
+        app.before_request(self._iniciar)
+        app.after_request(self._finalizar)
+        app.add_url_rule(app.config['PERFILADO_RUTA_METRICAS'], 'metricas', self.metricas)
+
+    def _escuchar(self):
+        """
+        Registrar una sola vez (por proceso) los eventos de SQLAlchemy y las
+        señales de Flask, para todos los engines y apps: cada create_app con
+        perfilado ya no agrega otra copia. Fuera de una petición perfilada
+        los receptores no hacen nada.
+        """
+        with self._lock:
+            if self._escuchando:
+                return
+            event.listen(Engine, 'before_cursor_execute', self._antes_de_consulta)
+            event.listen(Engine, 'after_cursor_execute', self._despues_de_consulta)
+            event.listen(Engine, 'handle_error', self._error_de_consulta)
+            before_render_template.connect(self._antes_de_render, weak=False)
+            template_rendered.connect(self._despues_de_render, weak=False)
+            self._escuchando = True
+
+    # --- Recolección ---
+
+    def _medicion(self):
+        """Medición de la petición en curso, o None fuera de una petición perfilada"""
+        return g.get('_perfil') if has_request_context() else None
+
+    def _iniciar(self):
+        g._perfil = {
+            'inicio': time.perf_counter(), 'consultas': 0, 'db': 0.0,
+            'templates': 0.0, 'render_inicio': [], 'lentas': []
+        }
+
+    def _antes_de_consulta(self, conn, cursor, statement, parameters, context, executemany):
+        if self._medicion() is not None:
+            conn.info.setdefault('_perfil_inicio', []).append(time.perf_counter())
+
+    def _despues_de_consulta(self, conn, cursor, statement, parameters, context, executemany):
+        inicios = conn.info.get('_perfil_inicio')
+        if not inicios:
+            return
+        duracion = time.perf_counter() - inicios.pop()
+        perfil = self._medicion()
+        if perfil is None:
+            return
+        perfil['consultas'] += 1
+        perfil['db'] += duracion
+        # Mantener solo las N consultas más lentas (heap mínimo por duración)
+        lentas = perfil['lentas']
+        entrada = (duracion, perfil['consultas'], statement)
+        if len(lentas) < current_app.config['PERFILADO_CONSULTAS_LOG']:
+            heapq.heappush(lentas, entrada)
+        elif lentas and duracion > lentas[0][0]:
+            heapq.heapreplace(lentas, entrada)
+
+    def _error_de_consulta(self, contexto):
+        """Una consulta que falla no llega a after_cursor_execute: descartar su inicio"""
+        conexion = contexto.connection
+        inicios = conexion.info.get('_perfil_inicio') if conexion is not None else None
+        if inicios:
+            inicios.pop()
+
+    def _antes_de_render(self, sender, template, context, **extra):
+        perfil = self._medicion()
+        if perfil is not None:
+            perfil['render_inicio'].append(time.perf_counter())
+
+    def _despues_de_render(self, sender, template, context, **extra):
+        perfil = self._medicion()
+        if perfil is not None and perfil['render_inicio']:
+            duracion = time.perf_counter() - perfil['render_inicio'].pop()
+            # Templates anidados ya están contenidos en el render exterior
+            if not perfil['render_inicio']:
+                perfil['templates'] += duracion
+
+    def _finalizar(self, response):
+        perfil = g.pop('_perfil', None)
+        if perfil is None or request.endpoint == 'metricas':
+            return response
+        perfil['total'] = time.perf_counter() - perfil['inicio']
+
+        response.headers['Server-Timing'] = ', '.join([
+            f'app;dur={perfil["total"] * 1000:.1f}',
+            f'db;dur={perfil["db"] * 1000:.1f};desc="{perfil["consultas"]} consultas"',
+            f'tpl;dur={perfil["templates"] * 1000:.1f}',
+        ])
+
+        endpoint = request.endpoint or 'sin_ruta'
+        with self._lock:
+            histogramas = self._histogramas.get(endpoint)
+            if histogramas is None:
+                histogramas = {clave: Histograma(buckets) for _, _, buckets, clave in METRICAS}
+                self._histogramas[endpoint] = histogramas
+            for _, _, _, clave in METRICAS:
+                histogramas[clave].observar(perfil[clave])
+
+        if perfil['total'] * 1000 >= current_app.config['PERFILADO_UMBRAL_LENTO_MS']:
+            self._registrar_lenta(perfil, endpoint)
+        return response
+
+    def _registrar_lenta(self, perfil, endpoint):
+        lineas = [
+            f'  {duracion * 1000:.1f} ms (#{orden}): {" ".join(statement.split())}'
+            for duracion, orden, statement in sorted(perfil['lentas'], reverse=True)
+        ]
+        current_app.logger.warning(
+            'Petición lenta %s %s (%s): %.1f ms, %d consultas en %.1f ms, templates %.1f ms\n%s',
+            request.method, request.full_path.rstrip('?'), endpoint, perfil['total'] * 1000,
+            perfil['consultas'], perfil['db'] * 1000, perfil['templates'] * 1000, '\n'.join(lineas)
+        )
+
+    # --- Exposición ---
+
+    def texto_prometheus(self):
+        """Histogramas por endpoint en formato de texto de Prometheus"""
+        lineas = []
+        with self._lock:
+            for nombre, ayuda, _, clave in METRICAS:
+                lineas.append(f'# HELP {nombre} {ayuda}')
+                lineas.append(f'# TYPE {nombre} histogram')
+                for endpoint in sorted(self._histogramas):
+                    etiquetas = f'endpoint="{_escapar(endpoint)}"'
+                    lineas.extend(self._histogramas[endpoint][clave].lineas(nombre, etiquetas))
+        return '\n'.join(lineas) + '\n'
+
+    def metricas(self):
+        """Vista de /metrics"""
+        return Response(self.texto_prometheus(), mimetype='text/plain; version=0.0.4')
+
+    def reiniciar(self):
+        """Descartar los histogramas acumulados"""
+        with self._lock:
+            self._histogramas.clear()
+
+# Instancia única, inicializada en create_app
+perfilador = Perfilador()
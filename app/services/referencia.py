@@ -0,0 +1,115 @@
+import hashlib
+import json
+import threading
+from ..models import Region, Comuna
+
+class CacheReferencia:
+    """
+    Cache en memoria de las tablas de referencia region y comuna.
+    Se carga una sola vez por worker (dos consultas) y expone diccionarios de
+    búsqueda región→comunas y comuna→región. ``invalidar`` y ``recargar``
+    permiten refrescarla cuando cambian los datos (por ejemplo, tras un seed).
+    """
+
+    def __init__(self):
+        self._datos = None
+        self._lock = threading.Lock()
+
+    def _cargar(self):
+        """Leer ambas tablas y construir las estructuras de búsqueda"""
+        regiones = tuple(
+            region.to_dict() for region in Region.query.order_by(Region.id).all()
+        )
+        comunas = tuple(
+            comuna.to_dict() for comuna in Comuna.query.order_by(Comuna.id).all()
+        )
+        return self._indexar(regiones, comunas)
+
+    @staticmethod
+    def _indexar(regiones, comunas):
+        """Estructuras de búsqueda a partir de las filas (dicts) ordenadas por id"""
+        regiones_por_id = {region['id']: region for region in regiones}
+        comunas_por_id = {comuna['id']: comuna for comuna in comunas}
+        comunas_por_region = {region['id']: [] for region in regiones}
+        for comuna in comunas:
+            comunas_por_region.setdefault(comuna['region_id'], []).append(comuna)
+
+        contenido = json.dumps([regiones, comunas], sort_keys=True, separators=(',', ':'))
+        return {
+            'regiones': regiones,
+            'regiones_por_id': regiones_por_id,
+            'comunas_por_id': comunas_por_id,
+            'comunas_por_region': {k: tuple(v) for k, v in comunas_por_region.items()},
+            'version': hashlib.sha1(contenido.encode('utf-8')).hexdigest()[:16]
+        }
+
+    @property
+    def datos(self):
+        datos = self._datos
+        if datos is None:
+            with self._lock:
+                if self._datos is None:
+                    self._datos = self._cargar()
+                datos = self._datos
+        return datos
+
+    @property
+    def cargado(self):
+        """True si los datos ya están en memoria (acceder no consultará la base)"""
+        return self._datos is not None
+
+    @property
+    def version(self):
+        """Huella del contenido cargado; cambia solo si cambian los datos"""
+        return self.datos['version']
+
+    def regiones(self):
+        """Todas las regiones ordenadas por id"""
+        return self.datos['regiones']
+
+    def region(self, region_id):
+        """Región por id o None"""
+        return self.datos['regiones_por_id'].get(region_id)
+
+    def comuna(self, comuna_id):
+        """Comuna por id o None"""
+        return self.datos['comunas_por_id'].get(comuna_id)
+
+    def comunas_de_region(self, region_id):
+        """Comunas de una región ordenadas por id"""
+        return self.datos['comunas_por_region'].get(region_id, ())
+
+    def region_de_comuna(self, comuna_id):
+        """Región a la que pertenece una comuna o None"""
+        comuna = self.comuna(comuna_id)
+        return self.region(comuna['region_id']) if comuna else None
+
+    def nombre_comuna(self, comuna_id):
+        """Nombre de la comuna o None si no existe"""
+        comuna = self.comuna(comuna_id)
+        return comuna['nombre'] if comuna else None
+
+    def invalidar(self):
+        """Descartar los datos; se recargan en el siguiente acceso"""
+        with self._lock:
+            self._datos = None
+
+    def establecer(self, regiones, comunas):
+        """
+        Reemplazar los datos con filas ya leídas (dicts ordenados por id), p. ej.
+        desde una sesión asíncrona que no puede usar las consultas de ``_cargar``
+        """
+        datos = self._indexar(tuple(regiones), tuple(comunas))
+        with self._lock:
+            self._datos = datos
+        return datos
+
+    def recargar(self):
+        """Recargar inmediatamente desde la base de datos"""
+        datos = self._cargar()
+        with self._lock:
+            self._datos = datos
+        return datos
+
+# Instancia única por proceso (worker)
+referencia = CacheReferencia()
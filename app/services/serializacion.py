@@ -0,0 +1,113 @@
+"""
+Serialización liviana para la API de solo lectura.
+
+Las consultas seleccionan solo las columnas pedidas (filas, no objetos ORM),
+las relaciones se agregan con una consulta por relación para toda la página
+y el JSON se codifica con orjson si está instalado (con el módulo json de la
+biblioteca estándar en caso contrario).
+"""
+
+import json
+from datetime import date, datetime
+from flask import current_app
+from sqlalchemy import select
+from .. import db
+from ..models import AvisoAdopcion, Foto, ContactarPor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Campos públicos de un aviso (mismo orden y nombres que AvisoAdopcion.to_dict)
+CAMPOS_AVISO = (
+    'id', 'fecha_ingreso', 'comuna_id', 'sector', 'nombre', 'email', 'celular', 'tipo',
+    'cantidad', 'edad', 'unidad_medida', 'fecha_entrega', 'descripcion'
+)
+
+# Relaciones que se pueden anidar con ``incluir`` y sus columnas
+RELACIONES_AVISO = {
+    'fotos': (Foto, ('id', 'ruta_archivo', 'nombre_archivo', 'actividad_id', 'ruta_miniatura', 'ruta_webp')),
+    'contactos': (ContactarPor, ('id', 'nombre', 'identificador', 'actividad_id')),
+}
+
+def leer_campos(valor):
+    """
+    Interpretar el parámetro ``fields`` (lista separada por comas).
+    Sin valor devuelve todos los campos; ``id`` siempre se incluye.
+    """
+    if not valor:
+        return CAMPOS_AVISO
+    pedidos = {campo.strip() for campo in valor.split(',') if campo.strip()}
+    desconocidos = pedidos - set(CAMPOS_AVISO)
+    if desconocidos:
+        raise ValueError(f"Campos no soportados: {', '.join(sorted(desconocidos))}")
+    return tuple(campo for campo in CAMPOS_AVISO if campo in pedidos or campo == 'id')
+
+def leer_incluir(valor):
+    """Interpretar el parámetro ``incluir`` (fotos,contactos)"""
+    relaciones = tuple(r.strip() for r in (valor or '').split(',') if r.strip())
+    desconocidas = set(relaciones) - set(RELACIONES_AVISO)
+    if desconocidas:
+        raise ValueError(f"Relaciones no soportadas: {', '.join(sorted(desconocidas))}")
+    return relaciones
+
+def columnas_aviso(campos, extra=()):
+    """Columnas a seleccionar: los campos pedidos más las que requiera la paginación"""
+    nombres = list(campos) + [nombre for nombre in extra if nombre not in campos]
+    return [getattr(AvisoAdopcion, nombre) for nombre in nombres]
+
+def consulta_relacion(nombre, aviso_ids):
+    """Sentencia con las filas de una relación para todos los avisos de la página"""
+    modelo, columnas = RELACIONES_AVISO[nombre]
+    return select(*[getattr(modelo, columna) for columna in columnas]).where(
+        modelo.actividad_id.in_(aviso_ids)
+    ).order_by(modelo.actividad_id, modelo.id)
+
+def agrupar_relacion(nombre, aviso_ids, filas):
+    """Agrupar por aviso las filas de ``consulta_relacion``"""
+    columnas = RELACIONES_AVISO[nombre][1]
+    agrupadas = {aviso_id: [] for aviso_id in aviso_ids}
+    for fila in filas:
+        agrupadas[fila.actividad_id].append(dict(zip(columnas, fila)))
+    return agrupadas
+
+def _relacion(nombre, aviso_ids):
+    """Filas de una relación para todos los avisos de la página, agrupadas por aviso"""
+    if not aviso_ids:
+        return {}
+    return agrupar_relacion(nombre, aviso_ids, db.session.execute(consulta_relacion(nombre, aviso_ids)))
+
+def filas_a_dicts(filas, campos):
+    """Dicts con solo ``campos`` a partir de filas de avisos"""
+    return [{campo: getattr(fila, campo) for campo in campos} for fila in filas]
+
+def serializar_avisos(filas, campos, incluir=()):
+    """
+    Convertir filas de avisos en dicts con solo ``campos`` y las relaciones de
+    ``incluir`` (una consulta por relación). Las fechas quedan como datetime y
+    las convierte el codificador.
+    """
+    avisos = filas_a_dicts(filas, campos)
+    if incluir:
+        ids = [aviso['id'] for aviso in avisos]
+        for relacion in incluir:
+            agrupadas = _relacion(relacion, ids)
+            for aviso in avisos:
+                aviso[relacion] = agrupadas[aviso['id']]
+    return avisos
+
+def _por_defecto(valor):
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    raise TypeError(f'Tipo no serializable: {type(valor).__name__}')
+
+def codificar_json(datos):
+    """JSON compacto en bytes UTF-8"""
+    if orjson is not None:
+        return orjson.dumps(datos)
+    return json.dumps(datos, ensure_ascii=False, separators=(',', ':'), default=_por_defecto).encode('utf-8')
+
+def respuesta_json(datos, status=200):
+    """Respuesta JSON con el codificador más rápido disponible"""
+    return current_app.response_class(codificar_json(datos), status=status, mimetype='application/json')
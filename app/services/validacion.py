@@ -0,0 +1,337 @@
+"""
+Validación de avisos compartida por el formulario, la API y la importación.
+
+Las reglas se declaran como esquemas de campos (``ESQUEMA_AVISO``,
+``ESQUEMA_CONTACTO``) que se compilan una vez, al importar el módulo, en
+una función por campo con los patrones precompilados. Los errores se devuelven
+agrupados por campo: ``{'email': ['El email debe tener formato válido']}``.
+``validar_lote`` valida muchos registros en una pasada reutilizando el
+contexto (comunas existentes, fecha actual).
+"""
+
+import math
+import posixpath
+import re
+from datetime import datetime
+from .referencia import referencia
+
+# Valores admitidos por los ENUM de la base de datos
+TIPOS_MASCOTA = ('gato', 'perro')
+UNIDADES_EDAD = ('a', 'm')
+MEDIOS_CONTACTO = ('whatsapp', 'telegram', 'X', 'instagram', 'tiktok', 'otra')
+
+EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+# Formato del formulario (+569.12345678) y los formatos chilenos sin punto
+CELULAR_RE = re.compile(r'^(\+\d{3}\.\d{8}|\+?569\d{8}|9\d{8})$')
+
+# --- Conversores: devuelven el valor normalizado o lanzan ValueError/TypeError ---
+
+def _texto(valor):
+    return valor.strip() if type(valor) is str else (str(valor).strip() if valor is not None else '')
+
+def _entero(valor):
+    if type(valor) is int:
+        return valor
+    if type(valor) is str and valor.isdigit():
+        return int(valor)
+    numero = float(valor)
+    # int() de inf lanza OverflowError y de nan ValueError: ambos son entradas no válidas
+    if not math.isfinite(numero):
+        raise ValueError(f'número no finito: {valor!r}')
+    return int(numero)
+
+def _fecha(valor):
+    """Aceptar datetime o texto ISO ('AAAA-MM-DD', 'AAAA-MM-DDTHH:MM', ...)"""
+    if isinstance(valor, datetime):
+        return valor
+    return datetime.fromisoformat(_texto(valor))
+
+class Campo:
+    """
+    Regla declarativa de un campo. Los mensajes aceptan ``{valor}``.
+
+    - ``obligatorio``: mensaje si falta (vacío); si es None el campo es opcional
+    - ``por_defecto``: valor (ya convertido) cuando falta
+    - ``invalido``: mensaje si el conversor falla
+    - ``opciones``/``patron``/``rango``/``largo_max``: restricciones sobre el valor convertido
+    - ``existe``: (clave del contexto, mensaje); el valor debe estar en ese conjunto
+    """
+
+    def __init__(self, nombre, conversor=_texto, obligatorio=None, por_defecto=None, invalido=None,
+                 opciones=None, patron=None, rango=None, largo_max=None, existe=None):
+        self.nombre = nombre
+        self.conversor = conversor
+        self.obligatorio = obligatorio
+        self.por_defecto = por_defecto
+        self.invalido = invalido or f'El campo {nombre} no es válido'
+        self.opciones = opciones
+        self.patron = patron
+        self.rango = rango
+        self.largo_max = largo_max
+        self.existe = existe
+
+def _agregar_error(errores, campo, mensaje, valor):
+    errores.setdefault(campo, []).append(mensaje.format(valor=valor))
+
+def _compilar_campo(campo):
+    """
+    Función ``validar(v, contexto, errores) -> valor`` de un campo a partir
+    de su valor crudo. La configuración se resuelve una vez (patrones
+    precompilados, opciones en un frozenset, límites del rango) y las
+    restricciones se comprueban en línea, sin una función por restricción:
+    el caso válido solo paga las comparaciones del campo. Se reporta la
+    primera que falla; el largo va antes que el patrón para no evaluar
+    expresiones sobre textos demasiado largos.
+    """
+    nombre = campo.nombre
+    obligatorio, por_defecto, invalido = campo.obligatorio, campo.por_defecto, campo.invalido
+    conversor = None if campo.conversor is _texto else campo.conversor
+    largo_max = campo.largo_max
+    mensaje_largo = f'El campo {nombre} admite como máximo {largo_max} caracteres'
+    opciones, mensaje_opciones = (frozenset(campo.opciones[0]), campo.opciones[1]) if campo.opciones else (None, None)
+    coincide, mensaje_patron = (campo.patron[0].match, campo.patron[1]) if campo.patron else (None, None)
+    minimo, maximo, mensaje_rango = campo.rango or (None, None, None)
+    hay_rango = campo.rango is not None
+    minimo = float('-inf') if minimo is None else minimo
+    maximo = float('inf') if maximo is None else maximo
+    existe, mensaje_existe = campo.existe or (None, None)
+    sin_restricciones = not (largo_max or opciones or coincide or hay_rango or existe)
+
+    if conversor is None and sin_restricciones:
+        def validar(v, contexto, errores):
+            v = v.strip() if type(v) is str else ('' if v is None else str(v).strip())
+            if v:
+                return v
+            if obligatorio:
+                _agregar_error(errores, nombre, obligatorio, '')
+            return por_defecto
+    elif conversor is None:
+        def validar(v, contexto, errores):
+            v = v.strip() if type(v) is str else ('' if v is None else str(v).strip())
+            if not v:
+                if obligatorio:
+                    _agregar_error(errores, nombre, obligatorio, '')
+                return por_defecto
+            if largo_max and len(v) > largo_max:
+                mensaje = mensaje_largo
+            elif opciones is not None and v not in opciones:
+                mensaje = mensaje_opciones
+            elif coincide is not None and not coincide(v):
+                mensaje = mensaje_patron
+            elif hay_rango and not minimo <= v <= maximo:
+                mensaje = mensaje_rango
+            elif existe is not None and v not in contexto[existe]:
+                mensaje = mensaje_existe
+            else:
+                return v
+            _agregar_error(errores, nombre, mensaje, v)
+            return v
+    else:
+        def validar(v, contexto, errores):
+            if v is None or (type(v) is str and not v.strip()):
+                if obligatorio:
+                    _agregar_error(errores, nombre, obligatorio, '')
+                return por_defecto
+            try:
+                v = conversor(v)
+            except (ValueError, TypeError, OverflowError):
+                _agregar_error(errores, nombre, invalido, v)
+                return por_defecto
+            if largo_max and len(v) > largo_max:
+                mensaje = mensaje_largo
+            elif opciones is not None and v not in opciones:
+                mensaje = mensaje_opciones
+            elif coincide is not None and not coincide(v):
+                mensaje = mensaje_patron
+            elif hay_rango and not minimo <= v <= maximo:
+                mensaje = mensaje_rango
+            elif existe is not None and v not in contexto[existe]:
+                mensaje = mensaje_existe
+            else:
+                return v
+            _agregar_error(errores, nombre, mensaje, v)
+            return v
+
+    return validar
+
+def compilar_esquema(esquema):
+    """Función ``validar(datos, contexto) -> (valores, errores)`` con un validador por campo"""
+    campos = tuple((campo.nombre, _compilar_campo(campo)) for campo in esquema)
+
+    def validar(datos, contexto):
+        errores = {}
+        obtener = datos.get
+        return {nombre: validar_campo(obtener(nombre), contexto, errores) for nombre, validar_campo in campos}, errores
+
+    return validar
+
+# Esquema de AvisoAdopcion (mismos nombres que las columnas del modelo)
+ESQUEMA_AVISO = (
+    Campo('nombre', obligatorio='El nombre es obligatorio', largo_max=200),
+    Campo('email', obligatorio='El email es obligatorio', largo_max=100,
+          patron=(EMAIL_RE, 'El email debe tener formato válido')),
+    Campo('celular', largo_max=15,
+          patron=(CELULAR_RE, 'El celular debe tener el formato +569.12345678')),
+    Campo('comuna_id', _entero, obligatorio='Debe seleccionar una comuna',
+          invalido='La comuna seleccionada no es válida',
+          existe=('comunas', 'La comuna seleccionada no existe')),
+    Campo('sector', largo_max=100),
+    Campo('tipo', obligatorio='Debe seleccionar un tipo de animal',
+          opciones=(TIPOS_MASCOTA, 'El tipo de animal debe ser gato o perro')),
+    Campo('descripcion', obligatorio='La descripción es obligatoria'),
+    Campo('fecha_entrega', _fecha, obligatorio='Debe especificar una fecha de entrega',
+          invalido='La fecha de entrega no es válida'),
+    Campo('unidad_medida', por_defecto='m',
+          opciones=(UNIDADES_EDAD, 'La unidad de edad debe ser años (a) o meses (m)')),
+    Campo('cantidad', _entero, por_defecto=1, invalido='La cantidad debe ser un número entero válido',
+          rango=(1, 20, 'La cantidad debe ser un número entero entre 1 y 20')),
+    Campo('edad', _entero, por_defecto=1, invalido='La edad debe ser un número entero válido',
+          rango=(1, None, 'La edad debe ser un número mayor a 0')),
+    Campo('fecha_ingreso', _fecha, invalido='La fecha de ingreso no es válida'),
+)
+
+# Esquema de ContactarPor (solo se validan los contactos con medio e identificador)
+ESQUEMA_CONTACTO = (
+    Campo('nombre', opciones=(MEDIOS_CONTACTO, 'Medio de contacto no válido: {valor}')),
+    Campo('identificador', largo_max=150),
+)
+
+_validar_campos_aviso = compilar_esquema(ESQUEMA_AVISO)
+_validar_medio, _validar_identificador = (_compilar_campo(campo) for campo in ESQUEMA_CONTACTO)
+
+def es_email_valido(email):
+    """Indica si el email tiene formato válido"""
+    return bool(EMAIL_RE.match(_texto(email)))
+
+def es_celular_valido(celular):
+    """Indica si el celular tiene un formato chileno válido"""
+    return bool(CELULAR_RE.match(_texto(celular)))
+
+def contexto_validacion():
+    """Datos compartidos por todos los registros de un lote"""
+    return {
+        'comunas': referencia.datos['comunas_por_id'],
+        'ahora': datetime.now()
+    }
+
+def _contactos(datos, errores):
+    lista = datos.get('contactos')
+    if not lista:
+        return ()
+    if not isinstance(lista, (list, tuple)):
+        errores.setdefault('contactos', []).append('Los contactos deben ser una lista')
+        return ()
+    contactos = []
+    errores_contacto = {}
+    for contacto in lista:
+        if isinstance(contacto, dict):
+            medio, identificador = contacto.get('nombre'), contacto.get('identificador')
+        elif isinstance(contacto, (list, tuple)) and len(contacto) == 2:
+            medio, identificador = contacto
+        else:
+            errores.setdefault('contactos', []).append(
+                'Cada contacto debe ser un par [medio, identificador] o un objeto con nombre e identificador'
+            )
+            continue
+        medio, identificador = _texto(medio), _texto(identificador)
+        if not (medio and identificador):
+            continue
+        medio = _validar_medio(medio, None, errores_contacto)
+        identificador = _validar_identificador(identificador, None, errores_contacto)
+        if errores_contacto:
+            for mensajes in errores_contacto.values():
+                errores.setdefault('contactos', []).extend(mensajes)
+            errores_contacto.clear()
+        else:
+            contactos.append((medio, identificador))
+    return tuple(contactos)
+
+# Carpeta (relativa a static) de las fotos; las rutas importadas no pueden salir de ella
+CARPETA_FOTOS = 'uploads/'
+
+def ruta_foto_segura(ruta):
+    """
+    Ruta de foto normalizada si queda dentro de ``uploads/`` (relativa a
+    static), o None: rutas absolutas, con ``..`` que escapen de la carpeta o
+    con separadores de Windows se rechazan, porque el procesamiento de
+    imágenes abre el archivo y escribe sus variantes al lado.
+    """
+    if not ruta or '\\' in ruta or '\x00' in ruta or ruta.startswith('/'):
+        return None
+    normalizada = posixpath.normpath(ruta)
+    return normalizada if normalizada.startswith(CARPETA_FOTOS) else None
+
+def _fotos(datos, errores):
+    lista = datos.get('fotos')
+    if not lista:
+        return ()
+    if not isinstance(lista, (list, tuple)):
+        errores.setdefault('fotos', []).append('Las fotos deben ser una lista')
+        return ()
+    fotos = []
+    for foto in lista:
+        ruta = _texto(foto.get('ruta_archivo')) if isinstance(foto, dict) else ''
+        if not ruta:
+            errores.setdefault('fotos', []).append('Cada foto debe indicar ruta_archivo')
+            continue
+        segura = ruta_foto_segura(ruta)
+        if segura is None:
+            errores.setdefault('fotos', []).append(f'Ruta de foto no permitida: {ruta}')
+            continue
+        fotos.append((segura, _texto(foto.get('nombre_archivo')) or segura.rsplit('/', 1)[-1]))
+    return tuple(fotos)
+
+def validar_aviso(datos, contexto=None):
+    """
+    Validar y normalizar los datos de un aviso con las reglas del formulario.
+
+    ``datos`` usa los nombres de columna del modelo y, opcionalmente,
+    ``contactos`` (pares nombre/identificador o dicts), ``fotos`` (dicts con
+    ruta_archivo y nombre_archivo, solo importación) y ``fecha_ingreso``.
+    Devuelve ``(registro, errores)``: el registro listo para insertar y los
+    mensajes de error por campo (dict vacío si es válido).
+    """
+    if contexto is None:
+        contexto = contexto_validacion()
+    registro, errores = _validar_campos_aviso(datos, contexto)
+    registro['contactos'] = _contactos(datos, errores)
+    registro['fotos'] = _fotos(datos, errores)
+
+    # Validar que haya al menos un medio de contacto
+    if not (registro['email'] or registro['celular'] or registro['contactos']):
+        errores.setdefault('contactos', []).append('Debe proporcionar al menos un medio de contacto válido')
+
+    registro['sector'] = registro['sector'] or None
+    registro['celular'] = registro['celular'] or None
+    registro['edad_meses'] = registro['edad'] * 12 if registro['unidad_medida'] == 'a' else registro['edad']
+    comuna = contexto['comunas'].get(registro['comuna_id'])
+    registro['region_id'] = comuna['region_id'] if comuna else None
+    registro['tiene_fotos'] = bool(registro['fotos'])
+    registro['fecha_ingreso'] = registro['fecha_ingreso'] or contexto['ahora']
+    return registro, errores
+
+def validar_lote(lista_datos):
+    """
+    Validar varios avisos en una pasada reutilizando el contexto (comunas,
+    fecha actual); devuelve una lista de ``(registro, errores)``.
+    """
+    contexto = contexto_validacion()
+    return [validar_aviso(datos, contexto) for datos in lista_datos]
+
+def mensajes_error(errores):
+    """Aplanar los errores por campo en una lista de mensajes"""
+    return [mensaje for mensajes in errores.values() for mensaje in mensajes]
+
+def contactos_del_aviso(registro):
+    """
+    Formas de contacto a guardar para un aviso validado: email y celular
+    (como 'otra', igual que el formulario) seguidos de los adicionales.
+    """
+    contactos = []
+    if registro['email']:
+        contactos.append(('otra', f"Email: {registro['email']}"))
+    if registro['celular']:
+        contactos.append(('otra', f"Celular: {registro['celular']}"))
+    # Evitar duplicados (p. ej. al reimportar una exportación que ya los trae)
+    contactos.extend(c for c in registro['contactos'] if c not in contactos)
+    return contactos
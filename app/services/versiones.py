@@ -0,0 +1,102 @@
+"""
+Validadores del caché HTTP de la API de lectura.
+
+Cada recurso tiene una versión y, si los datos la registran, una fecha de
+última modificación. Ambas salen de consultas indexadas y baratas, sin
+ejecutar la consulta de la respuesta.
+Las sentencias se construyen aquí y las ejecutan la API WSGI (``db.session``)
+y la ASGI (sesión asíncrona), así ambas generan el mismo ETag y el mismo
+Last-Modified para la misma URL y responden 304 en los mismos casos.
+"""
+
+import hashlib
+from datetime import timezone
+from sqlalchemy import func, select
+from ..models import AvisoAdopcion, Foto
+from .referencia import referencia
+
+def a_utc(fecha):
+    """Normalizar una fecha a UTC sin microsegundos (precisión de los encabezados HTTP)"""
+    if fecha is None:
+        return None
+    if fecha.tzinfo is None:
+        fecha = fecha.replace(tzinfo=timezone.utc)
+    return fecha.astimezone(timezone.utc).replace(microsecond=0)
+
+def etag_version(ruta_completa, version):
+    """ETag fuerte (sin comillas) de una URL con su query string en una versión dada"""
+    return hashlib.sha1(f'{ruta_completa}|{version}'.encode('utf-8')).hexdigest()
+
+def no_modificado(etag, ultima_modificacion, if_none_match, if_modified_since):
+    """
+    Si el cliente ya tiene la versión. If-None-Match (``werkzeug.datastructures.ETags``)
+    tiene prioridad sobre If-Modified-Since y usa comparación débil (RFC 9110): el
+    ETag vuelve como W/"..." si la respuesta se comprimió.
+    """
+    if if_none_match:
+        return if_none_match.contains_weak(etag)
+    return (
+        ultima_modificacion is not None
+        and if_modified_since is not None
+        and ultima_modificacion <= if_modified_since
+    )
+
+def version_referencia():
+    """
+    Regiones y comunas: huella del contenido del cache de referencia (debe
+    estar cargado), igual en todos los workers. Sin Last-Modified: no hay una
+    fecha de modificación de los datos, y la hora de carga de cada worker
+    daría encabezados distintos para el mismo contenido.
+    """
+    return referencia.version, None
+
+def consulta_fecha_aviso(aviso_id):
+    return select(AvisoAdopcion.fecha_ingreso).where(AvisoAdopcion.id == aviso_id)
+
+def consulta_estado_fotos(aviso_ids):
+    """Cantidad, última foto y fotos con variantes de los avisos (índice fk_foto_aviso1_idx)"""
+    return select(
+        func.count(Foto.id), func.max(Foto.id), func.count(Foto.ruta_webp)
+    ).where(Foto.actividad_id.in_(aviso_ids))
+
+def estado_fotos(fila):
+    """
+    ``(version, pendientes)`` a partir de la fila de ``consulta_estado_fotos``.
+    Cambia cuando el procesamiento en segundo plano completa
+    ``ruta_miniatura``/``ruta_webp`` o cuando se descarta una foto.
+    """
+    total, ultima, procesadas = fila
+    return f'{total}.{ultima or 0}.{procesadas}', procesadas < total
+
+def version_aviso(aviso_id, fecha_ingreso, fotos):
+    """
+    Un aviso: los avisos no se editan, basta su fecha de ingreso más el
+    estado de sus fotos. Mientras haya fotos sin procesar no hay
+    Last-Modified: la fecha de ingreso no cambia al terminar y
+    If-Modified-Since respondería 304 con las rutas viejas.
+    """
+    if fecha_ingreso is None:
+        return None
+    version, pendientes = fotos
+    return f'{aviso_id}:{fecha_ingreso.isoformat()}:{version}', None if pendientes else fecha_ingreso
+
+def consulta_ultimo_aviso():
+    """
+    Último id y última fecha de ingreso (ambos indexados). Un máximo por
+    subconsulta: SQLite solo lee el extremo del índice cuando el SELECT tiene
+    un único min/max; con los dos juntos recorre la tabla completa.
+    """
+    return select(
+        select(func.max(AvisoAdopcion.id)).scalar_subquery(),
+        select(func.max(AvisoAdopcion.fecha_ingreso)).scalar_subquery()
+    )
+
+def version_avisos(fila):
+    """Listados: versión a partir de la fila de ``consulta_ultimo_aviso``"""
+    ultimo_id, ultima_fecha = fila
+    fecha = ultima_fecha.isoformat() if ultima_fecha else ''
+    return f'{ultimo_id}:{fecha}', ultima_fecha
+
+def cachea_listado(incluir):
+    """``/avisos`` con fotos no se cachea: sus variantes cambian sin que cambien los avisos"""
+    return 'fotos' not in (incluir or '')
@@ -18,6 +18,25 @@ def format_date(value):
         return ""
     return value.strftime('%d/%m/%Y')
 
+def url_foto(ruta_archivo):
+    """URL pública de una foto guardada en static/uploads"""
+    from flask import url_for
+    if ruta_archivo and ruta_archivo.startswith('uploads/'):
+        return url_for('main.media', ruta=ruta_archivo[len('uploads/'):])
+    return url_for('static', filename=ruta_archivo)
+
+def url_estatico(ruta):
+    """URL de un asset de static/, con hash en el nombre si fue compilado"""
+    from flask import current_app, url_for
+    from .services import manifiesto_estaticos
+    return url_for('static', filename=manifiesto_estaticos.resolver(current_app.static_folder, ruta))
+
+def url_referencia():
+    """URL del artefacto vigente de regiones y comunas (cambia con los datos)"""
+    from flask import url_for
+    from .services import artefacto_referencia
+    return url_for('api.get_referencia_version', hash_contenido=artefacto_referencia.hash)
+
 def create_upload_folder(upload_path):
     """Crear carpeta de uploads si no existe"""
     if not os.path.exists(upload_path):
@@ -25,14 +44,11 @@ def create_upload_folder(upload_path):
     return upload_path
 
 def validate_email(email):
-    """Validación básica de email"""
-    import re
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    """Validación básica de email (delegada al módulo de validación)"""
+    from .services.validacion import es_email_valido
+    return es_email_valido(email)
 
 def validate_phone(phone):
-    """Validación básica de teléfono chileno"""
-    import re
-    # Formato chileno: +569XXXXXXXX o 9XXXXXXXX
-    pattern = r'^(\+?569|9)[0-9]{8}$'
-    return re.match(pattern, phone) is not None
\ No newline at end of file
+    """Validación básica de teléfono chileno: +569.XXXXXXXX, +569XXXXXXXX o 9XXXXXXXX"""
+    from .services.validacion import es_celular_valido
+    return es_celular_valido(phone)
\ No newline at end of file
@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+Punto de entrada ASGI opcional: la API de lectura con driver asíncrono y el
+resto de la aplicación Flask montada como WSGI (ver app/asincrono.py)
+
+Uso:
+    uvicorn asgi:app --workers 4
+"""
+
+from app import create_app
+from app.asincrono import crear_app_asgi
+
+app = crear_app_asgi(create_app())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Presupuesto de arranque de un worker: tiempo de create_app y conexiones abiertas.
+
+Cada medición corre en un proceso nuevo (imports en frío, como un worker de
+gunicorn recién creado). Termina con código 1 si la mediana supera el
+presupuesto o si create_app abre alguna conexión a la base de datos.
+
+Uso:
+    python benchmarks/arranque.py --presupuesto-ms 300
+    python benchmarks/arranque.py --config development --permitir-conexiones
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Se ejecuta en el proceso hijo; imprime una línea JSON con la medición
+MEDICION = '''
+import json, sys, time
+inicio = time.perf_counter()
+from sqlalchemy import event
+from sqlalchemy.pool import Pool
+conexiones = []
+event.listen(Pool, 'connect', lambda *args: conexiones.append(1))
+from app import create_app
+importado = time.perf_counter()
+create_app(sys.argv[1])
+fin = time.perf_counter()
+print(json.dumps({
+    'import_ms': (importado - inicio) * 1000,
+    'create_app_ms': (fin - importado) * 1000,
+    'total_ms': (fin - inicio) * 1000,
+    'conexiones': len(conexiones),
+}))
+'''
+
+def medir(config_name, entorno=None):
+    """
+    Medir un arranque en un proceso nuevo (``entorno``: variables de entorno
+    adicionales). RuntimeError con la última línea del error si create_app falla.
+    """
+    resultado = subprocess.run(
+        [sys.executable, '-c', MEDICION, config_name],
+        cwd=RAIZ, capture_output=True, text=True, env={**os.environ, **(entorno or {})}
+    )
+    if resultado.returncode != 0:
+        lineas = resultado.stderr.strip().splitlines()
+        raise RuntimeError(f"create_app('{config_name}') falló: {lineas[-1] if lineas else resultado.returncode}")
+    return json.loads(resultado.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--config', default='production',
+                        help='Configuración a medir (por defecto production)')
+    parser.add_argument('--repeticiones', type=int, default=5, help='Arranques medidos')
+    parser.add_argument('--presupuesto-ms', type=float, default=1000,
+                        help='Máximo para la mediana de import + create_app')
+    parser.add_argument('--permitir-conexiones', action='store_true',
+                        help='No fallar si create_app abre conexiones (p. ej. con CREAR_TABLAS_AL_INICIAR)')
+    args = parser.parse_args()
+
+    try:
+        mediciones = [medir(args.config) for _ in range(args.repeticiones)]
+    except RuntimeError as e:
+        print(f'FALLA {e}')
+        sys.exit(1)
+    medianas = {
+        clave: statistics.median(m[clave] for m in mediciones)
+        for clave in ('import_ms', 'create_app_ms', 'total_ms')
+    }
+    conexiones = max(m['conexiones'] for m in mediciones)
+    print(f"{args.config}: import {medianas['import_ms']:.1f} ms, create_app {medianas['create_app_ms']:.1f} ms, "
+          f"total {medianas['total_ms']:.1f} ms (mediana de {args.repeticiones}), conexiones {conexiones}")
+
+    fallas = []
+    if medianas['total_ms'] > args.presupuesto_ms:
+        fallas.append(f"arranque de {medianas['total_ms']:.1f} ms supera el presupuesto de {args.presupuesto_ms:.0f} ms")
+    if conexiones and not args.permitir_conexiones:
+        fallas.append(f'create_app abrió {conexiones} conexión(es) a la base de datos')
+    for falla in fallas:
+        print(f'FALLA {falla}')
+    if fallas:
+        sys.exit(1)
+    print('Dentro del presupuesto.')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Benchmark reproducible de las vistas y de la API de solo lectura.
+
+Recorre cada escenario con el cliente de pruebas de Flask, mide la latencia
+(p50/p95/p99) y las consultas SQL por petición y guarda los resultados en
+JSON para comparar corridas y detectar regresiones.
+
+Uso:
+    python benchmarks/carga.py --avisos 10000 --repeticiones 100
+    python benchmarks/carga.py --comparar benchmarks/resultados/base.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from sqlalchemy import event, func, select  # noqa: E402
+from app import create_app, db  # noqa: E402
+from app.models import AvisoAdopcion, Region  # noqa: E402
+
+PER_PAGE_LISTADO = 5  # avisos por página de /listado-avisos
+
+def preparar_datos(cantidad, semilla):
+    """Asegurar el esquema, región/comuna y al menos ``cantidad`` avisos"""
+    from app.services import crear_esquema, generar_avisos, sembrar_region_comuna
+    crear_esquema()
+    sembrar_region_comuna()
+    existentes = db.session.scalar(select(func.count()).select_from(AvisoAdopcion))
+    if existentes < cantidad:
+        generar_avisos(cantidad - existentes, semilla)
+    return max(existentes, cantidad)
+
+def escenarios(total_avisos):
+    """(nombre, url) de cada escenario; las páginas profundas dependen del volumen"""
+    ultima_pagina = max(1, -(-total_avisos // PER_PAGE_LISTADO))
+    aviso_medio = db.session.scalar(
+        select(AvisoAdopcion.id).order_by(AvisoAdopcion.id).offset(total_avisos // 2).limit(1)
+    ) or 1
+    region_id = db.session.scalar(select(func.min(Region.id))) or 1
+    pagina_api_profunda = max(1, total_avisos // 20)
+    from app.services import artefacto_referencia
+    return [
+        ('index', '/'),
+        ('listado_pagina_1', '/listado-avisos?page=1'),
+        ('listado_pagina_profunda', f'/listado-avisos?page={ultima_pagina}'),
+        ('estadisticas', '/estadisticas'),
+        ('api_comunas', f'/api/comunas/{region_id}'),
+        ('api_regiones', '/api/regiones'),
+        ('api_referencia', '/api/referencia'),
+        ('api_referencia_artefacto', f'/api/referencia/region-comuna.{artefacto_referencia.hash}.json'),
+        ('api_aviso', f'/api/aviso/{aviso_medio}'),
+        ('api_avisos', '/api/avisos'),
+        ('api_avisos_filtros', '/api/avisos?tipo=perro&edad_max=2&edad_unidad=a&con_fotos=1'),
+        ('api_avisos_pagina_profunda', f'/api/avisos?page={pagina_api_profunda}&per_page=20'),
+        ('api_estadisticas', '/api/estadisticas'),
+        ('api_estadisticas_serie', '/api/estadisticas/serie?intervalo=mes'),
+        ('api_avisos_search', '/api/avisos/search?q=labrador+vacunado'),
+        ('api_avisos_search_tipo', '/api/avisos/search?q=perros+tranquilos+en+santiago'),
+        ('api_avisos_batch', f"/api/avisos/batch?ids={','.join(str(aviso_medio + i) for i in range(PER_PAGE_LISTADO))}"),
+        ('api_avisos_export', '/api/avisos/export?incluir=fotos,contactos'),
+    ]
+
+def endpoints_sin_cubrir(app, lista):
+    """Endpoints GET de la API que ningún escenario ejercita"""
+    adaptador = app.url_map.bind('localhost')
+    cubiertos = {adaptador.match(url.split('?')[0])[0] for _, url in lista}
+    return sorted(
+        regla.endpoint for regla in app.url_map.iter_rules()
+        if regla.endpoint.startswith('api.') and 'GET' in regla.methods
+        and regla.endpoint not in cubiertos
+    )
+
+def percentiles(muestras):
+    """p50/p95/p99 (en ms) con interpolación sobre las muestras"""
+    if len(muestras) == 1:
+        return {'p50_ms': muestras[0], 'p95_ms': muestras[0], 'p99_ms': muestras[0]}
+    cortes = statistics.quantiles(muestras, n=100, method='inclusive')
+    return {'p50_ms': cortes[49], 'p95_ms': cortes[94], 'p99_ms': cortes[98]}
+
+def medir(cliente, url, repeticiones, calentamiento, contador, encabezados=None):
+    """Ejecutar un escenario y devolver sus métricas"""
+    for _ in range(calentamiento):
+        cliente.get(url, headers=encabezados).get_data()
+    tiempos = []
+    consultas = []
+    estados = set()
+    for _ in range(repeticiones):
+        contador[0] = 0
+        inicio = time.perf_counter()
+        respuesta = cliente.get(url, headers=encabezados)
+        respuesta.get_data()  # consumir respuestas en streaming
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+        consultas.append(contador[0])
+        estados.add(respuesta.status_code)
+    resultado = {'url': url, 'estados': sorted(estados)}
+    resultado.update({clave: round(valor, 3) for clave, valor in percentiles(tiempos).items()})
+    resultado['media_ms'] = round(statistics.fmean(tiempos), 3)
+    resultado['consultas_por_peticion'] = round(statistics.fmean(consultas), 2)
+    return resultado
+
+def comparar(actual, base, tolerancia):
+    """Regresiones de p95 (sobre la tolerancia relativa) o de consultas por petición"""
+    regresiones = []
+    for nombre, medicion in actual['escenarios'].items():
+        anterior = base['escenarios'].get(nombre)
+        if anterior is None:
+            continue
+        if medicion['p95_ms'] > anterior['p95_ms'] * (1 + tolerancia):
+            regresiones.append(f"{nombre}: p95 {anterior['p95_ms']:.2f} -> {medicion['p95_ms']:.2f} ms")
+        if medicion['consultas_por_peticion'] > anterior['consultas_por_peticion']:
+            regresiones.append(
+                f"{nombre}: consultas {anterior['consultas_por_peticion']} -> {medicion['consultas_por_peticion']}"
+            )
+    return regresiones
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--config', default=os.environ.get('FLASK_ENV', 'testing'),
+                        help='Configuración de la app (por defecto testing: SQLite en memoria)')
+    parser.add_argument('--avisos', type=int, default=2000, help='Avisos mínimos en la base de datos')
+    parser.add_argument('--semilla', type=int, default=0, help='Semilla del generador de datos')
+    parser.add_argument('--repeticiones', type=int, default=50, help='Peticiones medidas por escenario')
+    parser.add_argument('--calentamiento', type=int, default=3, help='Peticiones previas no medidas')
+    parser.add_argument('--solo', default='', help='Escenarios a ejecutar, separados por coma')
+    parser.add_argument('--salida', help='Archivo JSON de resultados (por defecto benchmarks/resultados/<fecha>.json)')
+    parser.add_argument('--accept-encoding', default='',
+                        help='Accept-Encoding de las peticiones (p. ej. "gzip, br" para medir la compresión)')
+    parser.add_argument('--comparar', help='JSON de una corrida anterior para detectar regresiones')
+    parser.add_argument('--tolerancia', type=float, default=0.2, help='Aumento relativo de p95 tolerado')
+    args = parser.parse_args()
+
+    app = create_app(args.config)
+    contador = [0]
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute',
+                         lambda *a, **k: contador.__setitem__(0, contador[0] + 1))
+        total = preparar_datos(args.avisos, args.semilla)
+        lista = escenarios(total)
+        faltantes = endpoints_sin_cubrir(app, lista)
+
+    if faltantes:
+        print(f"Advertencia: endpoints GET sin escenario: {', '.join(faltantes)}", file=sys.stderr)
+    if args.solo:
+        elegidos = set(args.solo.split(','))
+        lista = [(nombre, url) for nombre, url in lista if nombre in elegidos]
+
+    cliente = app.test_client()
+    resultados = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'config': args.config,
+        'motor': app.config['SQLALCHEMY_DATABASE_URI'].split(':', 1)[0],
+        'python': platform.python_version(),
+        'avisos': total,
+        'repeticiones': args.repeticiones,
+        'accept_encoding': args.accept_encoding,
+        'escenarios': {},
+    }
+    print(f"{'escenario':<28} {'p50':>9} {'p95':>9} {'p99':>9} {'consultas':>10}")
+    for nombre, url in lista:
+        medicion = medir(cliente, url, args.repeticiones, args.calentamiento, contador,
+                         {'Accept-Encoding': args.accept_encoding} if args.accept_encoding else None)
+        resultados['escenarios'][nombre] = medicion
+        print(f"{nombre:<28} {medicion['p50_ms']:>7.2f}ms {medicion['p95_ms']:>7.2f}ms "
+              f"{medicion['p99_ms']:>7.2f}ms {medicion['consultas_por_peticion']:>10}")
+
+    salida = args.salida or os.path.join(
+        RAIZ, 'benchmarks', 'resultados', f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    with open(salida, 'w', encoding='utf-8') as archivo:
+        json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+    print(f'Resultados guardados en {salida}')
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as archivo:
+            regresiones = comparar(resultados, json.load(archivo), args.tolerancia)
+        for regresion in regresiones:
+            print(f'REGRESIÓN {regresion}')
+        if regresiones:
+            sys.exit(1)
+        print('Sin regresiones respecto de la corrida base.')
+
+if __name__ == '__main__':
+    main()
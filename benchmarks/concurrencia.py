@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Escalamiento con la concurrencia a un número fijo de workers: WSGI vs ASGI.
+
+Levanta cada servidor en un subproceso (gunicorn con ``app:create_app()`` y uvicorn
+con ``asgi:app``, ambos con ``--workers`` workers), le envía peticiones
+desde N clientes simultáneos (hilos con conexiones keep-alive) y reporta
+peticiones por segundo y p50/p95 por nivel de concurrencia. Con consultas
+lentas el modo WSGI se estanca en ``workers`` peticiones a la vez; el modo
+ASGI debería seguir escalando.
+
+Ambos servidores usan la misma base de datos (variables de entorno / .env),
+que debe tener datos (``flask db init && flask db seed && flask datos generar``).
+
+Uso:
+    python benchmarks/concurrencia.py --workers 2 --concurrencia 1 8 32 64
+    python benchmarks/concurrencia.py --modos asgi --url "/api/avisos?per_page=50&total=exacto"
+    python benchmarks/concurrencia.py --condicional   # If-None-Match: mide las respuestas 304
+"""
+
+import argparse
+import http.client
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Comando de cada modo; se completa con host, puerto y workers
+SERVIDORES = {
+    'wsgi': 'gunicorn --workers {workers} --bind {host}:{puerto} app:create_app()',
+    'asgi': 'uvicorn asgi:app --workers {workers} --host {host} --port {puerto} --no-access-log',
+}
+
+def esperar_servidor(host, puerto, proceso, espera):
+    """Esperar a que el servidor acepte conexiones (o falle al arrancar)"""
+    limite = time.monotonic() + espera
+    while time.monotonic() < limite:
+        if proceso.poll() is not None:
+            raise RuntimeError(f'el servidor terminó al arrancar (código {proceso.returncode})')
+        try:
+            conexion = http.client.HTTPConnection(host, puerto, timeout=1)
+            conexion.request('GET', '/api/regiones')
+            conexion.getresponse().read()
+            conexion.close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'el servidor no respondió en {espera} s')
+
+def cliente(host, puerto, url, limite, tiempos, errores, encabezados):
+    """Enviar peticiones en una conexión keep-alive hasta ``limite``"""
+    esperado = 304 if 'If-None-Match' in encabezados else 200
+    conexion = http.client.HTTPConnection(host, puerto, timeout=30)
+    while time.monotonic() < limite:
+        inicio = time.perf_counter()
+        try:
+            conexion.request('GET', url, headers=encabezados)
+            respuesta = conexion.getresponse()
+            respuesta.read()
+            if respuesta.status != esperado:
+                errores.append(respuesta.status)
+                continue
+        except (OSError, http.client.HTTPException) as e:
+            errores.append(type(e).__name__)
+            conexion.close()
+            conexion = http.client.HTTPConnection(host, puerto, timeout=30)
+            continue
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    conexion.close()
+
+def etag(host, puerto, url):
+    """ETag de la respuesta actual (para enviarlo en If-None-Match)"""
+    conexion = http.client.HTTPConnection(host, puerto, timeout=30)
+    conexion.request('GET', url)
+    respuesta = conexion.getresponse()
+    respuesta.read()
+    conexion.close()
+    if respuesta.getheader('ETag') is None:
+        raise RuntimeError(f'{url} no envía ETag')
+    return respuesta.getheader('ETag')
+
+def medir(host, puerto, url, concurrencia, duracion, encabezados=None):
+    """Carga con ``concurrencia`` clientes durante ``duracion`` segundos"""
+    tiempos, errores = [], []  # list.append es atómico entre hilos
+    limite = time.monotonic() + duracion
+    hilos = [
+        threading.Thread(target=cliente, args=(host, puerto, url, limite, tiempos, errores, encabezados or {}))
+        for _ in range(concurrencia)
+    ]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    transcurrido = time.perf_counter() - inicio
+    if len(tiempos) > 1:
+        cortes = statistics.quantiles(tiempos, n=100, method='inclusive')
+        p50, p95 = cortes[49], cortes[94]
+    else:
+        p50 = p95 = tiempos[0] if tiempos else 0.0
+    return {
+        'peticiones_s': len(tiempos) / transcurrido,
+        'p50_ms': p50,
+        'p95_ms': p95,
+        'errores': len(errores),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--modos', nargs='+', choices=sorted(SERVIDORES), default=['wsgi', 'asgi'])
+    parser.add_argument('--workers', type=int, default=2, help='Workers de cada servidor (fijo)')
+    parser.add_argument('--concurrencia', type=int, nargs='+', default=[1, 8, 32, 64],
+                        help='Clientes simultáneos de cada nivel')
+    parser.add_argument('--duracion', type=float, default=10, help='Segundos de carga por nivel')
+    parser.add_argument('--url', default='/api/avisos?per_page=20', help='Endpoint a medir')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--espera', type=float, default=30, help='Segundos máximos de arranque del servidor')
+    parser.add_argument('--condicional', action='store_true',
+                        help='Enviar If-None-Match con el ETag de la respuesta (mide el 304 sin la consulta)')
+    args = parser.parse_args()
+
+    resultados = {}
+    for modo in args.modos:
+        comando = SERVIDORES[modo].format(workers=args.workers, host=args.host, puerto=args.puerto).split()
+        proceso = subprocess.Popen(comando, cwd=RAIZ, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            esperar_servidor(args.host, args.puerto, proceso, args.espera)
+            encabezados = {'If-None-Match': etag(args.host, args.puerto, args.url)} if args.condicional else {}
+            medir(args.host, args.puerto, args.url, args.workers, 1, encabezados)  # calentamiento
+            resultados[modo] = {
+                nivel: medir(args.host, args.puerto, args.url, nivel, args.duracion, encabezados)
+                for nivel in args.concurrencia
+            }
+        finally:
+            proceso.terminate()
+            proceso.wait()
+
+    print(f"{args.url} con {args.workers} worker(s){' (If-None-Match)' if args.condicional else ''}")
+    print(f"{'modo':<6} {'clientes':>8} {'pet/s':>10} {'p50':>10} {'p95':>10} {'errores':>8}")
+    for modo, niveles in resultados.items():
+        for nivel, medicion in niveles.items():
+            print(f"{modo:<6} {nivel:>8} {medicion['peticiones_s']:>10.1f} {medicion['p50_ms']:>8.2f}ms "
+                  f"{medicion['p95_ms']:>8.2f}ms {medicion['errores']:>8}")
+    if any(medicion['errores'] for niveles in resultados.values() for medicion in niveles.values()):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Throughput de validar_lote: filas por segundo al validar un lote de importación.
+
+Genera filas como las de un CSV importado (todo texto, emails distintos, una
+de cada diez con errores) y mide validar_lote sobre el lote completo, con el
+recolector de ciclos activo como en producción. Termina con código 1 si la
+mediana queda bajo el objetivo.
+
+Uso:
+    python benchmarks/validacion.py --filas 100000 --objetivo 100000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from app import create_app  # noqa: E402
+from app.services import crear_esquema, sembrar_region_comuna, validar_lote, referencia  # noqa: E402
+
+def generar_filas(cantidad, comuna_id):
+    """Filas de importación; una de cada diez tiene errores en varios campos"""
+    filas = []
+    for i in range(cantidad):
+        fila = {
+            'nombre': f'Persona {i}', 'email': f'persona{i}@correo.cl', 'celular': f'+569.{i % 10 ** 8:08d}',
+            'comuna_id': str(comuna_id), 'sector': 'Centro', 'tipo': 'gato' if i % 2 else 'perro',
+            'descripcion': 'Cariñoso y vacunado', 'fecha_entrega': '2027-05-01', 'cantidad': str(i % 3 + 1),
+            'edad': str(i % 12 + 1), 'unidad_medida': 'm', 'contactos': [['whatsapp', f'+569{i:08d}']],
+        }
+        if i % 10 == 0:
+            fila.update(email='sin-arroba', tipo='loro', cantidad='1e400', comuna_id='x')
+        filas.append(fila)
+    return filas
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--filas', type=int, default=100000, help='Filas por lote')
+    parser.add_argument('--repeticiones', type=int, default=5, help='Lotes medidos')
+    parser.add_argument('--objetivo', type=float, default=100000,
+                        help='Mínimo de filas/s para la mediana (0 para solo medir)')
+    args = parser.parse_args()
+
+    app = create_app('testing')
+    with app.app_context():
+        crear_esquema()
+        sembrar_region_comuna()
+        comuna_id = next(iter(referencia.datos['comunas_por_id']))
+        filas = generar_filas(args.filas, comuna_id)
+        validar_lote(filas[:1000])  # calentar caches (referencia, patrones)
+        tasas = []
+        for _ in range(args.repeticiones):
+            inicio = time.perf_counter()
+            resultados = validar_lote(filas)
+            tasas.append(args.filas / (time.perf_counter() - inicio))
+            del resultados
+
+    mediana = statistics.median(tasas)
+    print(f'validar_lote: {mediana:,.0f} filas/s (mediana de {args.repeticiones} lotes de {args.filas:,}; '
+          f'mín {min(tasas):,.0f}, máx {max(tasas):,.0f})')
+    if mediana < args.objetivo:
+        print(f'FALLA {mediana:,.0f} filas/s bajo el objetivo de {args.objetivo:,.0f}')
+        sys.exit(1)
+    print('Dentro del objetivo.')
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,12 @@
 """
 Configuraciones de la aplicación Flask - Completamente parametrizables
 Todas las configuraciones se obtienen de variables de entorno para máxima portabilidad
+
+El archivo .env lo carga create_app antes de importar este módulo (los
+scripts que lo importen directamente deben llamar a load_dotenv primero).
 """
 
 import os
-from dotenv import load_dotenv
-
-# Cargar variables de entorno desde archivo .env si existe
-load_dotenv()
 
 class Config:
     """Configuración base de la aplicación - Valores por defecto seguros"""
@@ -22,12 +21,92 @@ class Config:
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', 'static/uploads')
     MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))  # 16MB por defecto
     
+    # max-age de las fotos direccionadas por contenido (inmutables), 1 año por defecto
+    MEDIA_MAX_AGE = int(os.environ.get('MEDIA_MAX_AGE', 365 * 24 * 3600))
+    
+    # Procesamiento de imágenes en segundo plano (0 hilos = procesar en línea)
+    IMAGENES_WORKERS = int(os.environ.get('IMAGENES_WORKERS', 2))
+    IMAGEN_MINIATURA_MAX = int(os.environ.get('IMAGEN_MINIATURA_MAX', 200))  # px, lado mayor
+    IMAGEN_WEBP_MAX = int(os.environ.get('IMAGEN_WEBP_MAX', 1600))
+    IMAGEN_WEBP_CALIDAD = int(os.environ.get('IMAGEN_WEBP_CALIDAD', 80))
+    
+    # Segundos que se reutiliza un total aproximado en listados paginados por cursor
+    TOTAL_CACHE_TTL = int(os.environ.get('TOTAL_CACHE_TTL', 60))
+    
+    # Cache-Control (max-age en segundos) de la API de solo lectura
+    API_CACHE_MAX_AGE_REFERENCIA = int(os.environ.get('API_CACHE_MAX_AGE_REFERENCIA', 86400))
+    API_CACHE_MAX_AGE_AVISO = int(os.environ.get('API_CACHE_MAX_AGE_AVISO', 300))
+    API_CACHE_MAX_AGE_LISTADOS = int(os.environ.get('API_CACHE_MAX_AGE_LISTADOS', 30))
+    API_CACHE_MAX_AGE_ESTADISTICAS = int(os.environ.get('API_CACHE_MAX_AGE_ESTADISTICAS', 15))
+    
+    # Límite de per_page en /api/avisos y tamaño de lote de la exportación masiva
+    API_MAX_PER_PAGE = int(os.environ.get('API_MAX_PER_PAGE', 100))
+    EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 1000))
+    
+    # Importación masiva: filas por lote y token Bearer de /api/avisos/import
+    # (sin token configurado el endpoint queda deshabilitado)
+    IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', 500))
+    API_IMPORT_TOKEN = os.environ.get('API_IMPORT_TOKEN')
+    
+    # Segundos que cada worker reutiliza los agregados de /api/estadisticas
+    ESTADISTICAS_CACHE_TTL = int(os.environ.get('ESTADISTICAS_CACHE_TTL', 15))
+    
+    # Cache de páginas renderizadas (portada y listado): memoria | redis | ninguno
+    PAGINAS_CACHE_BACKEND = os.environ.get('PAGINAS_CACHE_BACKEND', 'memoria')
+    PAGINAS_CACHE_URL = os.environ.get('PAGINAS_CACHE_URL', 'redis://localhost:6379/0')
+    PAGINAS_CACHE_TTL = int(os.environ.get('PAGINAS_CACHE_TTL', 300))
+    PAGINAS_CACHE_MAX = int(os.environ.get('PAGINAS_CACHE_MAX', 512))  # páginas por worker (memoria)
+    # Rechazar el backend en memoria (contador de versión por worker)
+    PAGINAS_CACHE_SOLO_COMPARTIDO = os.environ.get('PAGINAS_CACHE_SOLO_COMPARTIDO', 'false').lower() == 'true'
+    
+    # Compresión gzip/brotli de respuestas dinámicas (HTML, JSON, CSV) sobre el umbral;
+    # los assets compilados (`flask estaticos compilar`) se sirven precomprimidos
+    COMPRESION = os.environ.get('COMPRESION', 'true').lower() == 'true'
+    COMPRESION_MIN_BYTES = int(os.environ.get('COMPRESION_MIN_BYTES', 1024))
+    COMPRESION_NIVEL_GZIP = int(os.environ.get('COMPRESION_NIVEL_GZIP', 6))
+    COMPRESION_NIVEL_BR = int(os.environ.get('COMPRESION_NIVEL_BR', 4))
+    
+    # Perfilado por petición (Server-Timing, log de peticiones lentas y /metrics)
+    PERFILADO = os.environ.get('PERFILADO', 'false').lower() == 'true'
+    PERFILADO_UMBRAL_LENTO_MS = int(os.environ.get('PERFILADO_UMBRAL_LENTO_MS', 500))
+    PERFILADO_CONSULTAS_LOG = int(os.environ.get('PERFILADO_CONSULTAS_LOG', 5))  # consultas más lentas en el log
+    PERFILADO_RUTA_METRICAS = os.environ.get('PERFILADO_RUTA_METRICAS', '/metrics')
+    
     # Parámetros de base de datos - Sin valores hardcodeados
     DB_HOST = os.environ.get('DB_HOST', 'localhost')
     DB_PORT = int(os.environ.get('DB_PORT', 3306))
     DB_USER = os.environ.get('DB_USER', 'cc5002')
     DB_PASSWORD = os.environ.get('DB_PASSWORD', 'programacionweb')
     DB_NAME = os.environ.get('DB_NAME', 'tarea2')
+    
+    # Pool de conexiones - Evita "MySQL server has gone away" y tormentas de conexiones
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))        # segundos esperando conexión libre
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 280))       # menor que wait_timeout de MySQL
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true'
+    DB_CONNECT_TIMEOUT = int(os.environ.get('DB_CONNECT_TIMEOUT', 10))
+    
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_recycle': DB_POOL_RECYCLE,
+        'pool_pre_ping': DB_POOL_PRE_PING,
+        'connect_args': {'connect_timeout': DB_CONNECT_TIMEOUT}
+    }
+    
+    # Crear las tablas que falten al iniciar (una consulta por tabla en cada worker y
+    # en cada comando flask); en producción el esquema se crea con `flask db init`
+    CREAR_TABLAS_AL_INICIAR = os.environ.get('CREAR_TABLAS_AL_INICIAR', 'true').lower() == 'true'
+    
+    # Réplica de lectura opcional: las vistas de solo lectura consultan este bind
+    DB_REPLICA_URL = os.environ.get('DB_REPLICA_URL')
+    SQLALCHEMY_BINDS = {'replica': DB_REPLICA_URL} if DB_REPLICA_URL else {}
+    
+    # Modo ASGI (asgi.py): URL con driver asíncrono; por defecto se deriva de la
+    # réplica o de la base principal (mysql+pymysql → mysql+aiomysql)
+    DB_ASYNC_URL = os.environ.get('DB_ASYNC_URL')
 
 class DevelopmentConfig(Config):
     """
@@ -52,6 +131,15 @@ class ProductionConfig(Config):
     """
     DEBUG = False
     
+    # Sin verificación de esquema al iniciar: los workers no abren conexiones
+    # hasta la primera petición
+    CREAR_TABLAS_AL_INICIAR = os.environ.get('CREAR_TABLAS_AL_INICIAR', 'false').lower() == 'true'
+    
+    # Sin cache de páginas salvo que se configure redis (pip install redis): el de
+    # memoria no se admite porque su contador de versión es por worker
+    PAGINAS_CACHE_BACKEND = os.environ.get('PAGINAS_CACHE_BACKEND', 'ninguno')
+    PAGINAS_CACHE_SOLO_COMPARTIDO = os.environ.get('PAGINAS_CACHE_SOLO_COMPARTIDO', 'true').lower() == 'true'
+    
     # Preferir DATABASE_URL completa (común en servicios cloud)
     # Fallback a construcción desde componentes individuales
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
@@ -67,6 +155,16 @@ class TestConfig(Config):
     
     # SQLite en memoria para tests rápidos, configurable para tests de integración
     SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL', 'sqlite:///:memory:')
+    
+    # SQLite usa su propio pool (sin pool_size ni connect_timeout) y no tiene réplica
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    SQLALCHEMY_BINDS = {}
+    
+    # Procesar imágenes en línea para resultados deterministas
+    IMAGENES_WORKERS = 0
+    
+    # Cada test ve los datos recién insertados
+    PAGINAS_CACHE_BACKEND = 'ninguno'
 
 # Mapeo de configuraciones - Selección automática según FLASK_ENV
 config = {
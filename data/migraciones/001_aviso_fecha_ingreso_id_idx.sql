@@ -0,0 +1,4 @@
+-- Índice compuesto para el orden de los listados y la paginación por cursor
+-- Aplicar sobre bases creadas antes de su incorporación en tarea2.sql
+ALTER TABLE `aviso_adopcion`
+  ADD INDEX `aviso_fecha_ingreso_id_idx` (`fecha_ingreso` ASC, `id` ASC);
@@ -0,0 +1,19 @@
+-- Resumen precalculado de avisos por comuna y tipo para /estadisticas
+CREATE TABLE IF NOT EXISTS `estadistica_comuna` (
+  `comuna_id` INT NOT NULL,
+  `tipo` ENUM('gato', 'perro') NOT NULL,
+  `total` INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (`comuna_id`, `tipo`),
+  CONSTRAINT `fk_estadistica_comuna1`
+    FOREIGN KEY (`comuna_id`)
+    REFERENCES `comuna` (`id`)
+    ON DELETE NO ACTION
+    ON UPDATE NO ACTION)
+ENGINE = InnoDB;
+
+-- Poblar con los avisos existentes (equivale a `flask estadisticas reconstruir`)
+INSERT INTO `estadistica_comuna` (`comuna_id`, `tipo`, `total`)
+SELECT `comuna_id`, `tipo`, COUNT(`id`)
+FROM `aviso_adopcion`
+GROUP BY `comuna_id`, `tipo`
+ON DUPLICATE KEY UPDATE `total` = VALUES(`total`);
@@ -0,0 +1,6 @@
+-- Variantes de imagen generadas en segundo plano (miniatura y WebP)
+ALTER TABLE `foto`
+  ADD COLUMN `ruta_miniatura` VARCHAR(300) NULL AFTER `actividad_id`,
+  ADD COLUMN `ruta_webp` VARCHAR(300) NULL AFTER `ruta_miniatura`;
+
+-- Las fotos existentes se procesan con `flask imagenes procesar`
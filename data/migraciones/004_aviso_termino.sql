@@ -0,0 +1,15 @@
+-- Índice invertido para la búsqueda de avisos (/api/avisos/search)
+CREATE TABLE IF NOT EXISTS `aviso_termino` (
+  `termino` VARCHAR(64) NOT NULL,
+  `aviso_id` INT NOT NULL,
+  `peso` SMALLINT NOT NULL DEFAULT 1,
+  PRIMARY KEY (`termino`, `aviso_id`),
+  INDEX `fk_aviso_termino_aviso1_idx` (`aviso_id` ASC),
+  CONSTRAINT `fk_aviso_termino_aviso1`
+    FOREIGN KEY (`aviso_id`)
+    REFERENCES `aviso_adopcion` (`id`)
+    ON DELETE NO ACTION
+    ON UPDATE NO ACTION)
+ENGINE = InnoDB;
+
+-- Poblar con los avisos existentes: `flask busqueda reindexar`
@@ -0,0 +1,14 @@
+-- Edad normalizada a meses y los índices que usan los filtros de /api/avisos
+ALTER TABLE `aviso_adopcion`
+  ADD COLUMN `edad_meses` INT NULL AFTER `unidad_medida`;
+
+UPDATE `aviso_adopcion`
+SET `edad_meses` = IF(`unidad_medida` = 'a', `edad` * 12, `edad`)
+WHERE `edad_meses` IS NULL;
+
+ALTER TABLE `aviso_adopcion`
+  ADD INDEX `aviso_tipo_fecha_ingreso_idx` (`tipo` ASC, `fecha_ingreso` ASC, `id` ASC),
+  ADD INDEX `aviso_comuna_fecha_ingreso_idx` (`comuna_id` ASC, `fecha_ingreso` ASC, `id` ASC),
+  ADD INDEX `aviso_fecha_entrega_idx` (`fecha_entrega` ASC),
+  ADD INDEX `aviso_edad_meses_idx` (`edad_meses` ASC),
+  ADD INDEX `aviso_cantidad_idx` (`cantidad` ASC);
@@ -0,0 +1,7 @@
+-- Huella de los archivos de datos iniciales (flask db seed omite los ya cargados)
+CREATE TABLE IF NOT EXISTS `carga_datos` (
+  `archivo` VARCHAR(100) NOT NULL,
+  `checksum` CHAR(64) NOT NULL,
+  `cargado_en` DATETIME NOT NULL,
+  PRIMARY KEY (`archivo`))
+ENGINE = InnoDB;
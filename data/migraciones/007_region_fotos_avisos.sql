@@ -0,0 +1,18 @@
+-- Región y presencia de fotos derivadas en el aviso: los filtros region_id y
+-- con_fotos usan un índice con el orden del listado en vez de recorrerlo
+ALTER TABLE `aviso_adopcion`
+  ADD COLUMN `region_id` INT NULL AFTER `comuna_id`,
+  ADD COLUMN `tiene_fotos` TINYINT(1) NOT NULL DEFAULT 0 AFTER `edad_meses`;
+
+UPDATE `aviso_adopcion` a
+JOIN `comuna` c ON c.`id` = a.`comuna_id`
+SET a.`region_id` = c.`region_id`
+WHERE a.`region_id` IS NULL;
+
+UPDATE `aviso_adopcion` a
+SET a.`tiene_fotos` = 1
+WHERE EXISTS (SELECT 1 FROM `foto` f WHERE f.`actividad_id` = a.`id`);
+
+ALTER TABLE `aviso_adopcion`
+  ADD INDEX `aviso_region_fecha_ingreso_idx` (`region_id` ASC, `fecha_ingreso` ASC, `id` ASC),
+  ADD INDEX `aviso_tiene_fotos_fecha_ingreso_idx` (`tiene_fotos` ASC, `fecha_ingreso` ASC, `id` ASC);
@@ -0,0 +1,3 @@
+-- 'gato' y 'perro' dejan de ser términos del índice de búsqueda: la consulta
+-- los aplica como filtro sobre aviso_adopcion.tipo (aviso_tipo_fecha_ingreso_idx)
+DELETE FROM `aviso_termino` WHERE `termino` IN ('gato', 'perro');
@@ -0,0 +1,4 @@
+-- Orden de la búsqueda por puntaje: recorrer cada término con un peso dado
+-- en orden de aviso_id (ver app/services/busqueda.py)
+ALTER TABLE `aviso_termino`
+  ADD INDEX `aviso_termino_peso_idx` (`termino` ASC, `peso` ASC, `aviso_id` ASC);
@@ -48,6 +48,7 @@ CREATE TABLE IF NOT EXISTS `tarea2`.`aviso_adopcion` (
   `id` INT NOT NULL AUTO_INCREMENT,
   `fecha_ingreso` DATETIME NOT NULL,
   `comuna_id` INT NOT NULL,
+  `region_id` INT NULL,
   `sector` VARCHAR(100) NULL,
   `nombre` VARCHAR(200) NOT NULL,
   `email` VARCHAR(100) NOT NULL,
@@ -56,10 +57,20 @@ CREATE TABLE IF NOT EXISTS `tarea2`.`aviso_adopcion` (
   `cantidad` INT NOT NULL,
   `edad` INT NOT NULL,
   `unidad_medida` ENUM('a', 'm') NOT NULL,
+  `edad_meses` INT NULL,
+  `tiene_fotos` TINYINT(1) NOT NULL DEFAULT 0,
   `fecha_entrega` DATETIME NOT NULL,
   `descripcion` TEXT(500) NULL,
   PRIMARY KEY (`id`),
   INDEX `fk_aviso_comuna1_idx` (`comuna_id` ASC),
+  INDEX `aviso_fecha_ingreso_id_idx` (`fecha_ingreso` ASC, `id` ASC),
+  INDEX `aviso_tipo_fecha_ingreso_idx` (`tipo` ASC, `fecha_ingreso` ASC, `id` ASC),
+  INDEX `aviso_comuna_fecha_ingreso_idx` (`comuna_id` ASC, `fecha_ingreso` ASC, `id` ASC),
+  INDEX `aviso_region_fecha_ingreso_idx` (`region_id` ASC, `fecha_ingreso` ASC, `id` ASC),
+  INDEX `aviso_tiene_fotos_fecha_ingreso_idx` (`tiene_fotos` ASC, `fecha_ingreso` ASC, `id` ASC),
+  INDEX `aviso_fecha_entrega_idx` (`fecha_entrega` ASC),
+  INDEX `aviso_edad_meses_idx` (`edad_meses` ASC),
+  INDEX `aviso_cantidad_idx` (`cantidad` ASC),
   CONSTRAINT `fk_aviso_comuna1`
     FOREIGN KEY (`comuna_id`)
     REFERENCES `tarea2`.`comuna` (`id`)
@@ -76,6 +87,8 @@ CREATE TABLE IF NOT EXISTS `tarea2`.`foto` (
   `ruta_archivo` VARCHAR(300) NOT NULL,
   `nombre_archivo` VARCHAR(300) NOT NULL,
   `actividad_id` INT NOT NULL,
+  `ruta_miniatura` VARCHAR(300) NULL,
+  `ruta_webp` VARCHAR(300) NULL,
   PRIMARY KEY (`id`, `actividad_id`),
   INDEX `fk_foto_aviso1_idx` (`actividad_id` ASC),
   CONSTRAINT `fk_foto_aviso1`
@@ -104,6 +117,54 @@ CREATE TABLE IF NOT EXISTS `tarea2`.`contactar_por` (
 ENGINE = InnoDB;
 
 
+-- -----------------------------------------------------
+-- Table `tarea2`.`estadistica_comuna`
+-- Resumen precalculado de avisos por comuna y tipo
+-- -----------------------------------------------------
+CREATE TABLE IF NOT EXISTS `tarea2`.`estadistica_comuna` (
+  `comuna_id` INT NOT NULL,
+  `tipo` ENUM('gato', 'perro') NOT NULL,
+  `total` INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (`comuna_id`, `tipo`),
+  CONSTRAINT `fk_estadistica_comuna1`
+    FOREIGN KEY (`comuna_id`)
+    REFERENCES `tarea2`.`comuna` (`id`)
+    ON DELETE NO ACTION
+    ON UPDATE NO ACTION)
+ENGINE = InnoDB;
+
+
+-- -----------------------------------------------------
+-- Table `tarea2`.`aviso_termino`
+-- Índice invertido para la búsqueda de avisos
+-- -----------------------------------------------------
+CREATE TABLE IF NOT EXISTS `tarea2`.`aviso_termino` (
+  `termino` VARCHAR(64) NOT NULL,
+  `aviso_id` INT NOT NULL,
+  `peso` SMALLINT NOT NULL DEFAULT 1,
+  PRIMARY KEY (`termino`, `aviso_id`),
+  INDEX `fk_aviso_termino_aviso1_idx` (`aviso_id` ASC),
+  INDEX `aviso_termino_peso_idx` (`termino` ASC, `peso` ASC, `aviso_id` ASC),
+  CONSTRAINT `fk_aviso_termino_aviso1`
+    FOREIGN KEY (`aviso_id`)
+    REFERENCES `tarea2`.`aviso_adopcion` (`id`)
+    ON DELETE NO ACTION
+    ON UPDATE NO ACTION)
+ENGINE = InnoDB;
+
+
+-- -----------------------------------------------------
+-- Table `tarea2`.`carga_datos`
+-- Huella de los archivos de datos iniciales ya cargados
+-- -----------------------------------------------------
+CREATE TABLE IF NOT EXISTS `tarea2`.`carga_datos` (
+  `archivo` VARCHAR(100) NOT NULL,
+  `checksum` CHAR(64) NOT NULL,
+  `cargado_en` DATETIME NOT NULL,
+  PRIMARY KEY (`archivo`))
+ENGINE = InnoDB;
+
+
 SET SQL_MODE=@OLD_SQL_MODE;
 SET FOREIGN_KEY_CHECKS=@OLD_FOREIGN_KEY_CHECKS;
 SET UNIQUE_CHECKS=@OLD_UNIQUE_CHECKS;
@@ -54,14 +54,43 @@ document.addEventListener('DOMContentLoaded', () => {
     const cerrarFoto = document.getElementById('cerrar-foto');
     const fotoGrande = document.getElementById('foto-grande');
 
-    // --- 3. LÓGICA PARA MOSTRAR EL DETALLE ---
+    // --- 3. PRECARGA DEL DETALLE DE LA PÁGINA ---
+    // Pedimos el detalle de todos los avisos visibles en una sola petición,
+    // así el modal se abre sin esperar al servidor.
+    const idsPagina = Array.from(tablaAvisos.querySelectorAll('tr[data-id]'), fila => fila.dataset.id);
+
+    // Convierte la respuesta de la API al formato que usa el modal.
+    const adaptarAviso = (aviso) => ({
+        nombre: aviso.nombre,
+        email: aviso.email,
+        celular: aviso.celular || 'Sin especificar',
+        comuna: [aviso.comuna, aviso.region].filter(Boolean).join(', '),
+        descripcion: aviso.descripcion || '',
+        fotos: aviso.fotos.map(foto => foto.url),
+        contactos: aviso.contactos
+            .filter(contacto => contacto.nombre !== 'otra')
+            .map(contacto => `${contacto.nombre}: ${contacto.identificador}`)
+    });
+
+    const precarga = idsPagina.length === 0 ? Promise.resolve() :
+        fetch(`/api/avisos/batch?ids=${idsPagina.join(',')}`)
+            .then(respuesta => respuesta.ok ? respuesta.json() : { avisos: [] })
+            .then(datos => {
+                datos.avisos.forEach(aviso => {
+                    datosAvisos[aviso.id] = adaptarAviso(aviso);
+                });
+            })
+            .catch(() => {}); // Sin conexión se mantienen los datos de ejemplo.
+
+    // --- 4. LÓGICA PARA MOSTRAR EL DETALLE ---
     // Agregamos un 'listener' al cuerpo de la tabla.
-    tablaAvisos.addEventListener('click', (event) => {
+    tablaAvisos.addEventListener('click', async (event) => {
         // Obtenemos la fila (TR) a la que se le hizo clic.
         const fila = event.target.closest('tr');
         if (!fila) return; // Si no se hizo clic en una fila, no hacemos nada.
 
         const avisoId = fila.dataset.id; // Obtenemos el ID del aviso desde el atributo 'data-id'.
+        await precarga; // Normalmente ya terminó: no hay espera.
         const datos = datosAvisos[avisoId]; // Buscamos los datos correspondientes.
 
         if (datos) {
@@ -70,6 +99,8 @@ document.addEventListener('DOMContentLoaded', () => {
             document.getElementById('detalle-email').textContent = datos.email;
             document.getElementById('detalle-celular').textContent = datos.celular;
             document.getElementById('detalle-comuna').textContent = datos.comuna;
+            document.getElementById('detalle-contactos').textContent =
+                (datos.contactos && datos.contactos.length) ? datos.contactos.join(' · ') : 'Sin especificar';
             document.getElementById('detalle-descripcion').textContent = datos.descripcion;
 
             const galeria = document.getElementById('detalle-fotos');
@@ -91,7 +122,7 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     });
 
-    // --- 4. LÓGICA PARA CERRAR LOS MODALES ---
+    // --- 5. LÓGICA PARA CERRAR LOS MODALES ---
     // Cerrar el modal de detalle al hacer clic en la 'X'.
     cerrarDetalle.addEventListener('click', () => {
         modalDetalle.style.display = 'none';
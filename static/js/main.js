@@ -1,38 +1,42 @@
-// Función para cargar dinámicamente un script
-function cargarScript(src) {
-    return new Promise((resolve, reject) => {
-        const script = document.createElement('script');
-        script.src = src;
-        script.onload = () => resolve();
-        script.onerror = () => reject(new Error(`No se pudo cargar el script: ${src}`));
-        document.head.appendChild(script);
-    });
-}
+// Regiones y comunas indexadas por id ({regiones: {id: {nombre, comunas: [ids]}}, comunas: {id: {nombre, region_id}}}).
+// Se cargan de un solo JSON generado desde la base de datos, con la URL (y el hash) en data-referencia
+let referencia = null;
 
 // Función para cargar las regiones en el select
 async function cargarRegiones() {
-    // Verificar si region_comuna ya está disponible, si no, cargar el script
-    if (typeof region_comuna === 'undefined') {
-        try {
-            await cargarScript('./js/region_comuna.js');
-        } catch (error) {
-            console.error('Error cargando region_comuna.js:', error);
-            return;
+    const selectRegion = document.getElementById('region');
+    if (!selectRegion || !selectRegion.dataset.referencia) {
+        return;
+    }
+    
+    try {
+        const respuesta = await fetch(selectRegion.dataset.referencia);
+        if (!respuesta.ok) {
+            throw new Error(`HTTP ${respuesta.status}`);
         }
+        referencia = await respuesta.json();
+    } catch (error) {
+        // Las regiones ya vienen renderizadas por el servidor; solo faltarán las comunas
+        console.error('Error cargando regiones y comunas:', error);
+        return;
     }
     
-    const selectRegion = document.getElementById('region');
+    const seleccionada = selectRegion.value;
     
     // Limpiar opciones existentes (mantener la primera opción)
     selectRegion.innerHTML = '<option value="">Seleccione una región</option>';
     
-    // Agregar todas las regiones del archivo region_comuna.js
-    region_comuna.regiones.forEach(region => {
+    // Agregar todas las regiones (las claves numéricas se recorren en orden de id)
+    Object.entries(referencia.regiones).forEach(([id, region]) => {
         const option = document.createElement('option');
-        option.value = region.numero;
+        option.value = id;
         option.textContent = region.nombre;
         selectRegion.appendChild(option);
     });
+    selectRegion.value = seleccionada;
+    if (seleccionada) {
+        cargarComunas(seleccionada);
+    }
 }
 
 // Función para cargar las comunas según la región seleccionada
@@ -42,19 +46,15 @@ function cargarComunas(regionSeleccionada) {
     // Limpiar opciones existentes
     selectComuna.innerHTML = '<option value="">Seleccione una comuna</option>';
     
-    if (regionSeleccionada) {
-        // Buscar la región seleccionada
-        const region = region_comuna.regiones.find(r => r.numero == regionSeleccionada);
-        
-        if (region) {
-            // Agregar todas las comunas de la región seleccionada
-            region.comunas.forEach(comuna => {
-                const option = document.createElement('option');
-                option.value = comuna.id;
-                option.textContent = comuna.nombre;
-                selectComuna.appendChild(option);
-            });
-        }
+    const region = referencia && regionSeleccionada ? referencia.regiones[regionSeleccionada] : null;
+    if (region) {
+        // Agregar todas las comunas de la región seleccionada
+        region.comunas.forEach(comunaId => {
+            const option = document.createElement('option');
+            option.value = comunaId;
+            option.textContent = referencia.comunas[comunaId].nombre;
+            selectComuna.appendChild(option);
+        });
     }
 }
 
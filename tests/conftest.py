@@ -0,0 +1,42 @@
+"""
+Fixtures compartidas: la app con TestConfig (SQLite en memoria), con el
+esquema creado y regiones/comunas cargadas, y un registro de las sentencias
+SQL ejecutadas.
+"""
+
+import pytest
+from sqlalchemy import event
+from app import create_app, db
+from app.services import crear_esquema, sembrar_region_comuna, generar_avisos, referencia
+
+@pytest.fixture
+def app():
+    app = create_app('testing')
+    with app.app_context():
+        crear_esquema()
+        sembrar_region_comuna()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+    referencia.invalidar()
+
+@pytest.fixture
+def cliente(app):
+    return app.test_client()
+
+@pytest.fixture
+def avisos(app):
+    """Generar avisos sintéticos: ``avisos(cantidad)``"""
+    def generar(cantidad, semilla=0):
+        return generar_avisos(cantidad, semilla)
+    return generar
+
+@pytest.fixture
+def sentencias(app):
+    """Sentencias SQL ejecutadas en el engine principal (``sentencias.clear()`` para reiniciar)"""
+    registro = []
+    def registrar(conexion, cursor, sentencia, parametros, contexto, executemany):
+        registro.append(sentencia)
+    event.listen(db.engine, 'before_cursor_execute', registrar)
+    yield registro
+    event.remove(db.engine, 'before_cursor_execute', registrar)
@@ -0,0 +1,75 @@
+"""Fotos subidas: fallos al moverlas tras el commit y barrido de huérfanos"""
+
+import io
+import os
+import pytest
+from app.models import AvisoAdopcion, Foto
+from app.routes import main as rutas_main
+from app.services import barrer_huerfanos, preparar_foto
+
+FORMULARIO = {
+    'nombre': 'Ana', 'email': 'a@b.cl', 'region': '1', 'comuna': '10301', 'tipo': 'gato',
+    'descripcion': 'Gatita', 'fecha-entrega': '2027-05-01', 'cantidad': '1', 'edad': '2', 'unidad-edad': 'm',
+}
+
+class Subida:
+    def __init__(self, contenido):
+        self.stream = io.BytesIO(contenido)
+
+@pytest.fixture
+def carpeta(app, tmp_path):
+    app.static_folder = str(tmp_path)
+    return tmp_path
+
+def _enviar(cliente, *contenidos):
+    datos = dict(FORMULARIO, fotos=[(io.BytesIO(c), f'foto{i}.jpg') for i, c in enumerate(contenidos)])
+    return cliente.post('/agregar-aviso', data=datos, content_type='multipart/form-data')
+
+def _temporales(carpeta):
+    return os.listdir(carpeta / 'uploads' / '.tmp')
+
+def test_foto_que_no_se_puede_mover_no_queda_registrada(cliente, carpeta, monkeypatch):
+    confirmar = rutas_main.confirmar_foto
+    def confirmar_o_fallar(preparada, carpeta_static):
+        if preparada.nombre_archivo == 'foto1.jpg':
+            raise OSError('disco lleno')
+        return confirmar(preparada, carpeta_static)
+    monkeypatch.setattr(rutas_main, 'confirmar_foto', confirmar_o_fallar)
+
+    assert _enviar(cliente, b'uno', b'dos').status_code == 302
+    fotos = Foto.query.all()
+    assert [foto.nombre_archivo for foto in fotos] == ['foto0.jpg']
+    assert all((carpeta / foto.ruta_archivo).exists() for foto in fotos)
+    assert AvisoAdopcion.query.one().tiene_fotos
+    assert _temporales(carpeta) == []
+
+def test_sin_fotos_movidas_el_aviso_queda_sin_fotos(cliente, carpeta, monkeypatch):
+    def fallar(preparada, carpeta_static):
+        raise OSError('disco lleno')
+    monkeypatch.setattr(rutas_main, 'confirmar_foto', fallar)
+
+    assert _enviar(cliente, b'uno').status_code == 302
+    assert Foto.query.count() == 0
+    assert not AvisoAdopcion.query.one().tiene_fotos
+
+def test_barrido_recupera_el_temporal_de_una_foto_registrada(carpeta):
+    necesaria = preparar_foto(Subida(b'registrada'), 'a.jpg', str(carpeta))
+    huerfana = preparar_foto(Subida(b'huerfana'), 'b.jpg', str(carpeta))
+    parcial = preparar_foto(Subida(b'registr'), 'c.jpg', str(carpeta))
+
+    eliminados, recuperados = barrer_huerfanos(str(carpeta), {necesaria.ruta}, edad_minima=0, simular=True)
+    assert recuperados == [necesaria.ruta] and len(eliminados) == 2
+    assert len(_temporales(carpeta)) == 3
+
+    eliminados, recuperados = barrer_huerfanos(str(carpeta), {necesaria.ruta}, edad_minima=0)
+    assert recuperados == [necesaria.ruta]
+    assert sorted(eliminados) == sorted(
+        os.path.relpath(p.temporal, carpeta).replace(os.sep, '/') for p in (huerfana, parcial)
+    )
+    assert (carpeta / necesaria.ruta).read_bytes() == b'registrada'
+    assert _temporales(carpeta) == []
+
+def test_barrido_respeta_la_edad_minima(carpeta):
+    preparar_foto(Subida(b'en curso'), 'a.jpg', str(carpeta))
+    assert barrer_huerfanos(str(carpeta), set(), edad_minima=3600) == ([], [])
+    assert len(_temporales(carpeta)) == 1
@@ -0,0 +1,97 @@
+"""Arranque de un worker: presupuesto de tiempo y ninguna conexión en create_app"""
+
+import os
+import statistics
+import pytest
+from sqlalchemy import inspect
+from app import create_app, db
+from benchmarks.arranque import medir
+from config.config import config, TestConfig
+
+PRESUPUESTO_MS = float(os.environ.get('ARRANQUE_PRESUPUESTO_MS', 1000))
+
+@pytest.mark.parametrize('config_name, entorno', [
+    ('testing', {}),
+    ('default', {}),
+    # Tal como arranca gunicorn: sin redis instalado ni variables del cache de páginas
+    ('production', {}),
+])
+def test_arranque_sin_conexiones_y_dentro_del_presupuesto(config_name, entorno):
+    mediciones = [medir(config_name, entorno) for _ in range(3)]
+    assert max(m['conexiones'] for m in mediciones) == 0
+    assert statistics.median(m['total_ms'] for m in mediciones) <= PRESUPUESTO_MS
+
+def test_db_init_informa_las_tablas_creadas(monkeypatch, tmp_path):
+    uri = f'sqlite:///{tmp_path / "nueva.db"}'
+    monkeypatch.setitem(config, 'prueba', type('ConfigPrueba', (TestConfig,), {'SQLALCHEMY_DATABASE_URI': uri}))
+    app = create_app('prueba')
+    with app.app_context():
+        assert inspect(db.engine).get_table_names() == []
+        runner = app.test_cli_runner()
+        primera = runner.invoke(args=['db', 'init'])
+        assert 'aviso_adopcion' in primera.output and 'ninguna' not in primera.output
+        assert 'ninguna (el esquema ya existía)' in runner.invoke(args=['db', 'init']).output
+        db.engine.dispose()
+
+def test_tablas_creadas_en_la_primera_peticion(monkeypatch, tmp_path):
+    uri = f'sqlite:///{tmp_path / "nueva.db"}'
+    monkeypatch.setitem(config, 'prueba', type('ConfigPrueba', (TestConfig,), {'SQLALCHEMY_DATABASE_URI': uri}))
+    app = create_app('prueba')
+    assert app.test_client().get('/api/avisos').status_code == 200
+    with app.app_context():
+        assert 'aviso_adopcion' in inspect(db.engine).get_table_names()
+        db.engine.dispose()
+
+def _base_anterior(monkeypatch, tmp_path):
+    """Base creada antes de las migraciones 003, 005, 007, 008 y 009, con avisos y fotos"""
+    from app.services import crear_esquema, sembrar_region_comuna, generar_avisos
+    uri = f'sqlite:///{tmp_path / "anterior.db"}'
+    monkeypatch.setitem(config, 'prueba', type('ConfigPrueba', (TestConfig,), {'SQLALCHEMY_DATABASE_URI': uri}))
+    app = create_app('prueba')
+    with app.app_context():
+        crear_esquema()
+        sembrar_region_comuna()
+        generar_avisos(30, 0, 30, 2, 1)
+        with db.engine.begin() as conexion:
+            conexion.exec_driver_sql("INSERT INTO aviso_termino (termino, aviso_id, peso) VALUES ('gato', 1, 1)")
+            for indice in ('aviso_tipo_fecha_ingreso_idx', 'aviso_comuna_fecha_ingreso_idx', 'aviso_fecha_entrega_idx',
+                           'aviso_edad_meses_idx', 'aviso_cantidad_idx', 'aviso_region_fecha_ingreso_idx',
+                           'aviso_tiene_fotos_fecha_ingreso_idx', 'aviso_termino_peso_idx'):
+                conexion.exec_driver_sql(f'DROP INDEX {indice}')
+            for tabla, columna in (('aviso_adopcion', 'edad_meses'), ('aviso_adopcion', 'region_id'),
+                                   ('aviso_adopcion', 'tiene_fotos'), ('foto', 'ruta_miniatura'), ('foto', 'ruta_webp')):
+                conexion.exec_driver_sql(f'ALTER TABLE {tabla} DROP COLUMN {columna}')
+        db.engine.dispose()
+    return app
+
+def test_db_init_aplica_las_migraciones_pendientes(monkeypatch, tmp_path):
+    app = _base_anterior(monkeypatch, tmp_path)
+    with app.app_context():
+        runner = app.test_cli_runner()
+        resultado = runner.invoke(args=['db', 'init'])
+        assert resultado.exit_code == 0, resultado.output
+        assert ('Migraciones aplicadas: 003_foto_variantes.sql, 005_filtros_avisos.sql, 007_region_fotos_avisos.sql, '
+                '008_busqueda_sin_tipo.sql, 009_aviso_termino_peso_idx.sql.') in resultado.output
+        inspector = inspect(db.engine)
+        assert {'edad_meses', 'region_id', 'tiene_fotos'} <= {c['name'] for c in inspector.get_columns('aviso_adopcion')}
+        assert 'aviso_termino_peso_idx' in {i['name'] for i in inspector.get_indexes('aviso_termino')}
+        with db.engine.connect() as conexion:
+            assert conexion.exec_driver_sql(
+                'SELECT COUNT(*) FROM aviso_adopcion a JOIN comuna c ON c.id = a.comuna_id '
+                "WHERE a.region_id = c.region_id AND a.edad_meses = CASE a.unidad_medida WHEN 'a' THEN a.edad * 12 "
+                'ELSE a.edad END AND a.tiene_fotos = EXISTS (SELECT 1 FROM foto f WHERE f.actividad_id = a.id)'
+            ).scalar() == 30
+            assert conexion.exec_driver_sql("SELECT COUNT(*) FROM aviso_termino WHERE termino = 'gato'").scalar() == 0
+        assert 'Sin migraciones pendientes.' in runner.invoke(args=['db', 'init']).output
+        db.engine.dispose()
+
+def test_db_init_falla_con_diferencias_sin_migracion(monkeypatch, tmp_path):
+    app = _base_anterior(monkeypatch, tmp_path)
+    with app.app_context():
+        with db.engine.begin() as conexion:
+            conexion.exec_driver_sql('ALTER TABLE aviso_adopcion DROP COLUMN sector')
+        resultado = app.test_cli_runner().invoke(args=['db', 'init'])
+        assert resultado.exit_code != 0 and 'aviso_adopcion.sector' in resultado.output
+        # Nada se aplicó a medias
+        assert 'edad_meses' not in {c['name'] for c in inspect(db.engine).get_columns('aviso_adopcion')}
+        db.engine.dispose()
@@ -0,0 +1,89 @@
+"""Modo ASGI: los mismos validadores del caché HTTP que la API WSGI, antes de la consulta"""
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+pytest.importorskip('aiosqlite')
+pytest.importorskip('a2wsgi')
+pytest.importorskip('httpx')
+from starlette.testclient import TestClient  # noqa: E402
+from app import create_app, db  # noqa: E402
+from app.asincrono import crear_app_asgi  # noqa: E402
+from app.models import Foto  # noqa: E402
+from app.services import crear_esquema, sembrar_region_comuna, generar_avisos, referencia  # noqa: E402
+from config.config import config, TestConfig  # noqa: E402
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    # Base en archivo: la comparten el engine síncrono y el asíncrono
+    uri = f'sqlite:///{tmp_path / "asgi.db"}'
+    monkeypatch.setitem(config, 'prueba', type('ConfigPrueba', (TestConfig,), {'SQLALCHEMY_DATABASE_URI': uri}))
+    app = create_app('prueba')
+    with app.app_context():
+        crear_esquema()
+        sembrar_region_comuna()
+        generar_avisos(20, 0)
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+    referencia.invalidar()
+
+@pytest.fixture
+def asgi(app):
+    with TestClient(crear_app_asgi(app)) as cliente:
+        yield cliente
+
+@pytest.fixture
+def sentencias():
+    """Sentencias de cualquier engine, incluido el del driver asíncrono"""
+    registro = []
+    def registrar(conexion, cursor, sentencia, parametros, contexto, executemany):
+        registro.append(sentencia)
+    event.listen(Engine, 'before_cursor_execute', registrar)
+    yield registro
+    event.remove(Engine, 'before_cursor_execute', registrar)
+
+def _etag(respuesta):
+    return respuesta.headers['ETag'].removeprefix('W/')
+
+def _procesar_fotos():
+    for foto in Foto.query:
+        foto.ruta_webp = f'{foto.ruta_archivo}.webp'
+    db.session.commit()
+
+def test_mismos_validadores_que_wsgi(app, asgi):
+    _procesar_fotos()
+    aviso_id = db.session.scalar(db.select(Foto.actividad_id).limit(1))
+    wsgi = app.test_client()
+    for url in ('/api/regiones', '/api/comunas/1', f'/api/aviso/{aviso_id}?incluir=fotos',
+                '/api/avisos?per_page=5', '/api/avisos?cursor=&total=no'):
+        esperado, respuesta = wsgi.get(url), asgi.get(url)
+        assert respuesta.status_code == esperado.status_code == 200
+        assert _etag(respuesta) == _etag(esperado)
+        assert respuesta.headers.get('Last-Modified') == esperado.headers.get('Last-Modified')
+        assert respuesta.headers['Cache-Control'] == esperado.headers['Cache-Control']
+
+def test_304_sin_la_consulta_de_la_respuesta(asgi, sentencias):
+    aviso_id = db.session.scalar(db.select(Foto.actividad_id).limit(1))
+    for url, validaciones in ((f'/api/aviso/{aviso_id}', 2), ('/api/avisos?per_page=5', 1)):
+        primera = asgi.get(url)
+        sentencias.clear()
+        assert asgi.get(url, headers={'If-None-Match': primera.headers['ETag']}).status_code == 304
+        assert len(sentencias) == validaciones
+
+def test_last_modified_segun_las_fotos(asgi):
+    aviso_id = db.session.scalar(db.select(Foto.actividad_id).limit(1))
+    url = f'/api/aviso/{aviso_id}?incluir=fotos'
+    # Fotos sin procesar: sin Last-Modified, If-Modified-Since no puede dar 304
+    assert 'Last-Modified' not in asgi.get(url).headers
+    _procesar_fotos()
+    procesado = asgi.get(url)
+    assert 'Last-Modified' in procesado.headers
+    condicional = asgi.get(url, headers={'If-Modified-Since': procesado.headers['Last-Modified']})
+    assert condicional.status_code == 304
+
+def test_listado_con_fotos_no_se_cachea(asgi):
+    assert 'ETag' in asgi.get('/api/avisos').headers
+    assert 'ETag' not in asgi.get('/api/avisos?incluir=fotos').headers
+    assert 'ETag' not in asgi.get('/api/aviso/999999').headers
@@ -0,0 +1,55 @@
+"""Búsqueda de avisos: niveles por términos coincidentes, puntaje y el tipo como filtro"""
+
+import pytest
+from collections import defaultdict
+from app import db
+from app.models import AvisoAdopcion, AvisoTermino
+from app.services import buscar_ids, normalizar
+from app.services import busqueda
+from app.services.busqueda import TIPOS, PESO_TIPO
+
+def _esperado(consulta):
+    """Orden de referencia calculado en Python sobre todo el índice"""
+    terminos = set(normalizar(consulta))
+    tipos = terminos & TIPOS
+    terminos -= TIPOS
+    tipo_de = dict(db.session.execute(db.select(AvisoAdopcion.id, AvisoAdopcion.tipo)).all())
+    coincidencias, puntajes = defaultdict(int), defaultdict(int)
+    for termino, aviso_id, peso in db.session.execute(
+        db.select(AvisoTermino.termino, AvisoTermino.aviso_id, AvisoTermino.peso)
+    ):
+        if termino in terminos:
+            coincidencias[aviso_id] += 1
+            puntajes[aviso_id] += peso
+    extra = PESO_TIPO if tipos else 0
+    ids = [aviso_id for aviso_id in coincidencias if len(tipos) != 1 or tipo_de[aviso_id] in tipos]
+    ids.sort(key=lambda aviso_id: (-coincidencias[aviso_id], -puntajes[aviso_id], -aviso_id))
+    return [(aviso_id, puntajes[aviso_id] + extra) for aviso_id in ids]
+
+@pytest.mark.parametrize('consulta', [
+    'labrador', 'labrador vacunado', 'perro labrador vacunado', 'gatos tranquilos en santiago',
+    'gato perro vacunado', 'jugueton carinoso esterilizado tranquilo', 'labrador xyzzy',
+    'santiago', 'santiago vacunado tranquilo',
+])
+@pytest.mark.parametrize('max_ramas', [busqueda.MAX_RAMAS, 0])
+def test_orden_por_niveles(avisos, monkeypatch, consulta, max_ramas):
+    # Con max_ramas=0 cada nivel se ordena completo en SQL: mismo resultado
+    monkeypatch.setattr(busqueda, 'MAX_RAMAS', max_ramas)
+    avisos(300)
+    esperado = _esperado(consulta)
+    assert esperado
+    for offset in (0, 7, len(esperado) - 3):
+        assert buscar_ids(consulta, 10, offset) == esperado[offset:offset + 10]
+
+def test_tipo_no_se_indexa(avisos):
+    avisos(50)
+    assert db.session.scalar(db.select(db.func.count()).where(AvisoTermino.termino.in_(TIPOS))) == 0
+
+def test_solo_tipo_filtra(avisos):
+    avisos(50)
+    resultados = buscar_ids('perros', 100)
+    perros = db.session.scalars(db.select(AvisoAdopcion.id).where(AvisoAdopcion.tipo == 'perro')).all()
+    assert sorted(aviso_id for aviso_id, _ in resultados) == sorted(perros)
+    assert {puntaje for _, puntaje in resultados} == {PESO_TIPO}
+    assert len(buscar_ids('gato perro', 100)) == 50
+    assert buscar_ids('de la', 10) == []
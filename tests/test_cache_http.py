@@ -0,0 +1,56 @@
+"""Validadores del caché HTTP de la API: el ETag cambia cuando cambian las fotos"""
+
+import pytest
+from app import db
+from app.models import Foto
+from app.services import referencia
+
+@pytest.fixture
+def aviso_con_fotos(app, avisos):
+    avisos(20)
+    return db.session.scalar(db.select(Foto.actividad_id).limit(1))
+
+def _procesar_fotos(aviso_id):
+    for foto in Foto.query.filter_by(actividad_id=aviso_id):
+        foto.ruta_miniatura = f'{foto.ruta_archivo}.thumb.webp'
+        foto.ruta_webp = f'{foto.ruta_archivo}.webp'
+    db.session.commit()
+
+def test_aviso_cambia_al_procesar_fotos(cliente, aviso_con_fotos):
+    url = f'/api/aviso/{aviso_con_fotos}?incluir=fotos'
+    pendiente = cliente.get(url)
+    assert pendiente.status_code == 200
+    # Sin Last-Modified mientras hay fotos pendientes: If-Modified-Since no puede dar 304
+    assert pendiente.last_modified is None
+    assert cliente.get(url, headers={'If-None-Match': pendiente.headers['ETag']}).status_code == 304
+
+    _procesar_fotos(aviso_con_fotos)
+    procesado = cliente.get(url, headers={'If-None-Match': pendiente.headers['ETag']})
+    assert procesado.status_code == 200
+    assert all(foto['ruta_webp'] for foto in procesado.get_json()['fotos'])
+    assert procesado.last_modified is not None
+
+def test_listado_con_fotos_no_se_cachea(cliente, aviso_con_fotos):
+    assert 'ETag' in cliente.get('/api/avisos').headers
+    assert 'ETag' not in cliente.get('/api/avisos?incluir=fotos').headers
+
+def test_batch_cambia_al_procesar_fotos(cliente, aviso_con_fotos):
+    url = f'/api/avisos/batch?ids={aviso_con_fotos},1'
+    pendiente = cliente.get(url)
+    assert pendiente.status_code == 200 and pendiente.last_modified is None
+    assert cliente.get(url, headers={'If-None-Match': pendiente.headers['ETag']}).status_code == 304
+
+    _procesar_fotos(aviso_con_fotos)
+    procesado = cliente.get(url, headers={'If-None-Match': pendiente.headers['ETag']})
+    assert procesado.status_code == 200
+    fotos = procesado.get_json()['avisos'][0]['fotos']
+    assert all(foto['url'].endswith('.webp') for foto in fotos)
+
+def test_referencia_igual_en_todos_los_workers(cliente):
+    # Otro worker (o este tras invalidar) recarga la referencia: mismos encabezados, sin Last-Modified
+    primera = cliente.get('/api/regiones')
+    referencia.invalidar()
+    segunda = cliente.get('/api/regiones')
+    assert segunda.headers['ETag'] == primera.headers['ETag']
+    assert 'Last-Modified' not in primera.headers and 'Last-Modified' not in segunda.headers
+    assert cliente.get('/api/regiones', headers={'If-None-Match': primera.headers['ETag']}).status_code == 304
@@ -0,0 +1,56 @@
+"""Cache de páginas con réplica atrasada y backend compartido obligatorio"""
+
+import pytest
+from app import create_app, db
+from app.models import AvisoAdopcion
+from app.services import crear_esquema, sembrar_region_comuna, generar_avisos, cache_paginas, referencia
+from config.config import config, TestConfig
+
+def _app(monkeypatch, **opciones):
+    monkeypatch.setitem(config, 'prueba', type('ConfigPrueba', (TestConfig,), opciones))
+    return create_app('prueba')
+
+@pytest.fixture
+def con_replica(monkeypatch, tmp_path):
+    """Primario con datos y una réplica con el esquema pero sin avisos (atrasada)"""
+    app = _app(
+        monkeypatch,
+        SQLALCHEMY_DATABASE_URI=f'sqlite:///{tmp_path / "primario.db"}',
+        SQLALCHEMY_BINDS={'replica': f'sqlite:///{tmp_path / "replica.db"}'},
+        PAGINAS_CACHE_BACKEND='memoria',
+    )
+    with app.app_context():
+        crear_esquema()
+        sembrar_region_comuna()
+        db.metadata.create_all(db.engines['replica'])
+        generar_avisos(5)
+        yield app
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+    # Flask-SQLAlchemy guarda un MetaData por bind en la extensión (global)
+    db.metadatas.pop('replica', None)
+    referencia.invalidar()
+
+def test_pagina_cacheada_se_renderiza_desde_el_primario(con_replica):
+    nombre = AvisoAdopcion.query.order_by(AvisoAdopcion.fecha_ingreso.desc()).first().nombre
+    cliente = con_replica.test_client()
+    primera = cliente.get('/listado-avisos')
+    assert primera.headers['X-Cache'] == 'MISS' and nombre in primera.get_data(as_text=True)
+    segunda = cliente.get('/listado-avisos')
+    assert segunda.headers['X-Cache'] == 'HIT' and nombre in segunda.get_data(as_text=True)
+
+def test_despues_de_escribir_se_lee_del_primario(con_replica):
+    cliente = con_replica.test_client()
+    with cliente.session_transaction() as sesion:
+        sesion['_escritura_reciente'] = True
+        sesion['_flashes'] = [('success', 'Aviso agregado correctamente')]  # sin cache, como tras publicar
+    ultimo = AvisoAdopcion.query.order_by(AvisoAdopcion.fecha_ingreso.desc()).first()
+    assert ultimo.fecha_ingreso.strftime('%Y-%m-%d %H:%M') in cliente.get('/').get_data(as_text=True)
+    with cliente.session_transaction() as sesion:
+        assert '_escritura_reciente' not in sesion
+
+def test_produccion_rechaza_el_cache_en_memoria(monkeypatch):
+    with pytest.raises(RuntimeError, match='no es compartido'):
+        _app(monkeypatch, PAGINAS_CACHE_BACKEND='memoria', PAGINAS_CACHE_SOLO_COMPARTIDO=True)
+    cache_paginas.init_app(_app(monkeypatch))
@@ -0,0 +1,30 @@
+"""
+Cantidad de sentencias SQL por vista: fija, sin importar cuántos avisos haya
+(sin N+1 sobre fotos ni comunas).
+"""
+
+import pytest
+
+def _contar(cliente, sentencias, url):
+    cliente.get(url)  # calentar: create_all diferido y cache de referencia
+    sentencias.clear()
+    respuesta = cliente.get(url)
+    assert respuesta.status_code == 200
+    return len(sentencias)
+
+@pytest.mark.parametrize('url, esperadas', [
+    ('/', 2),                               # avisos + fotos (selectinload)
+    ('/listado-avisos', 3),                 # COUNT + avisos + fotos
+    ('/listado-avisos?page=4', 3),
+    ('/listado-avisos?cursor=', 2),         # keyset: sin COUNT
+])
+@pytest.mark.parametrize('cantidad', [20, 200])
+def test_sentencias_por_vista(cliente, sentencias, avisos, url, esperadas, cantidad):
+    avisos(cantidad)
+    assert _contar(cliente, sentencias, url) == esperadas
+
+def test_ultima_pagina_igual_que_la_primera(cliente, sentencias, avisos):
+    avisos(53)
+    primera = _contar(cliente, sentencias, '/listado-avisos?page=1')
+    ultima = _contar(cliente, sentencias, '/listado-avisos?page=11')
+    assert primera == ultima == 3
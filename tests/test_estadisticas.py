@@ -0,0 +1,43 @@
+"""Estadísticas de la API: cache por versión de datos, rango inclusivo y semanas ISO"""
+
+from datetime import datetime, timedelta
+from app import db
+from app.models import AvisoAdopcion
+from app.services import serie_temporal
+
+def _fechar(fechas):
+    ids = db.session.scalars(db.select(AvisoAdopcion.id).order_by(AvisoAdopcion.id)).all()
+    for aviso_id, fecha in zip(ids, fechas):
+        db.session.execute(db.update(AvisoAdopcion).where(AvisoAdopcion.id == aviso_id).values(fecha_ingreso=fecha))
+    db.session.commit()
+
+def test_semanas_iso(avisos):
+    # Bordes de año donde la semana ISO difiere de la semana calendario
+    fechas = [datetime(2020, 12, 31, 23), datetime(2021, 1, 1, 12), datetime(2021, 1, 3, 8), datetime(2021, 1, 4),
+              datetime(2024, 12, 29), datetime(2024, 12, 30, 1), datetime(2026, 1, 1), datetime(2027, 1, 3, 23, 59)]
+    avisos(len(fechas))
+    _fechar(fechas)
+    esperado = sorted({'{}-W{:02d}'.format(*fecha.isocalendar()[:2]) for fecha in fechas})
+    assert [fila[0] for fila in serie_temporal('fecha_ingreso', 'semana')] == esperado
+    assert esperado[:2] == ['2020-W53', '2021-W01']
+
+def test_hasta_inclusivo_como_en_el_listado(cliente, avisos):
+    dia = datetime(2025, 3, 10)
+    avisos(4)
+    _fechar([dia - timedelta(seconds=1), dia, dia + timedelta(hours=23, minutes=59), dia + timedelta(days=1)])
+    serie = cliente.get('/api/estadisticas/serie?desde=2025-03-10&hasta=2025-03-10').get_json()
+    assert [fila[0] for fila in serie['filas']] == ['2025-03-10'] and serie['filas'][0][3] == 2
+    listado = cliente.get('/api/avisos?ingreso_desde=2025-03-10&ingreso_hasta=2025-03-10').get_json()
+    assert len(listado['avisos']) == 2
+
+def test_cuerpo_de_la_version_del_etag(cliente, avisos):
+    # Con el TTL vigente, un aviso nuevo cambia el ETag y también el cuerpo
+    avisos(5)
+    url = '/api/estadisticas/serie?intervalo=mes'
+    antes, resumen_antes = cliente.get(url), cliente.get('/api/estadisticas')
+    avisos(3, semilla=1)
+    despues, resumen_despues = cliente.get(url), cliente.get('/api/estadisticas')
+    assert despues.headers['ETag'] != antes.headers['ETag']
+    assert sum(fila[3] for fila in despues.get_json()['filas']) == 8
+    assert resumen_despues.headers['ETag'] != resumen_antes.headers['ETag']
+    assert sum(fila['total'] for fila in resumen_despues.get_json()['tipo']) == 8
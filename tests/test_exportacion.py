@@ -0,0 +1,18 @@
+"""Exportación masiva: columnas públicas del aviso, sin columnas internas"""
+
+import csv
+import io
+import json
+
+def test_ndjson_sin_columnas_internas(cliente, avisos):
+    avisos(5)
+    lineas = cliente.get('/api/avisos/export?formato=ndjson').get_data(as_text=True).splitlines()
+    assert len(lineas) == 5
+    assert all('edad_meses' not in json.loads(linea) for linea in lineas)
+
+def test_csv_sin_columnas_internas(cliente, avisos):
+    avisos(5)
+    texto = cliente.get('/api/avisos/export?formato=csv').get_data(as_text=True)
+    encabezado = next(csv.reader(io.StringIO(texto)))
+    assert 'edad_meses' not in encabezado
+    assert 'edad' in encabezado and 'unidad_medida' in encabezado
@@ -0,0 +1,37 @@
+"""Variantes de imagen: nombres sin colisiones y escritura atómica concurrente"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+from app.models import Foto
+from app.services import generar_variantes
+
+def _imagen(carpeta, ruta, color, formato):
+    completa = os.path.join(carpeta, ruta)
+    os.makedirs(os.path.dirname(completa), exist_ok=True)
+    Image.new('RGB', (40, 30), color).save(completa, formato)
+
+def test_mismo_nombre_distinta_extension(app, tmp_path):
+    _imagen(tmp_path, 'uploads/perro.jpg', 'red', 'JPEG')
+    _imagen(tmp_path, 'uploads/perro.png', 'blue', 'PNG')
+    fotos = [Foto(ruta_archivo='uploads/perro.jpg'), Foto(ruta_archivo='uploads/perro.png')]
+    for foto in fotos:
+        assert generar_variantes(foto, str(tmp_path), app.config)
+
+    rutas = {ruta for foto in fotos for ruta in (foto.ruta_miniatura, foto.ruta_webp)}
+    assert len(rutas) == 4
+    for foto, color in zip(fotos, ((255, 0, 0), (0, 0, 255))):
+        with Image.open(os.path.join(tmp_path, foto.ruta_webp)) as variante:
+            rojo, _, azul = variante.convert('RGB').getpixel((0, 0))
+            assert (rojo > azul) == (color[0] > color[2])
+
+def test_duplicados_procesados_a_la_vez(app, tmp_path):
+    ruta = 'uploads/ab/cd/' + 'a' * 64 + '.png'
+    _imagen(tmp_path, ruta, 'green', 'PNG')
+    fotos = [Foto(ruta_archivo=ruta) for _ in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        resultados = list(pool.map(lambda foto: generar_variantes(foto, str(tmp_path), app.config), fotos))
+    assert all(resultados)
+    carpeta = os.path.join(tmp_path, 'uploads', 'ab', 'cd')
+    assert not [nombre for nombre in os.listdir(carpeta) if nombre.endswith('.tmp')]
+    assert os.path.exists(os.path.join(tmp_path, fotos[0].ruta_webp))
@@ -0,0 +1,113 @@
+"""Importación masiva: errores por fila sin interrumpir la carga"""
+
+import io
+import json
+import pytest
+from sqlalchemy import func, select
+from app import db
+from app.models import AvisoAdopcion, ContactarPor, Foto
+from app.services import importar_avisos, leer_registros
+from app.services import importacion
+
+AVISO = {
+    'nombre': 'Refugio Sur', 'email': 'refugio@ejemplo.cl', 'comuna_id': 10301, 'tipo': 'perro',
+    'descripcion': 'Quiltro juguetón', 'fecha_entrega': '2025-03-01', 'cantidad': 1, 'edad': 2,
+    'unidad_medida': 'a',
+}
+
+def _contar(modelo):
+    return db.session.scalar(select(func.count()).select_from(modelo))
+
+def test_ndjson_con_lineas_mal_formadas(app):
+    lineas = [
+        json.dumps(AVISO),
+        '{"nombre": "sin cerrar"',
+        '',
+        '[1, 2, 3]',
+        json.dumps(AVISO),
+    ]
+    resultado = importar_avisos(leer_registros(lineas, 'ndjson'), tamano_lote=2)
+    assert resultado['importados'] == 2
+    assert [error['fila'] for error in resultado['errores']] == [2, 4]
+    assert all('registro' in error['errores'] for error in resultado['errores'])
+    assert _contar(AvisoAdopcion) == 2
+
+def test_csv_con_relacion_mal_formada(app):
+    archivo = io.StringIO(
+        'nombre,email,comuna_id,tipo,descripcion,fecha_entrega,fotos\n'
+        'Ana,ana@ejemplo.cl,10301,gato,Siamés,2025-03-01,[]\n'
+        'Luis,luis@ejemplo.cl,10301,gato,Persa,2025-03-01,"[{""ruta_archivo"": "\n'
+        'Eva,eva@ejemplo.cl,10301,perro,Beagle,2025-03-01,\n'
+    )
+    resultado = importar_avisos(leer_registros(archivo, 'csv'))
+    assert resultado['importados'] == 2
+    assert [error['fila'] for error in resultado['errores']] == [3]
+
+def test_rutas_de_foto_fuera_de_uploads(app):
+    filas = [
+        dict(AVISO, fotos=[{'ruta_archivo': '../app/__init__.py'}]),
+        dict(AVISO, fotos=[{'ruta_archivo': 'uploads/../../etc/passwd'}]),
+        dict(AVISO, fotos=[{'ruta_archivo': '/etc/passwd'}]),
+        dict(AVISO, fotos=[{'ruta_archivo': 'uploads/./refugio/perro.jpg'}]),
+    ]
+    resultado = importar_avisos(enumerate(filas, start=1))
+    assert resultado['importados'] == 1
+    assert [error['fila'] for error in resultado['errores']] == [1, 2, 3]
+    assert db.session.scalars(select(Foto.ruta_archivo)).all() == ['uploads/refugio/perro.jpg']
+
+def test_api_ndjson_reporta_lineas(app, cliente):
+    app.config['API_IMPORT_TOKEN'] = 'secreto'
+    cuerpo = '\n'.join([json.dumps(AVISO), 'no es json', '"texto"'])
+    respuesta = cliente.post('/api/avisos/import', data=cuerpo, content_type='application/x-ndjson',
+                             headers={'Authorization': 'Bearer secreto'})
+    assert respuesta.status_code == 200
+    datos = respuesta.get_json()
+    assert datos['importados'] == 1
+    assert [error['fila'] for error in datos['errores']] == [2, 3]
+
+@pytest.mark.parametrize('extra, campo', [
+    ({'contactos': ['whatsapp']}, 'contactos'),
+    ({'contactos': 5}, 'contactos'),
+    ({'contactos': [None]}, 'contactos'),
+    ({'fotos': 7}, 'fotos'),
+])
+def test_relaciones_mal_formadas_son_error_de_la_fila(app, extra, campo):
+    filas = [AVISO, dict(AVISO, **extra), AVISO]
+    resultado = importar_avisos(enumerate(filas, start=1))
+    assert resultado['importados'] == 2
+    assert [(error['fila'], list(error['errores'])) for error in resultado['errores']] == [(2, [campo])]
+
+def test_error_inesperado_en_una_fila_no_pierde_el_lote(app, monkeypatch):
+    validar = importacion.validar_aviso
+    def validar_o_fallar(datos, contexto=None):
+        if datos.get('nombre') == 'rota':
+            raise RuntimeError('valor inesperado')
+        return validar(datos, contexto)
+    monkeypatch.setattr(importacion, 'validar_aviso', validar_o_fallar)
+    resultado = importar_avisos(enumerate([AVISO, dict(AVISO, nombre='rota')], start=1))
+    assert resultado['importados'] == 1
+    assert resultado['errores'] == [{'fila': 2, 'errores': {'registro': ['Registro no válido: valor inesperado']}}]
+
+def test_api_no_responde_500_por_una_fila(app, cliente):
+    app.config['API_IMPORT_TOKEN'] = 'secreto'
+    cuerpo = '\n'.join([json.dumps(AVISO), json.dumps(dict(AVISO, contactos=['whatsapp'], fotos=7))])
+    respuesta = cliente.post('/api/avisos/import', data=cuerpo, content_type='application/x-ndjson',
+                             headers={'Authorization': 'Bearer secreto'})
+    assert respuesta.status_code == 200
+    assert respuesta.get_json()['importados'] == 1
+
+@pytest.mark.parametrize('paso, inserts', [(1, 1), (None, 30)])
+def test_ruta_mysql_en_un_insert(app, sentencias, monkeypatch, paso, inserts):
+    # Ruta sin RETURNING (MySQL) sobre SQLite: ids deducidos del primer id del INSERT,
+    # salvo con innodb_autoinc_lock_mode=2 (paso None), que inserta aviso por aviso
+    monkeypatch.setattr(db.engine.dialect, 'insert_executemany_returning_sort_by_parameter_order', False)
+    monkeypatch.setattr(importacion, '_paso_autoincremento', lambda engine: paso)
+    # MySQL informa el id de la primera fila del INSERT; SQLite el de la última
+    monkeypatch.setattr(importacion, '_primer_id', lambda resultado: resultado.lastrowid - resultado.rowcount + 1)
+    filas = [dict(AVISO, email=f'refugio{i}@ejemplo.cl') for i in range(30)]
+    sentencias.clear()
+    resultado = importar_avisos(enumerate(filas, 1), tamano_lote=30)
+    assert resultado['importados'] == 30
+    assert sum(s.startswith('INSERT INTO aviso_adopcion') for s in sentencias) == inserts
+    for contacto in db.session.scalars(select(ContactarPor)):
+        assert contacto.identificador == f'Email: {db.session.get(AvisoAdopcion, contacto.actividad_id).email}'
@@ -0,0 +1,51 @@
+"""Planes de ejecución de los filtros de /api/avisos: cada filtro busca por índice"""
+
+import pytest
+from app import db
+from app.models import AvisoAdopcion, Foto
+from app.services import explicar_filtros, es_escaneo_completo, filtrar_avisos, referencia
+
+@pytest.fixture
+def datos(app, avisos):
+    avisos(2000)
+    db.session.execute(db.text('ANALYZE'))
+    db.session.commit()
+
+def test_ningun_filtro_recorre_la_tabla(datos):
+    resultados = explicar_filtros(2)
+    fallidos = {','.join(r['filtros']): r['plan'] for r in resultados if r['escaneo_completo']}
+    assert fallidos == {}
+    assert len(resultados) > 1
+
+@pytest.mark.parametrize('fila, con_filtros, esperado', [
+    ('SCAN aviso_adopcion', False, True),
+    ('SCAN aviso_adopcion USING INDEX aviso_fecha_ingreso_id_idx', False, False),
+    ('SCAN aviso_adopcion USING INDEX aviso_fecha_ingreso_id_idx', True, True),
+    ('SCAN aviso_adopcion USING COVERING INDEX aviso_cantidad_idx', True, True),
+    ('SEARCH aviso_adopcion USING INDEX aviso_tipo_fecha_ingreso_idx (tipo=?)', True, False),
+    ({'table': 'aviso_adopcion', 'type': 'ALL'}, False, True),
+    ({'table': 'aviso_adopcion', 'type': 'index'}, False, False),
+    ({'table': 'aviso_adopcion', 'type': 'index'}, True, True),
+    ({'table': 'aviso_adopcion', 'type': 'ref'}, True, False),
+])
+def test_criterio_de_escaneo(fila, con_filtros, esperado):
+    assert es_escaneo_completo(fila, con_filtros) is esperado
+
+def test_columnas_derivadas_equivalen_a_los_filtros_originales(datos):
+    region = next(r for r in referencia.regiones() if referencia.comunas_de_region(r['id']))
+    comunas = [c['id'] for c in referencia.comunas_de_region(region['id'])]
+    por_region = {a.id for a in filtrar_avisos(AvisoAdopcion.query, {'region_id': region['id']})}
+    assert por_region == {a.id for a in AvisoAdopcion.query.filter(AvisoAdopcion.comuna_id.in_(comunas))}
+
+    con_fotos = {a.id for a in filtrar_avisos(AvisoAdopcion.query, {'con_fotos': True})}
+    assert con_fotos == set(db.session.scalars(db.select(Foto.actividad_id).distinct()))
+    sin_fotos = filtrar_avisos(AvisoAdopcion.query, {'con_fotos': False}).count()
+    assert len(con_fotos) + sin_fotos == 2000
+
+def test_rangos_en_subconsulta(datos):
+    filtros = {'cantidad_min': 2, 'edad_max_meses': 24, 'tipo': 'perro'}
+    ids = {a.id for a in filtrar_avisos(AvisoAdopcion.query, filtros)}
+    esperados = {a.id for a in AvisoAdopcion.query.filter(
+        AvisoAdopcion.cantidad >= 2, AvisoAdopcion.edad_meses <= 24, AvisoAdopcion.tipo == 'perro'
+    )}
+    assert ids == esperados and ids
@@ -0,0 +1,55 @@
+"""Perfilado por petición: receptores registrados una vez y sin fugas ante errores"""
+
+import pytest
+from flask import template_rendered
+from app import create_app, db
+from app.services import perfilador
+
+@pytest.fixture
+def perfilado(app):
+    app.config['PERFILADO'] = True
+    perfilador.init_app(app)
+    return app
+
+def _consultas(respuesta):
+    return respuesta.headers['Server-Timing'].split('desc="')[1].split()[0]
+
+def _otra_app(**config):
+    otra = create_app('testing')
+    otra.config.update(PERFILADO=True, **config)
+    perfilador.init_app(otra)
+    return otra
+
+def test_receptores_registrados_una_vez(perfilado, cliente, avisos, sentencias):
+    receptores = len(template_rendered.receivers)
+    for _ in range(3):
+        _otra_app()
+    perfilador.init_app(perfilado)
+    assert len(template_rendered.receivers) == receptores
+
+    avisos(5)
+    cliente.get('/listado-avisos')
+    sentencias.clear()
+    respuesta = cliente.get('/listado-avisos')
+    assert respuesta.status_code == 200
+    assert _consultas(respuesta) == str(len(sentencias))
+
+def test_configuracion_de_cada_app(perfilado, cliente, caplog):
+    perfilado.config['PERFILADO_UMBRAL_LENTO_MS'] = 0
+    _otra_app(PERFILADO_UMBRAL_LENTO_MS=10 ** 9)
+    cliente.get('/listado-avisos')
+    assert 'Petición lenta GET /listado-avisos' in caplog.text
+
+def test_consulta_fallida_no_deja_inicio(perfilado, cliente):
+    @perfilado.route('/_falla')
+    def falla():
+        try:
+            db.session.execute(db.text('SELECT * FROM tabla_inexistente'))
+        except Exception:
+            db.session.rollback()
+        return 'ok'
+
+    for _ in range(3):
+        assert cliente.get('/_falla').status_code == 200
+    with db.engine.connect() as conexion:
+        assert not conexion.info.get('_perfil_inicio')
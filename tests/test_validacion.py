@@ -0,0 +1,49 @@
+"""Validación de avisos: un validador por campo, errores agrupados por campo"""
+
+import pytest
+from app.services import validar_aviso, validar_lote
+
+BASE = {
+    'nombre': 'Ana', 'email': 'a@b.cl', 'celular': '+569.12345678', 'comuna_id': '10301',
+    'sector': 'x', 'tipo': 'gato', 'descripcion': 'd', 'fecha_entrega': '2027-05-01',
+    'cantidad': '2', 'edad': '3', 'unidad_medida': 'a', 'contactos': [('whatsapp', '+569')],
+}
+
+def test_registro_valido_normalizado(app):
+    registro, errores = validar_aviso(BASE)
+    assert errores == {}
+    assert registro['comuna_id'] == 10301 and registro['cantidad'] == 2
+    assert registro['edad_meses'] == 36
+
+def test_un_error_por_campo(app):
+    mal = dict(BASE, email='x', celular='123', comuna_id='999999', tipo='loro', cantidad='50',
+               edad='0', fecha_entrega='zz', nombre='')
+    _, errores = validar_aviso(mal)
+    assert errores == {
+        'nombre': ['El nombre es obligatorio'],
+        'email': ['El email debe tener formato válido'],
+        'celular': ['El celular debe tener el formato +569.12345678'],
+        'comuna_id': ['La comuna seleccionada no existe'],
+        'tipo': ['El tipo de animal debe ser gato o perro'],
+        'fecha_entrega': ['La fecha de entrega no es válida'],
+        'cantidad': ['La cantidad debe ser un número entero entre 1 y 20'],
+        'edad': ['La edad debe ser un número mayor a 0'],
+    }
+
+def test_valores_por_defecto_y_largo_maximo(app):
+    registro, errores = validar_aviso(dict(BASE, unidad_medida='', cantidad=None, sector='s' * 101))
+    assert registro['unidad_medida'] == 'm' and registro['cantidad'] == 1
+    assert errores == {'sector': ['El campo sector admite como máximo 100 caracteres']}
+
+def test_lote(app):
+    resultados = validar_lote([BASE, dict(BASE, tipo='loro')])
+    assert [bool(errores) for _, errores in resultados] == [False, True]
+
+@pytest.mark.parametrize('valor', ['1e400', 'inf', '-inf', 'nan', '1e999', float('inf'), float('nan')])
+def test_numero_no_finito_es_error_del_campo(app, valor):
+    _, errores = validar_aviso(dict(BASE, cantidad=valor, edad=valor, comuna_id=valor))
+    assert errores == {
+        'comuna_id': ['La comuna seleccionada no es válida'],
+        'cantidad': ['La cantidad debe ser un número entero válido'],
+        'edad': ['La edad debe ser un número entero válido'],
+    }